@@ -64,6 +64,7 @@ class FlightAdmin(admin.ModelAdmin):
         "airplane",
         "departure_time",
         "arrival_time",
+        "seats_sold",
     )
     filter_fields = (
         "route",
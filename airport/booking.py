@@ -0,0 +1,267 @@
+from collections import defaultdict
+from functools import partial
+
+from django.db import IntegrityError, transaction
+from rest_framework.exceptions import ValidationError
+from rest_framework.serializers import as_serializer_error
+from rest_framework.settings import api_settings
+
+from airport.cache import bump_flight_versions
+from airport.holds import held_seats, release_seats, seat_holders
+from airport.models import Flight, Order, OrderSummary, Ticket
+from airport.seat_map import (
+    SeatMap,
+    build_seat_map,
+    get_seat_map,
+    mark_seats,
+)
+from airport.order_cache import invalidate_order_caches
+from airport.summaries import refresh_order_summaries
+
+# Same message DRF's UniqueTogetherValidator gives for a taken seat
+SEAT_TAKEN_MESSAGE = "The fields row, seat, flight must make a unique set."
+SEAT_HELD_MESSAGE = "This seat is held by another passenger."
+NO_ADJACENT_SEATS_MESSAGE = "Not enough adjacent free seats on this flight."
+
+
+def seat_errors(tickets_data, holder=None) -> list[dict]:
+    """Check requested seats against airplanes, sold tickets and holds.
+
+    Returns one error dict per ticket, empty for valid ones, shaped like
+    the errors of a nested ``many=True`` serializer. Costs one query per
+    flight for its taken seats. Seats held by ``holder`` may be booked.
+    """
+    requested = defaultdict(set)
+    for ticket in tickets_data:
+        requested[ticket["flight"].pk].add((ticket["row"], ticket["seat"]))
+
+    taken, holders = {}, {}
+    for flight_id, seats in requested.items():
+        holders[flight_id] = seat_holders(flight_id, seats)
+        taken[flight_id] = set(
+            Ticket.objects.filter(
+                flight_id=flight_id,
+                row__in={row for row, _ in seats},
+                seat__in={seat for _, seat in seats},
+            ).values_list("row", "seat")
+        )
+    return ticket_errors(tickets_data, taken, holders, holder)
+
+
+def ticket_errors(tickets_data, taken, holders, holder) -> list[dict]:
+    """Per ticket errors given the taken seats and holders of each flight.
+
+    ``taken`` maps flight ids to sets of seats, ``holders`` maps them to
+    ``{seat: holder}`` dicts.
+    """
+    errors, seen = [], set()
+    for ticket in tickets_data:
+        flight_id, seat = ticket["flight"].pk, (ticket["row"], ticket["seat"])
+        try:
+            Ticket.validate_ticket(
+                *seat, ticket["flight"].airplane, ValidationError
+            )
+        except ValidationError as error:
+            errors.append(as_serializer_error(error))
+            continue
+
+        seat_holder = holders[flight_id].get(seat, str(holder))
+        if (flight_id, seat) in seen or seat in taken[flight_id]:
+            errors.append(
+                {api_settings.NON_FIELD_ERRORS_KEY: [SEAT_TAKEN_MESSAGE]}
+            )
+        elif seat_holder != str(holder):
+            errors.append(
+                {api_settings.NON_FIELD_ERRORS_KEY: [SEAT_HELD_MESSAGE]}
+            )
+        else:
+            errors.append({})
+        seen.add((flight_id, seat))
+    return errors
+
+
+def bookable_seat_map(flight_id, holder=None, fresh=False) -> SeatMap:
+    """Seat map of a flight with the seats held by others marked taken.
+
+    ``fresh`` builds it from the tickets instead of the cache, for use
+    while the flight is locked. Raises ``Flight.DoesNotExist`` for
+    unknown flights.
+    """
+    seat_map = build_seat_map(flight_id) if fresh else get_seat_map(flight_id)
+    held = held_seats(flight_id)
+    holders = seat_holders(flight_id, held)
+    for row, seat in held:
+        if (
+            holders.get((row, seat), str(holder)) != str(holder)
+            and row <= seat_map.rows
+            and seat <= seat_map.seats_in_row
+        ):
+            seat_map.take(row, seat)
+    return seat_map
+
+
+def assign_seats(tickets_data, holder=None) -> list[dict]:
+    """Give tickets without ``row`` and ``seat`` adjacent free seats.
+
+    The unseated tickets of each flight get the block picked by
+    ``SeatMap.find_adjacent``, around the seats other tickets of the
+    order ask for. Flights must be locked. Returns per ticket errors
+    like ``seat_errors``.
+    """
+    unseated = defaultdict(list)
+    for ticket in tickets_data:
+        if "row" not in ticket or "seat" not in ticket:
+            unseated[ticket["flight"].pk].append(ticket)
+
+    failed = set()
+    for flight_id, tickets in unseated.items():
+        seat_map = bookable_seat_map(flight_id, holder, fresh=True)
+        for ticket in tickets_data:
+            row, seat = ticket.get("row"), ticket.get("seat")
+            if (
+                ticket["flight"].pk == flight_id
+                and row
+                and seat
+                and row <= seat_map.rows
+                and seat <= seat_map.seats_in_row
+            ):
+                seat_map.take(row, seat)
+
+        seats = seat_map.find_adjacent(len(tickets))
+        if seats is None:
+            failed.add(flight_id)
+            continue
+        for ticket, (row, seat) in zip(tickets, seats):
+            ticket["row"], ticket["seat"] = row, seat
+
+    return [
+        (
+            {api_settings.NON_FIELD_ERRORS_KEY: [NO_ADJACENT_SEATS_MESSAGE]}
+            if ticket["flight"].pk in failed
+            and ("row" not in ticket or "seat" not in ticket)
+            else {}
+        )
+        for ticket in tickets_data
+    ]
+
+
+def lock_flights(flight_ids) -> None:
+    """Row lock flights for the rest of the transaction.
+
+    Locks are taken in primary key order, so concurrent multi-flight
+    bookings cannot deadlock. Databases without ``SELECT ... FOR UPDATE``
+    (SQLite) serialize writers anyway.
+    """
+    list(
+        Flight.objects.select_for_update()
+        .filter(pk__in=flight_ids)
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    )
+
+
+def book_tickets(order, tickets_data) -> list[Ticket]:
+    """Insert the tickets of ``order`` with a single ``bulk_create``.
+
+    Must run inside a transaction. The flights are locked and the seats
+    checked again, so concurrent bookings of a flight run one after the
+    other and a lost race ends in a ``ValidationError``. Tickets without
+    a seat get one from ``assign_seats``. ``bulk_create``
+    skips model signals, see ``tickets_sold``. The unique constraint on
+    ``(row, seat, flight)`` stays the final guard.
+    """
+    lock_flights({data["flight"].pk for data in tickets_data})
+    errors = assign_seats(tickets_data, order.user_id)
+    if any(errors):
+        raise ValidationError({"tickets": errors})
+    errors = seat_errors(tickets_data, order.user_id)
+    if any(errors):
+        raise ValidationError({"tickets": errors})
+
+    tickets = [Ticket(order=order, **data) for data in tickets_data]
+    try:
+        with transaction.atomic():
+            Ticket.objects.bulk_create(tickets)
+    except IntegrityError:
+        errors = seat_errors(tickets_data, order.user_id)
+        raise ValidationError(
+            {"tickets": errors if any(errors) else [SEAT_TAKEN_MESSAGE]}
+        )
+
+    tickets_sold(tickets)
+    return tickets
+
+
+def book_orders(bookings) -> list[list[dict] | None]:
+    """Book many orders in one go, first come first served.
+
+    ``bookings`` pairs unsaved orders with their tickets data. Must run
+    inside a transaction. All flights are locked and their sold seats and
+    holds loaded once, then the accepted orders and their tickets are
+    inserted with one ``bulk_create`` each. Returns the ticket errors of
+    every booking, ``None`` for booked ones.
+    """
+    requested = defaultdict(set)
+    for _, tickets_data in bookings:
+        for ticket in tickets_data:
+            requested[ticket["flight"].pk].add((ticket["row"], ticket["seat"]))
+    lock_flights(requested)
+
+    taken = {flight_id: set() for flight_id in requested}
+    for flight_id, row, seat in Ticket.objects.filter(
+        flight_id__in=requested
+    ).values_list("flight_id", "row", "seat"):
+        taken[flight_id].add((row, seat))
+    holders = {
+        flight_id: seat_holders(flight_id, seats)
+        for flight_id, seats in requested.items()
+    }
+
+    results, accepted = [], []
+    for order, tickets_data in bookings:
+        errors = ticket_errors(tickets_data, taken, holders, order.user_id)
+        if any(errors):
+            results.append(errors)
+            continue
+
+        results.append(None)
+        accepted.append((order, tickets_data))
+        for ticket in tickets_data:
+            taken[ticket["flight"].pk].add((ticket["row"], ticket["seat"]))
+
+    orders = Order.objects.bulk_create(order for order, _ in accepted)
+    OrderSummary.objects.bulk_create(
+        OrderSummary(order=order) for order in orders
+    )
+    tickets = Ticket.objects.bulk_create(
+        Ticket(order=order, **data)
+        for order, tickets_data in accepted
+        for data in tickets_data
+    )
+    tickets_sold(tickets)
+    return results
+
+
+def tickets_sold(tickets) -> None:
+    """Do the bookkeeping that ``bulk_create`` skips for new tickets.
+
+    Updates the seat counters, order summaries, cached seat maps and
+    flight and order cache versions, and releases the holds the buyers
+    had on the seats.
+    """
+    sold, bought = defaultdict(list), defaultdict(list)
+    for ticket in tickets:
+        seat = (ticket.row, ticket.seat)
+        sold[ticket.flight_id].append(seat)
+        bought[(ticket.flight_id, ticket.order.user_id)].append(seat)
+
+    for flight_id, seats in sold.items():
+        Flight.adjust_seats_sold(flight_id, len(seats))
+        transaction.on_commit(partial(mark_seats, flight_id, seats))
+    for (flight_id, user_id), seats in bought.items():
+        transaction.on_commit(
+            partial(release_seats, flight_id, seats, user_id)
+        )
+    refresh_order_summaries(*{ticket.order_id for ticket in tickets})
+    bump_flight_versions(*sold)
+    invalidate_order_caches(flight_ids=sold)
@@ -0,0 +1,264 @@
+import logging
+from itertools import chain
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from django_redis import get_redis_connection
+from rest_framework import status
+from rest_framework.response import Response
+
+from airport.booking import book_orders
+from airport.models import BookingRequest, Flight, Order
+
+logger = logging.getLogger(__name__)
+
+QUEUE_KEY = "booking:queue"
+# Failed tries after which a queued request is rejected
+MAX_BOOKING_ATTEMPTS = 3
+BOOKING_FAILED_MESSAGE = "The booking could not be processed."
+
+
+class DatabaseQueue:
+    """The pending ``BookingRequest`` rows are the queue.
+
+    Workers claim them with ``SELECT ... FOR UPDATE SKIP LOCKED`` where
+    the database supports it.
+    """
+
+    def push(self, booking_request) -> None:
+        pass
+
+    def claim(self, size) -> list[BookingRequest]:
+        return list(
+            BookingRequest.objects.select_for_update(skip_locked=True)
+            .filter(status=BookingRequest.PENDING)
+            .order_by("pk")[:size]
+        )
+
+    def requeue(self, booking_requests) -> None:
+        pass
+
+
+class RedisQueue:
+    """Redis list of pending ``BookingRequest`` ids.
+
+    Ids are pushed once the request is committed. A worker that dies
+    after popping ids leaves their requests pending in the database,
+    ``process_booking_queue --backend=db`` picks those up.
+    """
+
+    def __init__(self) -> None:
+        self.client = get_redis_connection("default")
+        self.key = cache.make_key(QUEUE_KEY)
+
+    def push(self, booking_request) -> None:
+        pk = booking_request.pk
+        transaction.on_commit(lambda: self.client.rpush(self.key, pk))
+
+    def claim(self, size) -> list[BookingRequest]:
+        pipe = self.client.pipeline()
+        pipe.lrange(self.key, 0, size - 1)
+        pipe.ltrim(self.key, size, -1)
+        ids, _ = pipe.execute()
+        return list(
+            BookingRequest.objects.select_for_update()
+            .filter(pk__in=[int(pk) for pk in ids])
+            .filter(status=BookingRequest.PENDING)
+            .order_by("pk")
+        )
+
+    def requeue(self, booking_requests) -> None:
+        ids = [booking_request.pk for booking_request in booking_requests]
+        if ids:
+            self.client.lpush(self.key, *reversed(ids))
+
+
+QUEUE_BACKENDS = {
+    "db": DatabaseQueue,
+    "redis": RedisQueue,
+}
+
+
+def get_queue(backend=None):
+    """Return the configured queue, ``None`` when queued booking is off."""
+    backend = backend or settings.BOOKING_QUEUE
+    return QUEUE_BACKENDS[backend]() if backend else None
+
+
+def enqueue(queue, user, tickets) -> BookingRequest:
+    with transaction.atomic():
+        booking_request = BookingRequest.objects.create(
+            user=user, tickets=tickets
+        )
+        queue.push(booking_request)
+    return booking_request
+
+
+def process_batch(queue, size) -> tuple[int, int]:
+    """Book up to ``size`` queued requests in a single transaction.
+
+    The requests are booked in groups of the same flights, each under a
+    savepoint. When a group fails, its requests are retried one by one
+    and the ones failing alone are requeued, until they run out of
+    ``MAX_BOOKING_ATTEMPTS`` and are rejected. Returns how many requests
+    were booked and rejected.
+    """
+    booking_requests = []
+    try:
+        with transaction.atomic():
+            booking_requests = queue.claim(size)
+            booked = rejected = 0
+            for group in _flight_groups(booking_requests):
+                group_booked, group_rejected = _process_group(queue, group)
+                booked += group_booked
+                rejected += group_rejected
+            return booked, rejected
+    except Exception:
+        queue.requeue(booking_requests)
+        raise
+
+
+def _flight_groups(booking_requests) -> list[list[BookingRequest]]:
+    groups = {}
+    for booking_request in booking_requests:
+        flights = tuple(
+            sorted({ticket["flight"] for ticket in booking_request.tickets})
+        )
+        groups.setdefault(flights, []).append(booking_request)
+    return list(groups.values())
+
+
+def _process_group(queue, booking_requests) -> tuple[int, int]:
+    try:
+        with transaction.atomic():
+            return _process(booking_requests)
+    except Exception:
+        logger.exception(
+            "Booking requests %s failed",
+            [booking_request.pk for booking_request in booking_requests],
+        )
+        if len(booking_requests) == 1:
+            return _record_failure(queue, booking_requests[0])
+
+    booked = rejected = 0
+    for booking_request in booking_requests:
+        request_booked, request_rejected = _process_group(
+            queue, [booking_request]
+        )
+        booked += request_booked
+        rejected += request_rejected
+    return booked, rejected
+
+
+def _record_failure(queue, booking_request) -> tuple[int, int]:
+    booking_request.attempts += 1
+    BookingRequest.objects.filter(pk=booking_request.pk).update(
+        attempts=F("attempts") + 1
+    )
+    if booking_request.attempts < MAX_BOOKING_ATTEMPTS:
+        transaction.on_commit(lambda: queue.requeue([booking_request]))
+        return 0, 0
+
+    booking_request.status = BookingRequest.REJECTED
+    booking_request.errors = {"non_field_errors": [BOOKING_FAILED_MESSAGE]}
+    booking_request.processed_at = timezone.now()
+    booking_request.save(update_fields=["status", "errors", "processed_at"])
+    return 0, 1
+
+
+def _process(booking_requests) -> tuple[int, int]:
+    flights = Flight.objects.select_related("airplane").in_bulk(
+        {
+            ticket["flight"]
+            for ticket in chain.from_iterable(
+                booking_request.tickets for booking_request in booking_requests
+            )
+        }
+    )
+
+    bookings, pending = [], []
+    for booking_request in booking_requests:
+        missing = [
+            ticket["flight"]
+            for ticket in booking_request.tickets
+            if ticket["flight"] not in flights
+        ]
+        if missing:
+            booking_request.errors = [
+                (
+                    {
+                        "flight": [
+                            f'Invalid pk "{ticket["flight"]}" - '
+                            "object does not exist."
+                        ]
+                    }
+                    if ticket["flight"] in missing
+                    else {}
+                )
+                for ticket in booking_request.tickets
+            ]
+            continue
+
+        pending.append(booking_request)
+        bookings.append(
+            (
+                Order(user_id=booking_request.user_id),
+                [
+                    {**ticket, "flight": flights[ticket["flight"]]}
+                    for ticket in booking_request.tickets
+                ],
+            )
+        )
+
+    results = book_orders(bookings)
+    for booking_request, (order, _), errors in zip(pending, bookings, results):
+        booking_request.errors = errors
+        booking_request.order = order if errors is None else None
+
+    now = timezone.now()
+    booked = 0
+    for booking_request in booking_requests:
+        booking_request.processed_at = now
+        if booking_request.order is not None:
+            booking_request.status = BookingRequest.BOOKED
+            booked += 1
+        else:
+            booking_request.status = BookingRequest.REJECTED
+    BookingRequest.objects.bulk_update(
+        booking_requests, ["status", "order", "errors", "processed_at"]
+    )
+    return booked, len(booking_requests) - booked
+
+
+class QueuedCreateMixin:
+    """Queue ``create`` requests when ``settings.BOOKING_QUEUE`` is set.
+
+    Only the shape of the request is validated. The response is a 202
+    with the queued ``BookingRequest``, whose ``url`` reports its status
+    once the ``process_booking_queue`` worker has handled it.
+    """
+
+    queued_create_serializer_class = None
+    queued_status_serializer_class = None
+
+    def create(self, request, *args, **kwargs):
+        queue = get_queue()
+        if queue is None:
+            return super().create(request, *args, **kwargs)
+
+        serializer = self.queued_create_serializer_class(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        booking_request = enqueue(
+            queue, request.user, serializer.validated_data["tickets"]
+        )
+        data = self.queued_status_serializer_class(
+            booking_request, context=self.get_serializer_context()
+        ).data
+        return Response(
+            data,
+            status=status.HTTP_202_ACCEPTED,
+            headers={"Location": data["url"]},
+        )
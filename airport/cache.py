@@ -0,0 +1,173 @@
+import hashlib
+import math
+import random
+import time
+import uuid
+from functools import wraps
+
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework import status
+from rest_framework.response import Response
+
+FLIGHT_CACHE_TIMEOUT = 60 * 60 * 24
+# How long an expired page may still be served while it is recomputed
+PAGE_STALE_TIMEOUT = 60 * 5
+# How long a request may recompute a page before others take over
+PAGE_LOCK_TIMEOUT = 30
+# How long requests without a stale copy wait for the recomputed page
+PAGE_WAIT_TIMEOUT = 5
+PAGE_WAIT_INTERVAL = 0.05
+# Above 1 favours earlier recomputation, below 1 later
+XFETCH_BETA = 1.0
+FLIGHT_LIST_VERSION_KEY = "flights:list:version"
+REFERENCE_VERSION_KEY = "reference:version"
+
+
+def flight_version_key(flight_id) -> str:
+    return f"flights:{flight_id}:version"
+
+
+def _new_version() -> str:
+    return f"{time.time():.6f}-{uuid.uuid4().hex}"
+
+
+def version_time(version) -> float | None:
+    """When ``version`` was made, for versions made by ``_new_version``."""
+    try:
+        return float(version.split("-", 1)[0])
+    except (AttributeError, ValueError):
+        return None
+
+
+def get_version(key) -> str:
+    return cache.get_or_set(key, _new_version, None)
+
+
+def bump_versions(*keys) -> None:
+    """Give each key a fresh version once the transaction commits.
+
+    Data cached under the old versions is no longer fresh. Versioned keys
+    are never read again and simply expire, pages are at most served
+    stale while they are recomputed.
+    """
+    if keys:
+        transaction.on_commit(
+            lambda: cache.set_many({key: _new_version() for key in keys}, None)
+        )
+
+
+def bump_flight_versions(*flight_ids) -> None:
+    bump_versions(
+        FLIGHT_LIST_VERSION_KEY,
+        *(flight_version_key(flight_id) for flight_id in flight_ids),
+    )
+
+
+# Flight pages embed airport, city and country names, so their versions
+# also carry the reference data version
+def flight_list_version_keys(request, *args, **kwargs) -> tuple:
+    return FLIGHT_LIST_VERSION_KEY, REFERENCE_VERSION_KEY
+
+
+def flight_detail_version_keys(request, *args, pk=None, **kwargs) -> tuple:
+    return flight_version_key(pk), REFERENCE_VERSION_KEY
+
+
+def flight_list_version(request, *args, **kwargs) -> str:
+    return ".".join(
+        map(get_version, flight_list_version_keys(request, *args, **kwargs))
+    )
+
+
+def flight_detail_version(request, *args, **kwargs) -> str:
+    return ".".join(
+        map(get_version, flight_detail_version_keys(request, *args, **kwargs))
+    )
+
+
+def xfetch_due(entry, now, beta=XFETCH_BETA) -> bool:
+    """Whether a page should be recomputed ahead of its expiry.
+
+    The chance grows as the expiry nears and with the time the page took
+    to compute, so one request usually refreshes a hot page before it
+    expires for everyone.
+    """
+    return (
+        now - entry["delta"] * beta * math.log(1 - random.random())
+        >= entry["expires"]
+    )
+
+
+def page_key(view_func, request) -> str:
+    digest = hashlib.md5(request.build_absolute_uri().encode()).hexdigest()
+    return f"pages.{view_func.__qualname__}.{digest}"
+
+
+def protected_cache_page(timeout, version):
+    """Cache ``response.data`` of a view, recomputed by one request at a time.
+
+    ``version`` is called with the view arguments and returns the current
+    version of the cached data. Entries of another version, past their
+    ``timeout`` or picked by ``xfetch_due`` are recomputed by the request
+    that wins a lock taken with ``cache.add``. Meanwhile the others are
+    served the stale copy, which is kept ``PAGE_STALE_TIMEOUT`` seconds
+    longer, or wait up to ``PAGE_WAIT_TIMEOUT`` seconds for the new one
+    when there is none. Stale responses are marked ``stale`` so no ETag
+    is sent for them.
+    """
+
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            key = page_key(view_func, request)
+            current = version(request, *args, **kwargs)
+
+            entry = cache.get(key)
+            fresh = entry is not None and entry["version"] == current
+            if fresh and not xfetch_due(entry, time.time()):
+                return Response(entry["data"])
+
+            token = uuid.uuid4().hex
+            lock_key = f"{key}.lock"
+            if not cache.add(lock_key, token, PAGE_LOCK_TIMEOUT):
+                if entry is None:
+                    entry = wait_for_page(key, current)
+                if entry is not None:
+                    response = Response(entry["data"])
+                    response.stale = entry["version"] != current
+                    return response
+
+            try:
+                started = time.monotonic()
+                response = view_func(request, *args, **kwargs)
+                if response.status_code == status.HTTP_200_OK:
+                    cache.set(
+                        key,
+                        {
+                            "version": current,
+                            "data": response.data,
+                            "delta": time.monotonic() - started,
+                            "expires": time.time() + timeout,
+                        },
+                        timeout + PAGE_STALE_TIMEOUT,
+                    )
+                return response
+            finally:
+                if cache.get(lock_key) == token:
+                    cache.delete(lock_key)
+
+        return wrapper
+
+    return decorator
+
+
+def wait_for_page(key, current):
+    """The entry of version ``current`` under ``key`` once it is stored."""
+    deadline = time.monotonic() + PAGE_WAIT_TIMEOUT
+    while time.monotonic() < deadline:
+        time.sleep(PAGE_WAIT_INTERVAL)
+        entry = cache.get(key)
+        if entry is not None and entry["version"] == current:
+            return entry
+    return None
@@ -0,0 +1,130 @@
+import hashlib
+from functools import wraps
+
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from airport.cache import REFERENCE_VERSION_KEY, get_version, version_time
+
+
+def conditional_get(view_method):
+    """Answer conditional GETs of a ``ConditionalGetMixin`` view method.
+
+    Returns ``304 Not Modified`` when ``If-None-Match`` or
+    ``If-Modified-Since`` match the current validators, and adds
+    ``ETag`` and ``Last-Modified`` to full responses, except stale ones
+    served from a page cache while it refreshes. Views overriding
+    ``list`` or ``retrieve`` decorate them with it.
+    """
+
+    @wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        etag, last_modified = self.get_validators(request, **kwargs)
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = view_method(self, request, *args, **kwargs)
+
+        stale = getattr(response, "stale", False)
+        if response.status_code in (200, 304) and etag and not stale:
+            response["ETag"] = etag
+            if last_modified is not None:
+                response["Last-Modified"] = http_date(last_modified)
+        return response
+
+    return wrapper
+
+
+class ConditionalGetMixin:
+    """ETag and Last-Modified support for ``list`` and ``retrieve``.
+
+    The strong ETag hashes the row count and the latest ``updated_at`` of
+    the filtered rows and of the related rows along ``etag_dependencies``,
+    read with one aggregate query, so the body is never rendered to
+    compute it. Reference tables are not joined for it, the reference
+    data version stamp stands in for them. ``Last-Modified`` is the
+    latest of the timestamps.
+
+    Actions listed in ``etag_version_keys`` are validated by the version
+    stamps their caches are keyed on instead, so no query runs for them.
+    Each entry is called with the request and the view arguments and
+    returns the version keys. Versions are bumped by every change,
+    deletes included, and ``Last-Modified`` is the time of the latest.
+    """
+
+    etag_dependencies = ()
+    etag_version_keys = {}
+
+    @conditional_get
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @conditional_get
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
+    def get_validators(self, request, **kwargs):
+        version_keys = self.etag_version_keys.get(self.action)
+        if version_keys is not None:
+            versions = [
+                get_version(key) for key in version_keys(request, **kwargs)
+            ]
+            stamps = [
+                stamp
+                for stamp in map(version_time, versions)
+                if stamp is not None
+            ]
+            last_modified = int(max(stamps)) if stamps else None
+            return self.make_etag(request, versions), last_modified
+
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        fields = [
+            "updated_at",
+            *(f"{path}__updated_at" for path in self.etag_dependencies),
+        ]
+        try:
+            if lookup_url_kwarg in kwargs:
+                queryset = queryset.filter(
+                    **{self.lookup_field: kwargs[lookup_url_kwarg]}
+                )
+            versions = queryset.order_by().aggregate(
+                rows=Count("pk", distinct=True),
+                **{
+                    f"updated_at_{index}": Max(field)
+                    for index, field in enumerate(fields)
+                },
+            )
+        except (TypeError, ValueError, ValidationError):
+            return None, None
+
+        stamps = [
+            stamp
+            for name, stamp in versions.items()
+            if name != "rows" and stamp is not None
+        ]
+        last_modified = int(max(stamps).timestamp()) if stamps else None
+        return (
+            self.make_etag(
+                request,
+                (get_version(REFERENCE_VERSION_KEY), sorted(versions.items())),
+            ),
+            last_modified,
+        )
+
+    @staticmethod
+    def make_etag(request, versions) -> str:
+        digest = hashlib.sha256(
+            repr(
+                (
+                    request.get_full_path(),
+                    request.accepted_renderer.format,
+                    request.user.pk,
+                    versions,
+                )
+            ).encode()
+        ).hexdigest()
+        return quote_etag(digest)
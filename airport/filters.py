@@ -1,10 +1,44 @@
 import django_filters
 from django_filters import rest_framework as filters
+from django_filters.constants import EMPTY_VALUES
 
-from airport.models import Flight
+from airport.models import Flight, Order
+from airport.reference import airport_ids
+
+
+class AirportNameFilter(django_filters.CharFilter):
+    """Filter an airport id field on airports matching a name lookup.
+
+    The matching airports come from the reference cache, so the filtered
+    query does not join airports, cities and countries.
+    """
+
+    def __init__(self, airport_lookup, **kwargs) -> None:
+        self.airport_lookup = airport_lookup
+        super().__init__(**kwargs)
+
+    def filter(self, qs, value):
+        if value in EMPTY_VALUES:
+            return qs
+        return qs.filter(
+            **{
+                f"{self.field_name}__in": airport_ids(
+                    **{self.airport_lookup: value}
+                )
+            }
+        )
 
 
 class FlightFilter(filters.FilterSet):
+    route__source__name = AirportNameFilter(
+        "name", field_name="route__source_id"
+    )
+    route__source__closest_big_city__name = AirportNameFilter(
+        "closest_big_city__name", field_name="route__source_id"
+    )
+    route__source__closest_big_city__country__name = AirportNameFilter(
+        "closest_big_city__country__name", field_name="route__source_id"
+    )
     departure_time = django_filters.DateFromToRangeFilter()
     arrival_time = django_filters.DateFromToRangeFilter()
 
@@ -17,3 +51,37 @@ class FlightFilter(filters.FilterSet):
             "departure_time",
             "arrival_time",
         ]
+
+
+class OrderFilter(filters.FilterSet):
+    """Filters and ordering of orders on their ``OrderSummary``.
+
+    The parameter names are those of the ticket lookups they replace.
+    """
+
+    tickets__flight__route__source__name = AirportNameFilter(
+        "name", field_name="summary__origin_id"
+    )
+    tickets__flight__route__source__closest_big_city__name = AirportNameFilter(
+        "closest_big_city__name", field_name="summary__origin_id"
+    )
+    tickets__flight__route__source__closest_big_city__country__name = (
+        AirportNameFilter(
+            "closest_big_city__country__name",
+            field_name="summary__origin_id",
+        )
+    )
+    ordering = django_filters.OrderingFilter(
+        fields=(
+            ("created_at", "created_at"),
+            (
+                "summary__first_departure_time",
+                "tickets__flight__departure_time",
+            ),
+            ("summary__last_arrival_time", "tickets__flight__arrival_time"),
+        )
+    )
+
+    class Meta:
+        model = Order
+        fields = []
@@ -0,0 +1,60 @@
+import hashlib
+
+from django.core.cache import cache
+
+from airport.cache import REFERENCE_VERSION_KEY, get_version
+
+FRAGMENT_CACHE_TIMEOUT = 60 * 60 * 24
+# Context entry holding the fragments rendered for one response
+FRAGMENT_MEMO = "fragments"
+
+
+class FragmentCacheMixin:
+    """Cache the representation of each instance as a fragment.
+
+    Serializers of rows shared by many others, like routes and airplanes
+    nested in flights, render each instance once and keep the resulting
+    dict in the shared cache. The key holds the model, the primary key,
+    the serializer and a version made of the instance's ``updated_at``,
+    the reference data version and the request base URL used for file
+    links. Nested airports, cities, countries and airplane types are
+    reference data, so the reference version covers them. Fragments are
+    also memoized in the serializer context, so a route repeated across
+    a response is looked up once.
+    """
+
+    def get_fragment_memo(self) -> dict:
+        memo = self.context.setdefault(FRAGMENT_MEMO, {})
+        if REFERENCE_VERSION_KEY not in memo:
+            memo[REFERENCE_VERSION_KEY] = get_version(REFERENCE_VERSION_KEY)
+        return memo
+
+    def fragment_key(self, instance, memo) -> str:
+        request = self.context.get("request")
+        version = hashlib.md5(
+            repr(
+                (
+                    instance.updated_at.isoformat(),
+                    memo[REFERENCE_VERSION_KEY],
+                    request.build_absolute_uri("/") if request else None,
+                )
+            ).encode()
+        ).hexdigest()
+        return (
+            f"fragments.{instance._meta.label_lower}.{instance.pk}"
+            f".{type(self).__name__}.{version}"
+        )
+
+    def to_representation(self, instance):
+        if instance.pk is None or instance.updated_at is None:
+            return super().to_representation(instance)
+
+        memo = self.get_fragment_memo()
+        key = self.fragment_key(instance, memo)
+        if key not in memo:
+            data = cache.get(key)
+            if data is None:
+                data = super().to_representation(instance)
+                cache.set(key, data, FRAGMENT_CACHE_TIMEOUT)
+            memo[key] = data
+        return memo[key]
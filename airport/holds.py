@@ -0,0 +1,143 @@
+import time
+
+from django.core.cache import cache
+from django_redis import get_redis_connection
+
+DEFAULT_HOLD_MINUTES = 10
+MAX_HOLD_MINUTES = 30
+
+# KEYS: the flight hold index, then one key per seat. ARGV: the holder,
+# the hold time and the current time in milliseconds, then one index
+# member per seat. Claims every seat, or none when another holder has
+# one of them, in which case their members are returned.
+HOLD_SEATS_SCRIPT = """
+local holder, ttl, now = ARGV[1], tonumber(ARGV[2]), tonumber(ARGV[3])
+local conflicts = {}
+for i = 2, #KEYS do
+    local owner = redis.call("GET", KEYS[i])
+    if owner and owner ~= holder then
+        table.insert(conflicts, ARGV[i + 2])
+    end
+end
+if #conflicts > 0 then
+    return conflicts
+end
+
+for i = 2, #KEYS do
+    redis.call("SET", KEYS[i], holder, "PX", ttl)
+    redis.call("ZADD", KEYS[1], now + ttl, ARGV[i + 2])
+end
+redis.call("ZREMRANGEBYSCORE", KEYS[1], "-inf", now)
+local last = redis.call("ZRANGE", KEYS[1], -1, -1, "WITHSCORES")
+redis.call("PEXPIREAT", KEYS[1], last[2])
+return conflicts
+"""
+
+# KEYS: the flight hold index, then one key per seat. ARGV: the holder,
+# then one index member per seat. Deletes only holds owned by the holder.
+RELEASE_SEATS_SCRIPT = """
+local released = 0
+for i = 2, #KEYS do
+    if redis.call("GET", KEYS[i]) == ARGV[1] then
+        redis.call("DEL", KEYS[i])
+        redis.call("ZREM", KEYS[1], ARGV[i])
+        released = released + 1
+    end
+end
+return released
+"""
+
+
+def hold_key(flight_id, row, seat) -> str:
+    return cache.make_key(f"flight:{flight_id}:hold:{row}:{seat}")
+
+
+def hold_index_key(flight_id) -> str:
+    return cache.make_key(f"flight:{flight_id}:holds")
+
+
+def _member(row, seat) -> str:
+    return f"{row}:{seat}"
+
+
+def _seat(member) -> tuple[int, int]:
+    row, seat = member.decode().split(":")
+    return int(row), int(seat)
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+def _keys(flight_id, seats) -> list[str]:
+    return [hold_index_key(flight_id)] + [
+        hold_key(flight_id, row, seat) for row, seat in seats
+    ]
+
+
+def hold_seats(flight_id, seats, holder, timeout) -> list[tuple[int, int]]:
+    """Hold ``seats`` for ``holder`` during ``timeout`` seconds.
+
+    Holds are all or nothing, holding a seat again extends its hold.
+    Returns the seats held by someone else, empty on success.
+    """
+    seats = sorted(set(seats))
+    client = get_redis_connection("default")
+    script = client.register_script(HOLD_SEATS_SCRIPT)
+    conflicts = script(
+        keys=_keys(flight_id, seats),
+        args=[str(holder), int(timeout * 1000), _now_ms()]
+        + [_member(*seat) for seat in seats],
+    )
+    return [_seat(member) for member in conflicts]
+
+
+def release_seats(flight_id, seats, holder) -> int:
+    """Release the holds ``holder`` has on ``seats``."""
+    seats = sorted(set(seats))
+    if not seats:
+        return 0
+    client = get_redis_connection("default")
+    script = client.register_script(RELEASE_SEATS_SCRIPT)
+    return script(
+        keys=_keys(flight_id, seats),
+        args=[str(holder)] + [_member(*seat) for seat in seats],
+    )
+
+
+def held_seats(flight_id) -> dict[tuple[int, int], float]:
+    """Map the currently held seats of a flight to their expiry time."""
+    client = get_redis_connection("default")
+    return {
+        _seat(member): score / 1000
+        for member, score in client.zrangebyscore(
+            hold_index_key(flight_id), f"({_now_ms()}", "+inf", withscores=True
+        )
+    }
+
+
+def seat_holders(flight_id, seats) -> dict[tuple[int, int], str]:
+    """Map those of ``seats`` that are held to their holder."""
+    seats = list(seats)
+    if not seats:
+        return {}
+    client = get_redis_connection("default")
+    holders = client.mget(
+        [hold_key(flight_id, row, seat) for row, seat in seats]
+    )
+    return {
+        seat: holder.decode()
+        for seat, holder in zip(seats, holders)
+        if holder is not None
+    }
+
+
+def holder_seats(flight_id, holder) -> dict[tuple[int, int], float]:
+    """Map the seats ``holder`` holds on a flight to their expiry time."""
+    held = held_seats(flight_id)
+    owned = seat_holders(flight_id, held)
+    return {
+        seat: expires
+        for seat, expires in held.items()
+        if owned.get(seat) == str(holder)
+    }
@@ -0,0 +1,119 @@
+import hashlib
+import json
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+from rest_framework.response import Response
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+IDEMPOTENCY_KEY_MAX_LENGTH = 255
+# How long a request may run before its key can be claimed again
+PENDING_TIMEOUT = 60
+# How long duplicates wait for the first request to finish
+WAIT_TIMEOUT = 10
+WAIT_INTERVAL = 0.05
+
+
+class IdempotencyConflict(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = (
+        "The first request with this Idempotency-Key did not complete yet, "
+        "retry later."
+    )
+    default_code = "idempotency_conflict"
+
+
+class IdempotencyKeyReused(APIException):
+    status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    default_detail = (
+        "This Idempotency-Key was already used with a different request."
+    )
+    default_code = "idempotency_key_reused"
+
+
+class IdempotentCreateMixin:
+    """Honour an ``Idempotency-Key`` header on ``create``.
+
+    The first request with a key claims it with ``cache.add`` and its
+    response is kept per user and key for ``IDEMPOTENCY_KEY_TIMEOUT``
+    seconds. Retries get that response replayed, and duplicates sent
+    while the first one is still running wait for its result. Requests
+    ending in an error do not keep the key, so they can be retried.
+    """
+
+    def create(self, request, *args, **kwargs):
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if key is None:
+            return super().create(request, *args, **kwargs)
+        if not key or len(key) > IDEMPOTENCY_KEY_MAX_LENGTH:
+            raise ValidationError(
+                {
+                    IDEMPOTENCY_HEADER: "Must be 1 to "
+                    f"{IDEMPOTENCY_KEY_MAX_LENGTH} characters long."
+                }
+            )
+
+        cache_key = self.idempotency_cache_key(request, key)
+        fingerprint = self.request_fingerprint(request)
+        if not cache.add(
+            cache_key, {"fingerprint": fingerprint}, PENDING_TIMEOUT
+        ):
+            return self.replay(cache_key, fingerprint)
+
+        try:
+            response = super().create(request, *args, **kwargs)
+        except Exception:
+            cache.delete(cache_key)
+            raise
+
+        if status.is_success(response.status_code):
+            cache.set(
+                cache_key,
+                {
+                    "fingerprint": fingerprint,
+                    "status": response.status_code,
+                    "data": response.data,
+                },
+                settings.IDEMPOTENCY_KEY_TIMEOUT,
+            )
+        else:
+            cache.delete(cache_key)
+        return response
+
+    def idempotency_cache_key(self, request, key) -> str:
+        digest = hashlib.sha256(key.encode()).hexdigest()
+        return (
+            f"idempotency:{self.basename}:{self.action}:"
+            f"{request.user.pk}:{digest}"
+        )
+
+    @staticmethod
+    def request_fingerprint(request) -> str:
+        body = json.dumps(request.data, sort_keys=True, default=str)
+        return hashlib.sha256(body.encode()).hexdigest()
+
+    @staticmethod
+    def replay(cache_key, fingerprint) -> Response:
+        deadline = time.monotonic() + WAIT_TIMEOUT
+        record = cache.get(cache_key)
+        while record is not None and "status" not in record:
+            if record["fingerprint"] != fingerprint:
+                raise IdempotencyKeyReused()
+            if time.monotonic() >= deadline:
+                raise IdempotencyConflict()
+            time.sleep(WAIT_INTERVAL)
+            record = cache.get(cache_key)
+
+        if record is None:
+            raise IdempotencyConflict()
+        if record["fingerprint"] != fingerprint:
+            raise IdempotencyKeyReused()
+        return Response(
+            record["data"],
+            status=record["status"],
+            headers={REPLAYED_HEADER: "true"},
+        )
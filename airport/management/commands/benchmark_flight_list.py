@@ -0,0 +1,62 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+
+from airport.serializers import FlightListProjection, FlightListSerializer
+from airport.views import FlightViewSet
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the per-row cost of FlightListSerializer and the values()"
+        " based FlightListProjection on one flight list page"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--page-size", type=int, default=100)
+        parser.add_argument("--repeat", type=int, default=20)
+
+    def handle(self, *args, **options):
+        page_size = options["page_size"]
+        repeat = options["repeat"]
+        view = FlightViewSet(action="list")
+        queryset = view.get_queryset()
+        renderer = JSONRenderer()
+
+        def serialize():
+            flights = list(queryset[:page_size])
+            return FlightListSerializer(flights, many=True).data
+
+        def project():
+            rows = list(FlightListProjection.project(queryset)[:page_size])
+            return FlightListProjection(rows).data
+
+        serialized, projected = serialize(), project()
+        if not serialized:
+            raise CommandError("No flights to benchmark, load some first.")
+        if renderer.render(serialized) != renderer.render(projected):
+            raise CommandError("Projection output differs from serializer.")
+
+        rows = len(serialized)
+        results = {}
+        for name, render in (
+            ("FlightListSerializer", serialize),
+            ("FlightListProjection", project),
+        ):
+            started = time.perf_counter()
+            for _ in range(repeat):
+                renderer.render(render())
+            elapsed = time.perf_counter() - started
+            results[name] = elapsed / repeat / rows * 1_000_000
+            self.stdout.write(f"{name}: {results[name]:.1f} us/row")
+
+        speedup = (
+            results["FlightListSerializer"] / results["FlightListProjection"]
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{rows} rows per page, identical JSON, "
+                f"{speedup:.1f}x faster per row"
+            )
+        )
@@ -0,0 +1,196 @@
+import csv
+import json
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from airport.cache import bump_flight_versions
+from airport.models import Airplane, Crew, Flight, Route
+from airport.search import route_search_documents
+
+
+class RowError(ValueError):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream a flight schedule from a CSV or NDJSON file into the"
+        " database with batched inserts"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "path", help="Schedule file, or '-' to read from stdin"
+        )
+        parser.add_argument(
+            "--format",
+            choices=["csv", "ndjson"],
+            help="Input format, guessed from the file extension by default",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--strict",
+            action="store_true",
+            help="Abort on the first invalid row instead of skipping it",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        input_format = options["format"] or (
+            "ndjson" if path.endswith((".ndjson", ".jsonl")) else "csv"
+        )
+        self.batch_size = options["batch_size"]
+        self.strict = options["strict"]
+        self.load_lookups()
+
+        source = (
+            sys.stdin
+            if path == "-"
+            else open(path, newline="", encoding="utf-8")
+        )
+        try:
+            self.import_rows(self.read_rows(source, input_format))
+        finally:
+            if source is not sys.stdin:
+                source.close()
+
+    def load_lookups(self):
+        self.stdout.write("Loading routes, airplanes and crew...")
+        self.route_documents = route_search_documents(Route.objects.all())
+        self.routes = {}
+        for pk, source, destination in Route.objects.order_by(
+            "-pk"
+        ).values_list("pk", "source__name", "destination__name"):
+            self.routes[(source, destination)] = pk
+
+        self.airplanes = {}
+        for pk, name in Airplane.objects.order_by("-pk").values_list(
+            "pk", "name"
+        ):
+            self.airplanes[name] = pk
+        self.airplane_ids = set(self.airplanes.values())
+
+        self.crew = {}
+        for pk, first_name, last_name in Crew.objects.order_by(
+            "-pk"
+        ).values_list("pk", "first_name", "last_name"):
+            self.crew[f"{first_name} {last_name}"] = pk
+        self.crew_ids = set(self.crew.values())
+
+    def read_rows(self, source, input_format):
+        if input_format == "csv":
+            for line, row in enumerate(csv.DictReader(source), start=2):
+                yield line, row
+            return
+
+        for line, text in enumerate(source, start=1):
+            if not text.strip():
+                continue
+            try:
+                yield line, json.loads(text)
+            except ValueError as error:
+                yield line, error
+
+    def import_rows(self, rows):
+        started = time.monotonic()
+        imported = skipped = 0
+        batch = []
+
+        for line, row in rows:
+            try:
+                if isinstance(row, Exception):
+                    raise RowError(f"invalid JSON: {row}")
+                if not isinstance(row, dict):
+                    raise RowError("expected an object")
+                batch.append(self.parse_row(row))
+            except RowError as error:
+                if self.strict:
+                    raise CommandError(f"Line {line}: {error}")
+                skipped += 1
+                self.stderr.write(f"Line {line} skipped: {error}")
+                continue
+
+            if len(batch) >= self.batch_size:
+                imported += self.write_batch(batch)
+                batch = []
+                self.report(imported, skipped, started)
+
+        if batch:
+            imported += self.write_batch(batch)
+        if imported:
+            bump_flight_versions()
+
+        self.report(imported, skipped, started)
+        self.stdout.write(self.style.SUCCESS("Schedule imported."))
+
+    def parse_row(self, row):
+        route_id = self.resolve_route(row)
+        flight = Flight(
+            route_id=route_id,
+            airplane_id=self.resolve(
+                row.get("airplane"), self.airplanes, self.airplane_ids
+            ),
+            departure_time=self.parse_time(row, "departure_time"),
+            arrival_time=self.parse_time(row, "arrival_time"),
+            search_document=self.route_documents[route_id],
+        )
+        crew = row.get("crew") or []
+        if isinstance(crew, str):
+            crew = [member for member in crew.split(";") if member.strip()]
+        crew_ids = {
+            self.resolve(member, self.crew, self.crew_ids) for member in crew
+        }
+        return flight, crew_ids
+
+    def resolve_route(self, row):
+        if row.get("route"):
+            return self.resolve(row["route"], {}, self.route_documents)
+        key = (row.get("source"), row.get("destination"))
+        try:
+            return self.routes[key]
+        except KeyError:
+            raise RowError(f"unknown route {key[0]} -> {key[1]}")
+
+    @staticmethod
+    def resolve(value, by_name, ids):
+        """Return the id of a reference given by id or by name."""
+        value = str(value or "").strip()
+        if value in by_name:
+            return by_name[value]
+        if value.isdigit() and int(value) in ids:
+            return int(value)
+        raise RowError(f"unknown reference {value!r}")
+
+    @staticmethod
+    def parse_time(row, field):
+        try:
+            value = parse_datetime(str(row.get(field) or ""))
+        except ValueError:
+            value = None
+        if value is None:
+            raise RowError(f"invalid {field} {row.get(field)!r}")
+        if timezone.is_naive(value):
+            value = timezone.make_aware(value)
+        return value
+
+    @transaction.atomic()
+    def write_batch(self, batch):
+        flights = Flight.objects.bulk_create(flight for flight, _ in batch)
+        Flight.crew.through.objects.bulk_create(
+            Flight.crew.through(flight_id=flight.pk, crew_id=crew_id)
+            for flight, (_, crew_ids) in zip(flights, batch)
+            for crew_id in crew_ids
+        )
+        return len(flights)
+
+    def report(self, imported, skipped, started):
+        elapsed = max(time.monotonic() - started, 1e-9)
+        self.stdout.write(
+            f"{imported} flights imported, {skipped} skipped, "
+            f"{imported / elapsed:.0f} rows/s"
+        )
@@ -0,0 +1,59 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from airport.booking_queue import QUEUE_BACKENDS, get_queue, process_batch
+
+
+class Command(BaseCommand):
+    help = (
+        "Book queued orders in batches, committing each batch in a single"
+        " transaction"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--backend",
+            choices=sorted(QUEUE_BACKENDS),
+            help="Queue to drain, settings.BOOKING_QUEUE or db by default",
+        )
+        parser.add_argument("--batch-size", type=int, default=100)
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit once the queue is empty instead of waiting for more",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=1.0,
+            help="Seconds to wait when the queue is empty",
+        )
+
+    def handle(self, *args, **options):
+        queue = get_queue(options["backend"] or settings.BOOKING_QUEUE or "db")
+        booked = rejected = 0
+
+        self.stdout.write("Processing booking queue...")
+        while True:
+            batch_booked, batch_rejected = process_batch(
+                queue, options["batch_size"]
+            )
+            if batch_booked or batch_rejected:
+                booked += batch_booked
+                rejected += batch_rejected
+                self.stdout.write(
+                    f"Batch: {batch_booked} booked, {batch_rejected} rejected"
+                )
+                continue
+
+            if options["once"]:
+                break
+            time.sleep(options["interval"])
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Queue drained: {booked} booked, {rejected} rejected."
+            )
+        )
@@ -0,0 +1,90 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+from django.db.models.functions import Now
+
+from airport.cache import bump_flight_versions
+from airport.models import Flight, Ticket
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare Flight.seats_sold with the actual number of tickets"
+        " and repair any drift"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report drifted flights, do not repair them",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of flights checked per query",
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options["dry_run"]
+        batch_size = options["batch_size"]
+        checked = drifted = 0
+        last_id = 0
+
+        self.stdout.write("Reconciling seats sold counters...")
+        while True:
+            counters = dict(
+                Flight.objects.filter(pk__gt=last_id)
+                .order_by("pk")
+                .values_list("pk", "seats_sold")[:batch_size]
+            )
+            if not counters:
+                break
+
+            actual = dict(
+                Ticket.objects.filter(flight_id__in=counters.keys())
+                .order_by()
+                .values("flight_id")
+                .annotate(count=Count("id"))
+                .values_list("flight_id", "count")
+            )
+            for flight_id, seats_sold in counters.items():
+                sold = actual.get(flight_id, 0)
+                if sold == seats_sold:
+                    continue
+                drifted += 1
+                self.stdout.write(
+                    f"Flight {flight_id}: seats_sold={seats_sold}, "
+                    f"tickets={sold}"
+                )
+                if not dry_run:
+                    self.repair(flight_id)
+
+            checked += len(counters)
+            last_id = max(counters)
+
+        message = f"Checked {checked} flights, {drifted} drifted."
+        if drifted and not dry_run:
+            message += " Counters repaired."
+        self.stdout.write(self.style.SUCCESS(message))
+
+    @staticmethod
+    def repair(flight_id) -> None:
+        """Set the counter of a flight to its ticket count.
+
+        Bookings adjust the counter under the flight row lock, so taking
+        it before counting keeps a booking that commits meanwhile from
+        being lost.
+        """
+        with transaction.atomic():
+            list(
+                Flight.objects.select_for_update()
+                .filter(pk=flight_id)
+                .values_list("pk", flat=True)
+            )
+            Flight.objects.filter(pk=flight_id).update(
+                seats_sold=Ticket.objects.filter(flight_id=flight_id).count(),
+                updated_at=Now(),
+            )
+            bump_flight_versions(flight_id)
@@ -0,0 +1,149 @@
+import random
+import threading
+import time
+from collections import Counter
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from airport.models import Flight, Ticket
+from airport.views import OrderViewSet
+
+STRESS_USER_EMAIL = "stress-booking@airport.local"
+
+
+class Command(BaseCommand):
+    help = (
+        "Fire concurrent orders at one flight and report throughput,"
+        " conflict rate and whether any seat was sold twice"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("flight_id", type=int)
+        parser.add_argument("--threads", type=int, default=8)
+        parser.add_argument(
+            "--orders", type=int, default=200, help="Orders in total"
+        )
+        parser.add_argument(
+            "--seats", type=int, default=2, help="Tickets per order"
+        )
+        parser.add_argument(
+            "--keep",
+            action="store_true",
+            help="Keep the orders created by the run",
+        )
+        parser.add_argument("--seed", type=int)
+
+    def handle(self, *args, **options):
+        try:
+            flight = Flight.objects.select_related("airplane").get(
+                pk=options["flight_id"]
+            )
+        except Flight.DoesNotExist:
+            raise CommandError("Flight does not exist")
+
+        users = get_user_model().objects
+        user = users.filter(email=STRESS_USER_EMAIL).first()
+        if user is None:
+            user = users.create_user(STRESS_USER_EMAIL)
+        seats = [
+            (row, seat)
+            for row in range(1, flight.airplane.rows + 1)
+            for seat in range(1, flight.airplane.seats_in_row + 1)
+        ]
+        per_order = min(options["seats"], len(seats))
+        random.seed(options["seed"])
+        orders = [
+            random.sample(seats, per_order) for _ in range(options["orders"])
+        ]
+        sold_before = flight.tickets.count()
+
+        started = time.monotonic()
+        statuses = self.run(flight, user, orders, options["threads"])
+        elapsed = max(time.monotonic() - started, 1e-9)
+
+        try:
+            self.report(flight, statuses, elapsed, sold_before, per_order)
+        finally:
+            if not options["keep"]:
+                user.orders.all().delete()
+
+    def run(self, flight, user, orders, threads) -> Counter:
+        view = OrderViewSet.as_view({"post": "create"}, throttle_classes=[])
+        factory = APIRequestFactory()
+        statuses = Counter()
+        lock = threading.Lock()
+        pending = iter(orders)
+
+        def worker():
+            try:
+                while True:
+                    with lock:
+                        seats = next(pending, None)
+                    if seats is None:
+                        return
+
+                    request = factory.post(
+                        "/api/airport/orders/",
+                        {
+                            "tickets": [
+                                {"row": row, "seat": seat, "flight": flight.pk}
+                                for row, seat in seats
+                            ]
+                        },
+                        format="json",
+                    )
+                    force_authenticate(request, user=user)
+                    try:
+                        status = view(request).status_code
+                    except Exception as error:
+                        status = type(error).__name__
+                    with lock:
+                        statuses[status] += 1
+            finally:
+                connection.close()
+
+        workers = [threading.Thread(target=worker) for _ in range(threads)]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        return statuses
+
+    def report(self, flight, statuses, elapsed, sold_before, seats) -> None:
+        total = sum(statuses.values())
+        booked, conflicts = statuses[201], statuses[400]
+        errors = total - booked - conflicts
+
+        tickets = Ticket.objects.filter(flight=flight)
+        double_booked = (
+            tickets.values("row", "seat")
+            .annotate(sold=Count("id"))
+            .filter(sold__gt=1)
+            .count()
+        )
+        sold_after = tickets.count()
+        sold = sold_after - sold_before
+        flight.refresh_from_db()
+
+        self.stdout.write(
+            f"{total} orders in {elapsed:.2f}s, {total / elapsed:.1f} "
+            f"orders/s\n"
+            f"{booked} booked, {conflicts} conflicts "
+            f"({conflicts / max(total, 1):.1%}), {errors} errors "
+            f"{dict(statuses)}\n"
+            f"{sold} tickets sold for {booked} orders of {seats} seats, "
+            f"seats_sold counter {flight.seats_sold}, "
+            f"{double_booked} seats sold twice"
+        )
+        if (
+            double_booked
+            or errors
+            or sold != booked * seats
+            or flight.seats_sold != sold_after
+        ):
+            raise CommandError("Booking is not consistent under load")
+        self.stdout.write(self.style.SUCCESS("No seat was sold twice."))
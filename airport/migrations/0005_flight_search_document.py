@@ -0,0 +1,46 @@
+# Generated by Django 5.0.6 on 2026-10-18 04:31
+
+from django.db import migrations, models
+
+from airport.search import install_search_index, uninstall_search_index
+
+
+def populate_search_document(apps, schema_editor):
+    Flight = apps.get_model("airport", "Flight")
+    Route = apps.get_model("airport", "Route")
+    for route_id, *names in Route.objects.values_list(
+        "pk",
+        "source__name",
+        "source__closest_big_city__name",
+        "source__closest_big_city__country__name",
+    ):
+        Flight.objects.filter(route_id=route_id).update(
+            search_document="\n".join(name for name in names if name).lower()
+        )
+
+
+def create_search_index(apps, schema_editor):
+    install_search_index(schema_editor)
+
+
+def drop_search_index(apps, schema_editor):
+    uninstall_search_index(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("airport", "0004_search_path_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="flight",
+            name="search_document",
+            field=models.TextField(blank=True, default="", editable=False),
+        ),
+        migrations.RunPython(
+            populate_search_document, migrations.RunPython.noop
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
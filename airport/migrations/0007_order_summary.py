@@ -0,0 +1,100 @@
+# Generated by Django 5.0.6 on 2026-10-18 04:53
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+BATCH_SIZE = 1000
+
+
+def populate_order_summaries(apps, schema_editor):
+    Order = apps.get_model("airport", "Order")
+    OrderSummary = apps.get_model("airport", "OrderSummary")
+    Ticket = apps.get_model("airport", "Ticket")
+
+    order_ids = list(Order.objects.order_by("pk").values_list("pk", flat=True))
+    for start in range(0, len(order_ids), BATCH_SIZE):
+        summaries = {
+            order_id: OrderSummary(order_id=order_id, flight_ids=[])
+            for order_id in order_ids[start : start + BATCH_SIZE]
+        }
+        tickets = (
+            Ticket.objects.filter(order_id__in=summaries)
+            .order_by("flight__departure_time", "flight_id")
+            .values_list(
+                "order_id",
+                "flight_id",
+                "flight__departure_time",
+                "flight__arrival_time",
+                "flight__route__source_id",
+            )
+        )
+        for order_id, flight_id, departure, arrival, source_id in tickets:
+            summary = summaries[order_id]
+            if not summary.tickets_count:
+                summary.first_departure_time = departure
+                summary.origin_id = source_id
+            summary.tickets_count += 1
+            if flight_id not in summary.flight_ids:
+                summary.flight_ids.append(flight_id)
+            if (
+                summary.last_arrival_time is None
+                or arrival > summary.last_arrival_time
+            ):
+                summary.last_arrival_time = arrival
+
+        for summary in summaries.values():
+            summary.flight_ids.sort()
+        OrderSummary.objects.bulk_create(summaries.values())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("airport", "0006_booking_request"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OrderSummary",
+            fields=[
+                (
+                    "order",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="summary",
+                        serialize=False,
+                        to="airport.order",
+                    ),
+                ),
+                ("first_departure_time", models.DateTimeField(null=True)),
+                ("last_arrival_time", models.DateTimeField(null=True)),
+                ("tickets_count", models.PositiveIntegerField(default=0)),
+                ("flight_ids", models.JSONField(default=list)),
+                (
+                    "origin",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to="airport.airport",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["first_departure_time"],
+                        name="order_summary_departure_idx",
+                    ),
+                    models.Index(
+                        fields=["last_arrival_time"],
+                        name="order_summary_arrival_idx",
+                    ),
+                ],
+            },
+        ),
+        migrations.RunPython(
+            populate_order_summaries, migrations.RunPython.noop
+        ),
+    ]
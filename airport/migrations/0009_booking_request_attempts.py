@@ -0,0 +1,18 @@
+# Generated by Django 5.0.6 on 2026-10-18 05:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("airport", "0008_updated_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="bookingrequest",
+            name="attempts",
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+    ]
@@ -3,6 +3,8 @@ import uuid
 
 from django.conf import settings
 from django.db import models
+from django.db.models import F
+from django.db.models.functions import Now
 from django.utils.text import slugify
 from rest_framework.exceptions import ValidationError
 
@@ -10,6 +12,7 @@ from rest_framework.exceptions import ValidationError
 class Crew(models.Model):
     first_name = models.CharField(max_length=250)
     last_name = models.CharField(max_length=250)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self) -> str:
         return f"{self.first_name} {self.last_name}"
@@ -20,6 +23,7 @@ class Crew(models.Model):
 
 class AirplaneType(models.Model):
     name = models.CharField(max_length=250, unique=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self) -> str | models.CharField:
         return self.name
@@ -40,6 +44,7 @@ class Airplane(models.Model):
         AirplaneType, on_delete=models.CASCADE, related_name="airplanes"
     )
     image = models.ImageField(null=True, upload_to=airplane_image_file_path)
+    updated_at = models.DateTimeField(auto_now=True)
 
     @property
     def capacity(self) -> int:
@@ -54,6 +59,7 @@ class Airplane(models.Model):
 
 class Country(models.Model):
     name = models.CharField(max_length=250, unique=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self) -> str | models.CharField:
         return self.name
@@ -67,12 +73,16 @@ class City(models.Model):
     country = models.ForeignKey(
         Country, on_delete=models.CASCADE, related_name="cities"
     )
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self) -> str | models.CharField:
         return self.name
 
     class Meta:
         ordering = ("name",)
+        indexes = [
+            models.Index(fields=["name"], name="city_name_idx"),
+        ]
 
 
 class Airport(models.Model):
@@ -80,6 +90,7 @@ class Airport(models.Model):
     closest_big_city = models.ForeignKey(
         City, on_delete=models.SET_NULL, null=True, related_name="airports"
     )
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self) -> str | models.CharField:
         return self.name
@@ -96,12 +107,17 @@ class Route(models.Model):
         Airport, on_delete=models.CASCADE, related_name="destination_routes"
     )
     distance = models.IntegerField()
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self) -> str | models.CharField:
         return f"{self.source.name}-{self.destination.name}"
 
 
 class Flight(models.Model):
+    # Kept up to date with queryset updates, so saving an instance loaded
+    # before a booking or a rename doesn't write stale values back
+    DENORMALIZED_FIELDS = ("seats_sold", "search_document")
+
     route = models.ForeignKey(
         Route, on_delete=models.CASCADE, related_name="flights"
     )
@@ -111,6 +127,41 @@ class Flight(models.Model):
     departure_time = models.DateTimeField()
     arrival_time = models.DateTimeField()
     crew = models.ManyToManyField(Crew, blank=True)
+    seats_sold = models.IntegerField(default=0, editable=False)
+    search_document = models.TextField(blank=True, default="", editable=False)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    @property
+    def seats_available(self) -> int:
+        return self.airplane.capacity - self.seats_sold
+
+    @staticmethod
+    def adjust_seats_sold(flight_id, delta) -> None:
+        Flight.objects.filter(pk=flight_id).update(
+            seats_sold=F("seats_sold") + delta, updated_at=Now()
+        )
+
+    def save(
+        self,
+        force_insert=False,
+        force_update=False,
+        using=None,
+        update_fields=None,
+    ) -> None:
+        if (
+            update_fields is None
+            and not force_insert
+            and not self._state.adding
+        ):
+            update_fields = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in self.DENORMALIZED_FIELDS
+            ]
+        return super(Flight, self).save(
+            force_insert, force_update, using, update_fields
+        )
 
     def __str__(self) -> str | models.CharField:
         return f"Route: {str(self.route)}, Airplane: {str(self.airplane)}"
@@ -120,6 +171,17 @@ class Flight(models.Model):
             "-departure_time",
             "-arrival_time",
         )
+        indexes = [
+            models.Index(
+                fields=["departure_time", "arrival_time", "id"],
+                name="flight_departure_arrival_idx",
+            ),
+            models.Index(fields=["arrival_time"], name="flight_arrival_idx"),
+            models.Index(
+                fields=["route", "departure_time"],
+                name="flight_route_departure_idx",
+            ),
+        ]
 
 
 class Order(models.Model):
@@ -129,12 +191,19 @@ class Order(models.Model):
         on_delete=models.CASCADE,
         related_name="orders",
     )
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self) -> str | models.CharField:
         return str(self.created_at)
 
     class Meta:
         ordering = ("-created_at",)
+        indexes = [
+            models.Index(
+                fields=["user", "created_at", "id"],
+                name="order_user_created_idx",
+            ),
+        ]
 
 
 class Ticket(models.Model):
@@ -146,6 +215,7 @@ class Ticket(models.Model):
     order = models.ForeignKey(
         Order, on_delete=models.CASCADE, related_name="tickets"
     )
+    updated_at = models.DateTimeField(auto_now=True)
 
     @staticmethod
     def validate_ticket(row, seat, flight, error) -> None:
@@ -197,3 +267,83 @@ class Ticket(models.Model):
             "row",
             "seat",
         )
+
+
+class OrderSummary(models.Model):
+    """Per-order fields for filtering and sorting order lists.
+
+    Kept in step with the order's tickets by ``airport.summaries``, so
+    order lists don't join through every ticket and flight.
+    """
+
+    order = models.OneToOneField(
+        Order,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="summary",
+    )
+    first_departure_time = models.DateTimeField(null=True)
+    last_arrival_time = models.DateTimeField(null=True)
+    origin = models.ForeignKey(
+        Airport, on_delete=models.SET_NULL, null=True, related_name="+"
+    )
+    tickets_count = models.PositiveIntegerField(default=0)
+    flight_ids = models.JSONField(default=list)
+
+    def __str__(self) -> str:
+        return f"Summary of order {self.order_id}"
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["first_departure_time"],
+                name="order_summary_departure_idx",
+            ),
+            models.Index(
+                fields=["last_arrival_time"],
+                name="order_summary_arrival_idx",
+            ),
+        ]
+
+
+class BookingRequest(models.Model):
+    PENDING = "pending"
+    BOOKED = "booked"
+    REJECTED = "rejected"
+    STATUS_CHOICES = (
+        (PENDING, "Pending"),
+        (BOOKED, "Booked"),
+        (REJECTED, "Rejected"),
+    )
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="booking_requests",
+    )
+    tickets = models.JSONField()
+    status = models.CharField(
+        max_length=8, choices=STATUS_CHOICES, default=PENDING
+    )
+    order = models.OneToOneField(
+        Order,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="booking_request",
+    )
+    errors = models.JSONField(null=True, blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self) -> str:
+        return f"Booking request {self.pk} ({self.status})"
+
+    class Meta:
+        ordering = ("id",)
+        indexes = [
+            models.Index(
+                fields=["status", "id"], name="booking_request_status_idx"
+            ),
+        ]
@@ -0,0 +1,77 @@
+import hashlib
+
+from django.core.cache import cache
+from django.db.models import Q
+from rest_framework import status
+from rest_framework.response import Response
+
+from airport.cache import REFERENCE_VERSION_KEY, bump_versions, get_version
+from airport.models import Order
+
+ORDER_CACHE_TIMEOUT = 60 * 60
+
+
+def order_version_key(user_id) -> str:
+    return f"orders:{user_id}:version"
+
+
+def order_version_keys(request, *args, **kwargs) -> tuple:
+    return order_version_key(request.user.pk), REFERENCE_VERSION_KEY
+
+
+def bump_order_versions(*user_ids) -> None:
+    bump_versions(*(order_version_key(user_id) for user_id in user_ids))
+
+
+def invalidate_order_caches(order_ids=(), flight_ids=()) -> None:
+    """Bump the order versions of the users a change is visible to.
+
+    Those are the owners of ``order_ids`` and everyone holding tickets on
+    ``flight_ids``. Order details show the flights with their taken
+    seats, so a change to a flight or to any of its tickets reaches all
+    of its holders.
+    """
+    order_ids = [order_id for order_id in order_ids if order_id is not None]
+    flight_ids = [pk for pk in flight_ids if pk is not None]
+    if not order_ids and not flight_ids:
+        return
+    bump_order_versions(
+        *Order.objects.filter(
+            Q(pk__in=order_ids) | Q(tickets__flight_id__in=flight_ids)
+        )
+        .order_by()
+        .values_list("user_id", flat=True)
+        .distinct()
+    )
+
+
+class OrderCacheMixin:
+    """Cache the ``list`` and ``retrieve`` payloads of each user.
+
+    Keys embed the user's order version, bumped through
+    ``invalidate_order_caches`` when their orders, tickets or flights
+    change, and the reference data version. Only ``response.data`` is
+    kept, rendering and headers are left to each request.
+    """
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(super().retrieve, request, *args, **kwargs)
+
+    def order_cache_key(self, request) -> str:
+        versions = ".".join(map(get_version, order_version_keys(request)))
+        url = hashlib.md5(request.build_absolute_uri().encode()).hexdigest()
+        return f"orders.{request.user.pk}.{versions}.{url}"
+
+    def cached_response(self, view, request, *args, **kwargs):
+        key = self.order_cache_key(request)
+        data = cache.get(key)
+        if data is not None:
+            return Response(data)
+
+        response = view(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(key, response.data, ORDER_CACHE_TIMEOUT)
+        return response
@@ -1,19 +1,358 @@
-from rest_framework.pagination import PageNumberPagination
+import base64
+import hashlib
+import json
+from functools import partial
+
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet, ValidationError
+from django.core.paginator import EmptyPage, Page, Paginator
+from django.core.paginator import PageNotAnInteger
+from django.db import connections
+from django.db.models import Q
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import (
+    BasePagination,
+    PageNumberPagination,
+    _positive_int,
+)
 from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+COUNT_CACHE_TIMEOUT = 60
+ESTIMATE_EXACT_THRESHOLD = 1000
+
+
+class LookaheadPage(Page):
+    def __init__(self, object_list, number, paginator, has_next) -> None:
+        super().__init__(object_list, number, paginator)
+        self._has_next = has_next
+
+    def has_next(self):
+        return self._has_next
+
+
+class CountingPaginator(Paginator):
+    """Paginator with a pluggable ``count`` strategy.
+
+    ``exact`` runs COUNT(*). ``cached`` keeps exact counts in the cache
+    per query for a short time. ``estimated`` reads the planner row
+    estimate on PostgreSQL and falls back to exact counts for small
+    results and other databases. ``count_mode`` reports the strategy
+    that actually produced the count.
+
+    Pages of non-exact counts look one row ahead to decide whether a next
+    page exists, so a stale or estimated count never hides rows.
+    """
+
+    COUNT_MODES = ("exact", "cached", "estimated")
+
+    def __init__(self, object_list, per_page, count_mode="exact", **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.count_mode = count_mode
+
+    @cached_property
+    def count(self):
+        if self.count_mode == "cached":
+            return self._cached_count()
+        if self.count_mode == "estimated":
+            return self._estimated_count()
+        return Paginator.count.func(self)
+
+    def _exact_count(self):
+        self.count_mode = "exact"
+        return Paginator.count.func(self)
+
+    def _cached_count(self):
+        try:
+            sql, params = self.object_list.order_by().query.sql_with_params()
+        except EmptyResultSet:
+            return self._exact_count()
+
+        digest = hashlib.md5(repr((sql, params)).encode()).hexdigest()
+        return cache.get_or_set(
+            f"pagination:count:{digest}",
+            lambda: Paginator.count.func(self),
+            COUNT_CACHE_TIMEOUT,
+        )
+
+    def _estimated_count(self):
+        queryset = self.object_list
+        if connections[queryset.db].vendor != "postgresql":
+            return self._exact_count()
+
+        plan = json.loads(queryset.order_by().explain(format="json"))
+        estimate = int(plan[0]["Plan"]["Plan Rows"])
+        if estimate < ESTIMATE_EXACT_THRESHOLD:
+            return self._exact_count()
+        return estimate
+
+    def validate_number(self, number):
+        if self.count_mode == "exact":
+            return super().validate_number(number)
+
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger("That page number is not an integer")
+        if number < 1:
+            raise EmptyPage("That page number is less than 1")
+        return number
+
+    def page(self, number):
+        if self.count_mode == "exact":
+            return super().page(number)
+
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom : bottom + self.per_page + 1])
+        if not rows and number > 1:
+            raise EmptyPage("That page contains no results")
+        return LookaheadPage(
+            rows[: self.per_page],
+            number,
+            self,
+            has_next=len(rows) > self.per_page,
+        )
+
+
+class KeysetPagination(BasePagination):
+    """Cursor pagination over a composite, unique ``ordering``.
+
+    The cursor holds the ordering values of the first or last row of the
+    current page, and the next page is fetched with a row comparison on
+    them, so deep pages cost the same as the first one and no COUNT is
+    needed.
+    """
+
+    ordering = ("-id",)
+    page_size = 5
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        position, self.reverse = self.decode_cursor(request, queryset.model)
+
+        ordering = self.ordering
+        if self.reverse:
+            ordering = tuple(self._flip(field) for field in ordering)
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(self._after(ordering, position))
+
+        results = list(queryset[: self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[: self.page_size]
+        if self.reverse:
+            results.reverse()
+
+        has_next = has_more if not self.reverse else position is not None
+        has_previous = position is not None if not self.reverse else has_more
+        self.next_position = (
+            self._position(results[-1]) if has_next and results else None
+        )
+        self.previous_position = (
+            self._position(results[0]) if has_previous and results else None
+        )
+        return results
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {
+                    "type": "string",
+                    "nullable": True,
+                    "format": "uri",
+                },
+                "results": schema,
+            },
+        }
+
+    def get_page_size(self, request):
+        try:
+            return _positive_int(
+                request.query_params[self.page_size_query_param],
+                strict=True,
+                cutoff=self.max_page_size,
+            )
+        except (KeyError, ValueError):
+            return self.page_size
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        return self.encode_cursor(self.next_position, reverse=False)
+
+    def get_previous_link(self):
+        if self.previous_position is None:
+            return None
+        return self.encode_cursor(self.previous_position, reverse=True)
+
+    def decode_cursor(self, request, model):
+        """The position and direction of the cursor in ``request``.
+
+        Each position value is converted by the matching ordering field of
+        ``model``, so tampered cursors are rejected before they reach the
+        query.
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+
+        try:
+            cursor = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            position, reverse = cursor["p"], bool(cursor.get("r"))
+            if not isinstance(position, list) or len(position) != len(
+                self.ordering
+            ):
+                raise ValueError("Cursor position doesn't match ordering")
+            position = [
+                self._to_python(model, field, value)
+                for field, value in zip(self.ordering, position)
+            ]
+        except (TypeError, ValueError, KeyError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    def encode_cursor(self, position, reverse):
+        cursor = {"p": position}
+        if reverse:
+            cursor["r"] = 1
+        encoded = base64.urlsafe_b64encode(
+            json.dumps(cursor, separators=(",", ":")).encode()
+        ).decode()
+        url = remove_query_param(self.request.build_absolute_uri(), "page")
+        return replace_query_param(url, self.cursor_query_param, encoded)
+
+    def _position(self, item):
+        position = []
+        for field in self.ordering:
+            name = field.lstrip("-")
+            value = (
+                item[name] if isinstance(item, dict) else getattr(item, name)
+            )
+            position.append(
+                value.isoformat() if hasattr(value, "isoformat") else value
+            )
+        return position
+
+    @staticmethod
+    def _to_python(model, field, value):
+        field = model._meta.get_field(field.lstrip("-"))
+        value = field.to_python(value)
+        if value is None:
+            raise ValueError("Cursor values can't be null")
+        field.run_validators(value)
+        return value
+
+    @staticmethod
+    def _flip(field):
+        return field[1:] if field.startswith("-") else f"-{field}"
+
+    @staticmethod
+    def _after(ordering, position):
+        """Rows strictly after ``position`` in ``ordering``."""
+        condition = Q()
+        equal = {}
+        for field, value in zip(ordering, position):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            condition |= Q(**equal, **{f"{name}__{lookup}": value})
+            equal[name] = value
+        return condition
+
+
+class FlightCursorPagination(KeysetPagination):
+    ordering = ("-departure_time", "-arrival_time", "id")
+
+
+class OrderCursorPagination(KeysetPagination):
+    ordering = ("-created_at", "id")
 
 
 class Pagination(PageNumberPagination):
     page_size = 5
     page_size_query_param = "page_size"
     max_page_size = 100
+    mode_query_param = "pagination"
+    cursor_mode = "cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_paginator = None
+        self.django_paginator_class = partial(
+            CountingPaginator,
+            count_mode=getattr(view, "pagination_count_mode", "exact"),
+        )
+        cursor_class = getattr(view, "cursor_pagination_class", None)
+        if cursor_class is not None and self.is_cursor_request(
+            request, cursor_class
+        ):
+            self.cursor_paginator = cursor_class()
+            return self.cursor_paginator.paginate_queryset(
+                queryset, request, view
+            )
+        return super().paginate_queryset(queryset, request, view)
+
+    def is_cursor_request(self, request, cursor_class):
+        return (
+            request.query_params.get(self.mode_query_param) == self.cursor_mode
+            or cursor_class.cursor_query_param in request.query_params
+        )
 
     def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+
+        paginator = self.page.paginator
         return Response(
             {
-                "count": self.page.paginator.count,
+                "count": paginator.count,
+                "count_mode": paginator.count_mode,
                 "next": self.get_next_link(),
-                "pages": self.page.paginator.num_pages,
+                "pages": paginator.num_pages,
                 "previous": self.get_previous_link(),
                 "results": data,
             }
         )
+
+    def get_schema_operation_parameters(self, view):
+        parameters = super().get_schema_operation_parameters(view)
+        if getattr(view, "cursor_pagination_class", None) is None:
+            return parameters
+
+        return parameters + [
+            {
+                "name": self.mode_query_param,
+                "required": False,
+                "in": "query",
+                "description": (
+                    "Set to 'cursor' for keyset pagination, which returns "
+                    "only next/previous links and results"
+                ),
+                "schema": {"type": "string", "enum": [self.cursor_mode]},
+            },
+            {
+                "name": KeysetPagination.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Cursor from a next/previous link",
+                "schema": {"type": "string"},
+            },
+        ]
@@ -0,0 +1,122 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.core.signals import request_started
+from django.db import transaction
+from django.dispatch import receiver
+
+from airport.cache import REFERENCE_VERSION_KEY, bump_versions, get_version
+from airport.models import Airport
+
+REFERENCE_CACHE_SIZE = 1024
+# Outside requests the version stamp is checked at most this often
+VERSION_CHECK_INTERVAL = 5
+
+
+class ReferenceCache:
+    """Bounded, thread-safe LRU of reference data lookups.
+
+    Entries live in the process and are dropped as a whole when the
+    version stamp in the shared cache changes, which
+    ``invalidate_reference_data`` does after every write to a reference
+    table. The stamp is checked once per request and every
+    ``VERSION_CHECK_INTERVAL`` seconds outside requests.
+    """
+
+    def __init__(self, max_size=REFERENCE_CACHE_SIZE) -> None:
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._version = None
+        self._local = threading.local()
+
+    def get(self, key, load):
+        """Return the entry for ``key``, calling ``load()`` on a miss."""
+        version = self._sync()
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+
+        value = load()
+        with self._lock:
+            if version == self._version:
+                self._entries[key] = value
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._version = None
+        self.expire_check()
+
+    def expire_check(self) -> None:
+        """Make the next lookup of this thread check the version stamp."""
+        self._local.checked_at = None
+
+    def _sync(self):
+        now = time.monotonic()
+        checked_at = getattr(self._local, "checked_at", None)
+        if (
+            checked_at is not None
+            and now - checked_at < VERSION_CHECK_INTERVAL
+        ):
+            return self._version
+
+        version = get_version(REFERENCE_VERSION_KEY)
+        self._local.checked_at = now
+        with self._lock:
+            if version != self._version:
+                self._entries.clear()
+                self._version = version
+        return version
+
+
+reference_cache = ReferenceCache()
+
+
+@receiver(request_started)
+def check_reference_version(sender, **kwargs):
+    reference_cache.expire_check()
+
+
+def invalidate_reference_data() -> None:
+    """Drop cached reference data here now and everywhere on commit."""
+    reference_cache.clear()
+    transaction.on_commit(reference_cache.clear)
+    bump_versions(REFERENCE_VERSION_KEY)
+
+
+def reference_names(model, ids=()) -> dict[int, str]:
+    """``{pk: name}`` of every row of a reference table.
+
+    Names can be older than the rows referring to them, between a commit
+    and its version bump or when the version stamp was evicted. If any
+    of ``ids`` is missing, the cache is cleared and the names are loaded
+    again once.
+    """
+
+    def load():
+        return reference_cache.get(
+            ("names", model._meta.label),
+            lambda: dict(model.objects.order_by().values_list("pk", "name")),
+        )
+
+    names = load()
+    if any(pk not in names for pk in ids if pk is not None):
+        reference_cache.clear()
+        names = load()
+    return names
+
+
+def airport_ids(**lookups) -> frozenset[int]:
+    """Primary keys of the airports matching ``lookups``."""
+    return reference_cache.get(
+        ("airport-ids", tuple(sorted(lookups.items()))),
+        lambda: frozenset(
+            Airport.objects.filter(**lookups).values_list("pk", flat=True)
+        ),
+    )
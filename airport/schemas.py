@@ -1,8 +1,12 @@
+from drf_spectacular.plumbing import get_lib_doc_excludes
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import (
     extend_schema,
     OpenApiParameter,
 )
+from .conditional import ConditionalGetMixin
+from .fragments import FragmentCacheMixin
+from .order_cache import OrderCacheMixin
 from .serializers import (
     CrewSerializer,
     AirplaneTypeSerializer,
@@ -17,11 +21,44 @@ from .serializers import (
     RouteDetailSerializer,
     FlightListSerializer,
     FlightDetailSerializer,
+    SeatHoldSerializer,
+    BestSeatsSerializer,
     OrderListSerializer,
+    OrderSerializer,
     OrderDetailSerializer,
+    BookingRequestSerializer,
 )
 
 
+def get_doc_excludes() -> list:
+    """Classes whose docstrings never describe a schema component.
+
+    Mixins document their implementation, not the API, so the search
+    for a description stops at them.
+    """
+    return [
+        *get_lib_doc_excludes(),
+        ConditionalGetMixin,
+        FragmentCacheMixin,
+        OrderCacheMixin,
+    ]
+
+
+EXPORT_PARAMETERS = [
+    OpenApiParameter(
+        name="file_format",
+        description="Export format: csv (default) or ndjson",
+        required=False,
+        type=OpenApiTypes.STR,
+        enum=["csv", "ndjson"],
+    ),
+]
+EXPORT_RESPONSES = {
+    (200, "text/csv"): OpenApiTypes.STR,
+    (200, "application/x-ndjson"): OpenApiTypes.STR,
+}
+
+
 class CrewSchema:
     list = extend_schema(
         parameters=[
@@ -381,6 +418,70 @@ class FlightSchema:
             200: FlightDetailSerializer,
         }
     )
+    seat_map = extend_schema(
+        description=(
+            "Taken seats of a flight. Seats held by a passenger count as "
+            "taken, ``held`` gives the number of held seats."
+        ),
+        parameters=[
+            OpenApiParameter(
+                name="encoding",
+                description=(
+                    "Seat map encoding: bitmap (base64, one bit per seat, "
+                    "row by row), rle (per row run lengths starting with "
+                    "free seats) or json (per row lists of 0/1) "
+                    "(ex. ?encoding=rle)"
+                ),
+                required=False,
+                type=OpenApiTypes.STR,
+                enum=["bitmap", "rle", "json"],
+            ),
+        ],
+        responses={
+            200: OpenApiTypes.OBJECT,
+        },
+    )
+    best_seats = extend_schema(
+        description=(
+            "Best block of ``count`` adjacent free seats of a flight: the "
+            "front-most block in a single row closest to the middle of "
+            "the row, otherwise the group split over as few consecutive "
+            "rows as possible. Seats held by other passengers are "
+            "skipped. The seats are only suggested, hold or order them to "
+            "keep them. Returns 409 when no such block is left."
+        ),
+        parameters=[BestSeatsSerializer],
+        responses={
+            200: OpenApiTypes.OBJECT,
+            409: OpenApiTypes.OBJECT,
+        },
+    )
+    holds = extend_schema(
+        description=(
+            "Hold seats of a flight for the current user (POST), list the "
+            "user's holds (GET) or release them (DELETE, all holds when no "
+            "seats are given). Held seats count as taken in the seat map "
+            "and can only be ordered by their holder. Returns 409 when a "
+            "seat is already sold or held by someone else."
+        ),
+        request=SeatHoldSerializer,
+        responses={
+            200: OpenApiTypes.OBJECT,
+            201: OpenApiTypes.OBJECT,
+            204: None,
+            409: OpenApiTypes.OBJECT,
+        },
+    )
+
+    manifest = extend_schema(
+        description=(
+            "Passenger manifest of a flight, one line per ticket with the "
+            "seat, order and passenger, streamed as CSV or NDJSON. Admin "
+            "only."
+        ),
+        parameters=EXPORT_PARAMETERS,
+        responses=EXPORT_RESPONSES,
+    )
 
 
 class OrderSchema:
@@ -389,9 +490,9 @@ class OrderSchema:
             OpenApiParameter(
                 name="ordering",
                 description=(
-                    "Order by created_at, tickets__flight__departure_time,"
-                    " tickets__flight__arrival_time"
-                    "(ex. ?ordering=created_at,"
+                    "Order by created_at, tickets__flight__departure_time "
+                    "(first departure), tickets__flight__arrival_time "
+                    "(last arrival) (ex. ?ordering=created_at,"
                     "-tickets__flight__departure_time)"
                 ),
                 required=False,
@@ -402,17 +503,18 @@ class OrderSchema:
             OpenApiParameter(
                 name="search",
                 description=(
-                    "Search by source name, city name and country name "
+                    "Search by origin airport, city and country name, the "
+                    "origin being the source of the earliest flight "
                     "(ex. ?search=Kiev)"
                 ),
                 required=False,
                 type=OpenApiTypes.STR,
             ),
             OpenApiParameter(
-                name="route__source__name",
+                name="tickets__flight__route__source__name",
                 description=(
-                    "Filter by route__source__name "
-                    "(ex. ?route__source__name=Borispil)"
+                    "Filter by origin airport name "
+                    "(ex. ?tickets__flight__route__source__name=Borispil)"
                 ),
                 required=False,
                 type=OpenApiTypes.STR,
@@ -420,8 +522,7 @@ class OrderSchema:
             OpenApiParameter(
                 name="tickets__flight__route__source__closest_big_city__name",
                 description=(
-                    "Filter by tickets__flight__route__"
-                    "source__closest_big_city__name "
+                    "Filter by origin city name "
                     "(ex. ?tickets__flight__route__"
                     "source__closest_big_city__name=Kiev)"
                 ),
@@ -432,9 +533,7 @@ class OrderSchema:
                 name="tickets__flight__route__source__"
                 "closest_big_city__country__name",
                 description=(
-                    "Filter by "
-                    "tickets__flight__route__source__"
-                    "closest_big_city__country__name "
+                    "Filter by origin country name "
                     "(ex. ?tickets__flight__route__source__"
                     "closest_big_city__country__name=Ukraine)"
                 ),
@@ -451,3 +550,50 @@ class OrderSchema:
             200: OrderDetailSerializer,
         }
     )
+    export = extend_schema(
+        description=(
+            "Order history of the current user, one line per ticket, "
+            "streamed as CSV or NDJSON. Takes the same search and filters "
+            "as the order list."
+        ),
+        parameters=EXPORT_PARAMETERS,
+        responses=EXPORT_RESPONSES,
+    )
+    create = extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="Idempotency-Key",
+                location=OpenApiParameter.HEADER,
+                description=(
+                    "Unique key of this order attempt. Retries with the same "
+                    "key and body replay the first successful response "
+                    "instead of booking again"
+                ),
+                required=False,
+                type=OpenApiTypes.STR,
+            ),
+        ],
+        request=OrderSerializer,
+        responses={
+            201: OrderSerializer,
+            202: BookingRequestSerializer,
+        },
+        description=(
+            "Create an order. When queued booking is enabled the order is "
+            "only checked for shape and queued, the 202 response links to "
+            "the booking request that reports the outcome."
+        ),
+    )
+
+
+class BookingRequestSchema:
+    list = extend_schema(
+        responses={
+            200: BookingRequestSerializer(many=True),
+        }
+    )
+    retrieve = extend_schema(
+        responses={
+            200: BookingRequestSerializer,
+        }
+    )
@@ -0,0 +1,161 @@
+from django.db import connections
+from django.db.models.expressions import RawSQL
+from rest_framework.filters import SearchFilter
+
+from airport.models import Flight
+
+SQLITE_FTS_TABLE = "airport_flight_search"
+# The FTS5 trigram tokenizer only indexes terms of three or more characters
+FTS_MIN_TERM_LENGTH = 3
+
+SOURCE_NAME_FIELDS = (
+    "source__name",
+    "source__closest_big_city__name",
+    "source__closest_big_city__country__name",
+)
+
+
+def build_search_document(*names) -> str:
+    """Lowercased text searched by ``FlightSearchFilter``.
+
+    It holds the source airport, city and country names, the fields that
+    ``?search=`` on flights used to match one by one.
+    """
+    return "\n".join(name for name in names if name).lower()
+
+
+def route_search_documents(routes) -> dict:
+    return {
+        pk: build_search_document(*names)
+        for pk, *names in routes.values_list("pk", *SOURCE_NAME_FIELDS)
+    }
+
+
+def refresh_search_documents(routes) -> None:
+    """Rewrite the search document of every flight on ``routes``."""
+    for route_id, document in route_search_documents(routes).items():
+        Flight.objects.filter(route_id=route_id).exclude(
+            search_document=document
+        ).update(search_document=document)
+
+
+SQLITE_FTS_SQL = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {SQLITE_FTS_TABLE} USING fts5("
+    "search_document, content='airport_flight', content_rowid='id', "
+    "tokenize='trigram')",
+    f"CREATE TRIGGER IF NOT EXISTS {SQLITE_FTS_TABLE}_ai "
+    "AFTER INSERT ON airport_flight BEGIN "
+    f"INSERT INTO {SQLITE_FTS_TABLE}(rowid, search_document) "
+    "VALUES (new.id, new.search_document); END",
+    f"CREATE TRIGGER IF NOT EXISTS {SQLITE_FTS_TABLE}_ad "
+    "AFTER DELETE ON airport_flight BEGIN "
+    f"INSERT INTO {SQLITE_FTS_TABLE}"
+    f"({SQLITE_FTS_TABLE}, rowid, search_document) "
+    "VALUES ('delete', old.id, old.search_document); END",
+    f"CREATE TRIGGER IF NOT EXISTS {SQLITE_FTS_TABLE}_au "
+    "AFTER UPDATE OF search_document ON airport_flight BEGIN "
+    f"INSERT INTO {SQLITE_FTS_TABLE}"
+    f"({SQLITE_FTS_TABLE}, rowid, search_document) "
+    "VALUES ('delete', old.id, old.search_document); "
+    f"INSERT INTO {SQLITE_FTS_TABLE}(rowid, search_document) "
+    "VALUES (new.id, new.search_document); END",
+    f"INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}) VALUES ('rebuild')",
+]
+
+POSTGRESQL_SQL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS flight_search_trgm_idx ON airport_flight "
+    "USING gin (search_document gin_trgm_ops)",
+]
+
+
+def sqlite_supports_fts(connection) -> bool:
+    """FTS5 with the trigram tokenizer needs SQLite 3.34+."""
+    with connection.cursor() as cursor:
+        cursor.execute("PRAGMA compile_options")
+        options = {row[0] for row in cursor.fetchall()}
+    return "ENABLE_FTS5" in options and (
+        connection.Database.sqlite_version_info >= (3, 34)
+    )
+
+
+def install_search_index(schema_editor) -> None:
+    """Create the search index for ``Flight.search_document``.
+
+    Safe to run again; SQLite drops the sync triggers whenever a migration
+    rebuilds ``airport_flight``, so such migrations have to call it.
+    """
+    connection = schema_editor.connection
+    if connection.vendor == "postgresql":
+        statements = POSTGRESQL_SQL
+    elif connection.vendor == "sqlite" and sqlite_supports_fts(connection):
+        statements = SQLITE_FTS_SQL
+    else:
+        return
+
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def uninstall_search_index(schema_editor) -> None:
+    connection = schema_editor.connection
+    if connection.vendor == "postgresql":
+        schema_editor.execute("DROP INDEX IF EXISTS flight_search_trgm_idx")
+    elif connection.vendor == "sqlite":
+        for suffix in ("ai", "ad", "au"):
+            schema_editor.execute(
+                f"DROP TRIGGER IF EXISTS {SQLITE_FTS_TABLE}_{suffix}"
+            )
+        schema_editor.execute(f"DROP TABLE IF EXISTS {SQLITE_FTS_TABLE}")
+
+
+def has_sqlite_fts(connection) -> bool:
+    if not hasattr(connection, "_airport_has_fts"):
+        connection._airport_has_fts = (
+            SQLITE_FTS_TABLE in connection.introspection.table_names()
+        )
+    return connection._airport_has_fts
+
+
+class FlightSearchFilter(SearchFilter):
+    """Drop-in ``SearchFilter`` backed by ``Flight.search_document``.
+
+    PostgreSQL serves the substring match from a trigram GIN index,
+    SQLite from an FTS5 trigram table. Each search term has to match.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        if not terms:
+            return queryset
+
+        connection = connections[queryset.db]
+        for term in terms:
+            term = term.lower()
+            if (
+                connection.vendor == "sqlite"
+                and len(term) >= FTS_MIN_TERM_LENGTH
+                and has_sqlite_fts(connection)
+            ):
+                phrase = '"{}"'.format(term.replace('"', '""'))
+                queryset = queryset.filter(
+                    pk__in=RawSQL(
+                        f"SELECT rowid FROM {SQLITE_FTS_TABLE} "
+                        f"WHERE {SQLITE_FTS_TABLE} MATCH %s",
+                        (phrase,),
+                    )
+                )
+            else:
+                queryset = queryset.filter(search_document__contains=term)
+        return queryset
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.search_param,
+                "required": False,
+                "in": "query",
+                "description": str(self.search_description),
+                "schema": {"type": "string"},
+            },
+        ]
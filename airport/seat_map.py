@@ -0,0 +1,259 @@
+import base64
+import math
+import struct
+
+from django.core.cache import cache
+from django_redis import get_redis_connection
+
+from airport.models import Flight, Ticket
+
+SEAT_MAP_TIMEOUT = 60 * 60 * 24
+
+# Flip a single bit only when the map is already cached, so that a write
+# never leaves a partial map behind for readers to trust.
+SET_SEAT_SCRIPT = """
+if redis.call("EXISTS", KEYS[1]) == 1 then
+    return redis.call("SETBIT", KEYS[1], ARGV[1], ARGV[2])
+end
+return -1
+"""
+
+# Store a freshly built map only if no seat of the flight was marked or
+# invalidated since the build started, the map could miss that change.
+STORE_SEAT_MAP_SCRIPT = """
+if tonumber(redis.call("GET", KEYS[2]) or "0") == tonumber(ARGV[1]) then
+    return redis.call("SET", KEYS[1], ARGV[2], "EX", ARGV[3], "NX")
+end
+return false
+"""
+
+
+class SeatMap:
+    """Packed bitset of taken seats, one bit per seat.
+
+    Seats are laid out row by row, most significant bit first, behind a
+    four byte header holding ``rows`` and ``seats_in_row``. The layout
+    matches Redis ``SETBIT`` offsets, so cached maps can be updated in
+    place.
+    """
+
+    HEADER = struct.Struct(">HH")
+    ENCODINGS = ("bitmap", "rle", "json")
+
+    def __init__(self, rows, seats_in_row, bitmap=None) -> None:
+        self.rows = rows
+        self.seats_in_row = seats_in_row
+        size = (rows * seats_in_row + 7) // 8
+        self.bitmap = bytearray(bitmap or size)[:size].ljust(size, b"\0")
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "SeatMap":
+        rows, seats_in_row = cls.HEADER.unpack_from(data)
+        return cls(rows, seats_in_row, data[cls.HEADER.size :])
+
+    def to_bytes(self) -> bytes:
+        return self.HEADER.pack(self.rows, self.seats_in_row) + bytes(
+            self.bitmap
+        )
+
+    @classmethod
+    def offset(cls, row, seat, seats_in_row) -> int:
+        """Redis bit offset of a seat, counting the header."""
+        return cls.HEADER.size * 8 + (row - 1) * seats_in_row + seat - 1
+
+    def _index(self, row, seat) -> int:
+        return (row - 1) * self.seats_in_row + seat - 1
+
+    def is_taken(self, row, seat) -> bool:
+        index = self._index(row, seat)
+        return bool(self.bitmap[index // 8] & (0x80 >> index % 8))
+
+    def take(self, row, seat) -> None:
+        index = self._index(row, seat)
+        self.bitmap[index // 8] |= 0x80 >> index % 8
+
+    @property
+    def taken_count(self) -> int:
+        return sum(bin(byte).count("1") for byte in self.bitmap)
+
+    def row_bits(self, row) -> list[int]:
+        return [
+            int(self.is_taken(row, seat))
+            for seat in range(1, self.seats_in_row + 1)
+        ]
+
+    def free_runs(self, row) -> list[tuple[int, int]]:
+        """``(first seat, length)`` of every run of free seats in a row."""
+        runs, start = [], None
+        for seat, bit in enumerate(self.row_bits(row) + [1], start=1):
+            if not bit and start is None:
+                start = seat
+            elif bit and start is not None:
+                runs.append((start, seat - start))
+                start = None
+        return runs
+
+    def _centred(self, start, length, count) -> int:
+        """First seat of the ``count`` seats of a run closest to the middle
+        of the row."""
+        ideal = math.floor((self.seats_in_row - count) / 2) + 1
+        return min(max(ideal, start), start + length - count)
+
+    def _distance(self, first, count) -> float:
+        return abs(first + (count - 1) / 2 - (self.seats_in_row + 1) / 2)
+
+    def find_adjacent(self, count) -> list[tuple[int, int]] | None:
+        """Best block of ``count`` adjacent free seats, ``None`` if none.
+
+        A block in a single row wins, the front-most one and then the one
+        closest to the middle of its row. Otherwise the group is split
+        over as few consecutive rows as possible, each row giving its
+        longest run of free seats, front-most first.
+        """
+        if count < 1:
+            return None
+        runs = {row: self.free_runs(row) for row in range(1, self.rows + 1)}
+
+        for row, row_runs in runs.items():
+            firsts = [
+                self._centred(start, length, count)
+                for start, length in row_runs
+                if length >= count
+            ]
+            if firsts:
+                first = min(
+                    firsts, key=lambda seat: self._distance(seat, count)
+                )
+                return [(row, seat) for seat in range(first, first + count)]
+
+        best = None
+        for first_row in runs:
+            seats, row = [], first_row
+            while len(seats) < count and runs.get(row):
+                start, length = max(
+                    runs[row],
+                    key=lambda run: (run[1], -self._distance(*run)),
+                )
+                size = min(length, count - len(seats))
+                first = self._centred(start, length, size)
+                seats += [(row, seat) for seat in range(first, first + size)]
+                row += 1
+            if len(seats) == count and (
+                best is None or row - first_row < best[0]
+            ):
+                best = (row - first_row, seats)
+        return best[1] if best else None
+
+    def to_rle(self) -> list[list[int]]:
+        """Per row run lengths, alternating free and taken seats.
+
+        Every row starts with a (possibly empty) run of free seats.
+        """
+        rows = []
+        for row in range(1, self.rows + 1):
+            runs, current, length = [], 0, 0
+            for bit in self.row_bits(row):
+                if bit != current:
+                    runs.append(length)
+                    current, length = bit, 0
+                length += 1
+            runs.append(length)
+            rows.append(runs)
+        return rows
+
+    def serialize(self, encoding="bitmap") -> dict:
+        if encoding == "bitmap":
+            seats = base64.b64encode(bytes(self.bitmap)).decode()
+        elif encoding == "rle":
+            seats = self.to_rle()
+        else:
+            seats = [self.row_bits(row) for row in range(1, self.rows + 1)]
+
+        return {
+            "rows": self.rows,
+            "seats_in_row": self.seats_in_row,
+            "taken": self.taken_count,
+            "encoding": encoding,
+            "seats": seats,
+        }
+
+
+def seat_map_key(flight_id) -> str:
+    return cache.make_key(f"flight:{flight_id}:seat-map")
+
+
+def seat_map_generation_key(flight_id) -> str:
+    return cache.make_key(f"flight:{flight_id}:seat-map:generation")
+
+
+def bump_seat_map_generation(client, *flight_ids) -> None:
+    pipe = client.pipeline(transaction=False)
+    for flight_id in flight_ids:
+        pipe.incr(seat_map_generation_key(flight_id))
+        pipe.expire(seat_map_generation_key(flight_id), SEAT_MAP_TIMEOUT)
+    pipe.execute()
+
+
+def build_seat_map(flight_id) -> SeatMap:
+    rows, seats_in_row = Flight.objects.values_list(
+        "airplane__rows", "airplane__seats_in_row"
+    ).get(pk=flight_id)
+    seat_map = SeatMap(rows, seats_in_row)
+    for row, seat in Ticket.objects.filter(flight_id=flight_id).values_list(
+        "row", "seat"
+    ):
+        seat_map.take(row, seat)
+    return seat_map
+
+
+def get_seat_map(flight_id) -> SeatMap:
+    """Return the cached seat map, rebuilding it from tickets on a miss.
+
+    The rebuilt map is only cached when no ``mark_seats`` or
+    ``invalidate_seat_maps`` call for the flight happened meanwhile, so a
+    ticket committed during the build is never lost. Raises
+    ``Flight.DoesNotExist`` for unknown flights.
+    """
+    client = get_redis_connection("default")
+    data = client.get(seat_map_key(flight_id))
+    if data is not None:
+        return SeatMap.from_bytes(data)
+
+    generation = client.get(seat_map_generation_key(flight_id)) or 0
+    seat_map = build_seat_map(flight_id)
+    client.register_script(STORE_SEAT_MAP_SCRIPT)(
+        keys=[seat_map_key(flight_id), seat_map_generation_key(flight_id)],
+        args=[int(generation), seat_map.to_bytes(), SEAT_MAP_TIMEOUT],
+    )
+    return seat_map
+
+
+def mark_seats(flight_id, seats, taken=True) -> None:
+    """Flip seats in the cached map of a flight, if it is cached."""
+    client = get_redis_connection("default")
+    bump_seat_map_generation(client, flight_id)
+    header = client.getrange(
+        seat_map_key(flight_id), 0, SeatMap.HEADER.size - 1
+    )
+    if len(header) < SeatMap.HEADER.size:
+        return
+
+    rows, seats_in_row = SeatMap.HEADER.unpack(header)
+    script = client.register_script(SET_SEAT_SCRIPT)
+    pipe = client.pipeline(transaction=False)
+    for row, seat in seats:
+        if not (1 <= row <= rows and 1 <= seat <= seats_in_row):
+            continue
+        script(
+            keys=[seat_map_key(flight_id)],
+            args=[SeatMap.offset(row, seat, seats_in_row), int(taken)],
+            client=pipe,
+        )
+    pipe.execute()
+
+
+def invalidate_seat_maps(*flight_ids) -> None:
+    if flight_ids:
+        client = get_redis_connection("default")
+        bump_seat_map_generation(client, *flight_ids)
+        client.delete(*(seat_map_key(flight_id) for flight_id in flight_ids))
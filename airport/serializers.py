@@ -1,7 +1,14 @@
 from django.db import transaction
+from django.utils import timezone
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
 
+from airport.booking import book_tickets, seat_errors
+from airport.fragments import FragmentCacheMixin
+from airport.holds import DEFAULT_HOLD_MINUTES, MAX_HOLD_MINUTES
+from airport.reference import reference_names
 from airport.models import (
     Crew,
     AirplaneType,
@@ -13,9 +20,25 @@ from airport.models import (
     Flight,
     Ticket,
     Order,
+    BookingRequest,
 )
 
 
+@extend_schema_field(OpenApiTypes.STR)
+class ReferenceNameField(serializers.ReadOnlyField):
+    """Name of a reference row, read from the reference cache.
+
+    ``source`` is the foreign key id, so the row itself is never joined.
+    """
+
+    def __init__(self, model, **kwargs) -> None:
+        self.model = model
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        return reference_names(self.model, ids=(value,)).get(value)
+
+
 class CrewSerializer(serializers.ModelSerializer):
     class Meta:
         model = Crew
@@ -48,7 +71,9 @@ class AirplaneSerializer(serializers.ModelSerializer):
         )
 
 
-class AirplaneDetailSerializer(serializers.ModelSerializer):
+class AirplaneDetailSerializer(
+    FragmentCacheMixin, serializers.ModelSerializer
+):
     airplane_type = AirplaneTypeSerializer(read_only=True)
 
     class Meta:
@@ -71,7 +96,7 @@ class AirplaneImageSerializer(serializers.ModelSerializer):
 
 
 class AirplaneListSerializer(AirplaneSerializer):
-    airplane_type = serializers.StringRelatedField()
+    airplane_type = ReferenceNameField(AirplaneType, source="airplane_type_id")
 
 
 class CountrySerializer(serializers.ModelSerializer):
@@ -87,7 +112,7 @@ class CitySerializer(serializers.ModelSerializer):
 
 
 class CityListSerializer(CitySerializer):
-    country = serializers.StringRelatedField()
+    country = ReferenceNameField(Country, source="country_id")
 
 
 class CityDetailSerializer(CitySerializer):
@@ -105,10 +130,10 @@ class AirportSerializer(serializers.ModelSerializer):
 
 
 class AirportListSerializer(AirportSerializer):
-    closest_big_city = serializers.StringRelatedField()
+    closest_big_city = ReferenceNameField(City, source="closest_big_city_id")
 
 
-class AirportDetailSerializer(AirportSerializer):
+class AirportDetailSerializer(FragmentCacheMixin, AirportSerializer):
     closest_big_city = CityDetailSerializer()
 
 
@@ -124,11 +149,11 @@ class RouteSerializer(serializers.ModelSerializer):
 
 
 class RouteListSerializer(RouteSerializer):
-    source = serializers.StringRelatedField()
-    destination = serializers.StringRelatedField()
+    source = ReferenceNameField(Airport, source="source_id")
+    destination = ReferenceNameField(Airport, source="destination_id")
 
 
-class RouteDetailSerializer(RouteSerializer):
+class RouteDetailSerializer(FragmentCacheMixin, RouteSerializer):
     destination = AirportDetailSerializer()
     source = AirportDetailSerializer()
 
@@ -171,7 +196,127 @@ class FlightListSerializer(FlightSerializer):
         )
 
 
+class FlightListProjection:
+    """``values()`` based renderer producing ``FlightListSerializer`` output.
+
+    Pass it a ``values()`` queryset (or page) of ``fields``. Crew names for
+    all rows come from one extra query on the crew through table, airport
+    names from the reference cache.
+    """
+
+    fields = (
+        "id",
+        "route__source_id",
+        "route__destination_id",
+        "tickets_available",
+        "airplane__name",
+        "departure_time",
+        "arrival_time",
+    )
+    datetime_format = "%Y-%m-%d %H:%M:%S"
+    # Shown for an airport missing even from freshly loaded names
+    unknown_airport = "Unknown"
+
+    def __init__(self, rows) -> None:
+        self.rows = rows
+
+    @classmethod
+    def project(cls, queryset):
+        return queryset.prefetch_related(None).values(*cls.fields)
+
+    def crew_names(self) -> dict:
+        crew_ordering = [f"crew__{field}" for field in Crew._meta.ordering]
+        names = {row["id"]: [] for row in self.rows}
+        for flight_id, first_name, last_name in (
+            Flight.crew.through.objects.filter(flight_id__in=names.keys())
+            .order_by(*crew_ordering)
+            .values_list("flight_id", "crew__first_name", "crew__last_name")
+        ):
+            names[flight_id].append(f"{first_name} {last_name}")
+        return names
+
+    def format_datetime(self, value) -> str:
+        return timezone.localtime(value).strftime(self.datetime_format)
+
+    @property
+    def data(self) -> list[dict]:
+        crew = self.crew_names()
+        airports = reference_names(
+            Airport,
+            ids={
+                row[field]
+                for row in self.rows
+                for field in ("route__source_id", "route__destination_id")
+            },
+        )
+        return [
+            {
+                "id": row["id"],
+                "route": "-".join(
+                    airports.get(airport_id, self.unknown_airport)
+                    for airport_id in (
+                        row["route__source_id"],
+                        row["route__destination_id"],
+                    )
+                ),
+                "tickets_available": row["tickets_available"],
+                "airplane": row["airplane__name"],
+                "departure_time": self.format_datetime(row["departure_time"]),
+                "arrival_time": self.format_datetime(row["arrival_time"]),
+                "crew": crew[row["id"]],
+            }
+            for row in self.rows
+        ]
+
+
+class PrefetchedFlightField(serializers.PrimaryKeyRelatedField):
+    """Flight primary key field that reuses flights loaded by its parent.
+
+    ``TicketListInputSerializer`` loads every referenced flight up front,
+    unknown or malformed keys fall back to the regular lookup and errors.
+    """
+
+    def to_internal_value(self, data):
+        list_serializer = getattr(self.parent, "parent", None)
+        flights = getattr(list_serializer, "flights", {})
+        if isinstance(data, bool):
+            return super().to_internal_value(data)
+        try:
+            return flights[int(data)]
+        except (KeyError, TypeError, ValueError):
+            return super().to_internal_value(data)
+
+
+class TicketListInputSerializer(serializers.ListSerializer):
+    """Loads the flights of all tickets with one ``IN`` query."""
+
+    def to_internal_value(self, data):
+        self.flights = self.load_flights(data)
+        try:
+            return super().to_internal_value(data)
+        finally:
+            del self.flights
+
+    def load_flights(self, data) -> dict:
+        if not isinstance(data, list):
+            return {}
+
+        flight_ids = set()
+        for item in data:
+            try:
+                flight_ids.add(int(item["flight"]))
+            except (KeyError, TypeError, ValueError):
+                continue
+        if not flight_ids:
+            return {}
+        return Flight.objects.select_related("airplane").in_bulk(flight_ids)
+
+
 class TicketSerializer(serializers.ModelSerializer):
+    flight = PrefetchedFlightField(
+        queryset=Flight.objects.select_related("airplane")
+    )
+
     def validate(self, attrs):
         data = super(TicketSerializer, self).validate(attrs)
         Ticket.validate_ticket(
@@ -190,6 +335,7 @@ class TicketSerializer(serializers.ModelSerializer):
             "seat",
             "flight",
         )
+        list_serializer_class = TicketListInputSerializer
 
 
 class TicketSeatSerializer(TicketSerializer):
@@ -219,6 +365,24 @@ class FlightDetailSerializer(FlightListSerializer):
         )
 
 
+class OrderTicketSerializer(TicketSerializer):
+    """Ticket of a new order, its seat is checked by ``seat_errors``.
+
+    ``row`` and ``seat`` may be left out when the order has
+    ``auto_seat`` set.
+    """
+
+    def validate(self, attrs):
+        return attrs
+
+    class Meta(TicketSerializer.Meta):
+        validators = []
+        extra_kwargs = {
+            "row": {"required": False},
+            "seat": {"required": False},
+        }
+
+
 class TicketListSerializer(TicketSerializer):
     flight = serializers.StringRelatedField()
 
@@ -228,27 +392,141 @@ class TicketDetailSerializer(TicketSerializer):
 
 
 class OrderSerializer(serializers.ModelSerializer):
-    tickets = TicketSerializer(many=True, read_only=False, allow_empty=False)
+    tickets = OrderTicketSerializer(
+        many=True, read_only=False, allow_empty=False
+    )
     created_at = serializers.DateTimeField(
         format="%Y-%m-%d %H:%M:%S", read_only=True
     )
+    auto_seat = serializers.BooleanField(
+        write_only=True,
+        default=False,
+        help_text=(
+            "Assign adjacent free seats to the tickets sent without row "
+            "and seat"
+        ),
+    )
 
     class Meta:
         model = Order
-        fields = ("id", "tickets", "created_at")
+        fields = ("id", "tickets", "created_at", "auto_seat")
+
+    def validate_tickets(self, tickets):
+        request = self.context.get("request")
+        seated = [
+            ticket
+            for ticket in tickets
+            if "row" in ticket and "seat" in ticket
+        ]
+        seated_errors = iter(
+            seat_errors(seated, request.user.pk if request else None)
+        )
+        errors = [
+            next(seated_errors) if "row" in ticket and "seat" in ticket else {}
+            for ticket in tickets
+        ]
+        if any(errors):
+            raise ValidationError(errors)
+        return tickets
+
+    def validate(self, attrs):
+        if not attrs["auto_seat"]:
+            required = serializers.Field.default_error_messages["required"]
+            errors = [
+                {
+                    field: [required]
+                    for field in ("row", "seat")
+                    if field not in ticket
+                }
+                for ticket in attrs["tickets"]
+            ]
+            if any(errors):
+                raise ValidationError({"tickets": errors})
+        return attrs
 
     @transaction.atomic()
     def create(self, validated_data):
+        validated_data.pop("auto_seat")
         tickets_data = validated_data.pop("tickets")
         order = Order.objects.create(**validated_data)
-        for ticket_data in tickets_data:
-            Ticket.objects.create(order=order, **ticket_data)
+        book_tickets(order, tickets_data)
         return order
 
 
+class BookingTicketSerializer(serializers.Serializer):
+    row = serializers.IntegerField()
+    seat = serializers.IntegerField()
+    flight = serializers.IntegerField()
+
+
+class BookingRequestCreateSerializer(serializers.Serializer):
+    tickets = BookingTicketSerializer(many=True, allow_empty=False)
+
+
+class BookingRequestSerializer(serializers.ModelSerializer):
+    url = serializers.HyperlinkedIdentityField(
+        view_name="airport:booking-request-detail"
+    )
+    created_at = serializers.DateTimeField(
+        format="%Y-%m-%d %H:%M:%S", read_only=True
+    )
+    processed_at = serializers.DateTimeField(
+        format="%Y-%m-%d %H:%M:%S", read_only=True
+    )
+
+    class Meta:
+        model = BookingRequest
+        fields = (
+            "id",
+            "url",
+            "status",
+            "tickets",
+            "order",
+            "errors",
+            "created_at",
+            "processed_at",
+        )
+        read_only_fields = fields
+
+
 class OrderListSerializer(OrderSerializer):
     tickets = serializers.StringRelatedField(many=True)
 
 
 class OrderDetailSerializer(OrderSerializer):
     tickets = TicketDetailSerializer(many=True)
+
+
+class SeatSerializer(serializers.Serializer):
+    row = serializers.IntegerField()
+    seat = serializers.IntegerField()
+
+
+class HeldSeatSerializer(SeatSerializer):
+    expires_at = serializers.DateTimeField(format="%Y-%m-%d %H:%M:%S")
+
+
+class BestSeatsSerializer(serializers.Serializer):
+    count = serializers.IntegerField(min_value=1)
+
+
+class SeatHoldSerializer(serializers.Serializer):
+    seats = SeatSerializer(many=True, allow_empty=False)
+    minutes = serializers.IntegerField(
+        min_value=1, max_value=MAX_HOLD_MINUTES, default=DEFAULT_HOLD_MINUTES
+    )
+
+    def validate_seats(self, seats):
+        airplane = self.context["flight"].airplane
+        errors = []
+        for seat in seats:
+            try:
+                Ticket.validate_ticket(
+                    seat["row"], seat["seat"], airplane, ValidationError
+                )
+                errors.append({})
+            except ValidationError as error:
+                errors.append(serializers.as_serializer_error(error))
+        if any(errors):
+            raise ValidationError(errors)
+        return seats
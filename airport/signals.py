@@ -0,0 +1,304 @@
+from django.db import transaction
+from django.db.models.functions import Now
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+
+from airport.cache import bump_flight_versions
+from airport.models import (
+    Airplane,
+    AirplaneType,
+    Airport,
+    City,
+    Country,
+    Crew,
+    Flight,
+    Order,
+    OrderSummary,
+    Route,
+    Ticket,
+)
+from airport.order_cache import bump_order_versions, invalidate_order_caches
+from airport.reference import invalidate_reference_data
+from airport.search import refresh_search_documents, route_search_documents
+from airport.seat_map import invalidate_seat_maps, mark_seats
+from airport.summaries import (
+    refresh_flight_order_summaries,
+    refresh_order_summaries,
+)
+
+
+@receiver(pre_save, sender=Ticket)
+def remember_ticket_flight(sender, instance, raw, **kwargs):
+    instance._previous_flight_id = instance._previous_order_id = None
+    if raw or instance.pk is None:
+        return
+    instance._previous_flight_id, instance._previous_order_id = (
+        Ticket.objects.filter(pk=instance.pk)
+        .values_list("flight_id", "order_id")
+        .first()
+    ) or (None, None)
+
+
+@receiver(post_save, sender=Ticket)
+def count_ticket_sold(sender, instance, created, raw, **kwargs):
+    if raw:
+        return
+    if created:
+        Flight.adjust_seats_sold(instance.flight_id, 1)
+        return
+
+    previous_flight_id = getattr(instance, "_previous_flight_id", None)
+    if previous_flight_id and previous_flight_id != instance.flight_id:
+        Flight.adjust_seats_sold(previous_flight_id, -1)
+        Flight.adjust_seats_sold(instance.flight_id, 1)
+
+
+@receiver(post_delete, sender=Ticket)
+def count_ticket_released(sender, instance, **kwargs):
+    Flight.adjust_seats_sold(instance.flight_id, -1)
+
+
+@receiver(post_save, sender=Ticket)
+def update_seat_map_on_save(sender, instance, created, raw, **kwargs):
+    flight_id, seat = instance.flight_id, (instance.row, instance.seat)
+    if created and not raw:
+        transaction.on_commit(lambda: mark_seats(flight_id, [seat]))
+        return
+
+    flight_ids = {flight_id, getattr(instance, "_previous_flight_id", None)}
+    flight_ids.discard(None)
+    transaction.on_commit(lambda: invalidate_seat_maps(*flight_ids))
+
+
+@receiver(post_delete, sender=Ticket)
+def update_seat_map_on_delete(sender, instance, **kwargs):
+    flight_id, seat = instance.flight_id, (instance.row, instance.seat)
+    transaction.on_commit(lambda: mark_seats(flight_id, [seat], taken=False))
+
+
+@receiver(post_save, sender=Flight)
+def invalidate_flight_seat_map(sender, instance, created, **kwargs):
+    if not created:
+        flight_id = instance.pk
+        transaction.on_commit(lambda: invalidate_seat_maps(flight_id))
+
+
+@receiver(post_save, sender=Airplane)
+def invalidate_airplane_seat_maps(sender, instance, created, **kwargs):
+    if not created:
+        flight_ids = list(instance.flights.values_list("pk", flat=True))
+        transaction.on_commit(lambda: invalidate_seat_maps(*flight_ids))
+
+
+@receiver([post_save, post_delete], sender=Ticket)
+def bump_ticket_flight_versions(sender, instance, **kwargs):
+    flight_ids = {
+        instance.flight_id,
+        getattr(instance, "_previous_flight_id", None),
+    }
+    flight_ids.discard(None)
+    bump_flight_versions(*flight_ids)
+
+
+@receiver([post_save, post_delete], sender=Flight)
+def bump_flight_version(sender, instance, **kwargs):
+    bump_flight_versions(instance.pk)
+
+
+@receiver(m2m_changed, sender=Flight.crew.through)
+def bump_crew_flight_versions(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    if not action.startswith("post_"):
+        return
+    if reverse:
+        bump_flight_versions(*(pk_set or ()))
+    else:
+        bump_flight_versions(instance.pk)
+
+
+@receiver(m2m_changed, sender=Flight.crew.through)
+def touch_crew_flights(sender, instance, action, reverse, pk_set, **kwargs):
+    if not action.startswith("post_"):
+        return
+    flight_ids = (pk_set or ()) if reverse else [instance.pk]
+    Flight.objects.filter(pk__in=flight_ids).update(updated_at=Now())
+
+
+@receiver(post_save, sender=Crew)
+def bump_crew_member_flight_versions(sender, instance, created, **kwargs):
+    if not created:
+        bump_flight_versions(*instance.flight_set.values_list("pk", flat=True))
+
+
+@receiver(pre_delete, sender=Crew)
+def touch_crew_member_flights(sender, instance, **kwargs):
+    # Deleting the crew member removes its through rows without sending
+    # m2m_changed
+    flight_ids = list(instance.flight_set.values_list("pk", flat=True))
+    Flight.objects.filter(pk__in=flight_ids).update(updated_at=Now())
+    bump_flight_versions(*flight_ids)
+
+
+@receiver(post_save, sender=Route)
+@receiver(post_save, sender=Airplane)
+def bump_related_flight_versions(sender, instance, **kwargs):
+    bump_flight_versions(*instance.flights.values_list("pk", flat=True))
+
+
+@receiver(post_delete, sender=Route)
+@receiver(post_delete, sender=Airplane)
+def bump_flight_list_version(sender, instance, **kwargs):
+    bump_flight_versions()
+
+
+@receiver(pre_save, sender=Flight)
+def fill_flight_search_document(sender, instance, raw, **kwargs):
+    if raw:
+        return
+    documents = route_search_documents(
+        Route.objects.filter(pk=instance.route_id)
+    )
+    instance.search_document = documents.get(instance.route_id, "")
+
+
+@receiver(post_save, sender=Flight)
+def save_flight_search_document(sender, instance, created, raw, **kwargs):
+    # Saves of existing flights leave the document out, see Flight.save
+    if not created and not raw:
+        Flight.objects.filter(pk=instance.pk).exclude(
+            search_document=instance.search_document
+        ).update(search_document=instance.search_document)
+
+
+@receiver(post_save, sender=Route)
+def refresh_route_search_documents(sender, instance, created, **kwargs):
+    if not created:
+        refresh_search_documents(Route.objects.filter(pk=instance.pk))
+
+
+@receiver(post_save, sender=Airport)
+def refresh_airport_search_documents(sender, instance, created, **kwargs):
+    if not created:
+        refresh_search_documents(Route.objects.filter(source=instance))
+
+
+@receiver(post_save, sender=City)
+def refresh_city_search_documents(sender, instance, created, **kwargs):
+    if not created:
+        refresh_search_documents(
+            Route.objects.filter(source__closest_big_city=instance)
+        )
+
+
+@receiver(post_delete, sender=City)
+def refresh_cityless_search_documents(sender, instance, **kwargs):
+    refresh_search_documents(
+        Route.objects.filter(source__closest_big_city__isnull=True)
+    )
+
+
+@receiver(post_save, sender=Country)
+def refresh_country_search_documents(sender, instance, created, **kwargs):
+    if not created:
+        refresh_search_documents(
+            Route.objects.filter(source__closest_big_city__country=instance)
+        )
+
+
+@receiver(post_save, sender=Order)
+def create_order_summary(sender, instance, created, raw, **kwargs):
+    if created and not raw:
+        OrderSummary.objects.create(order=instance)
+
+
+@receiver(post_save, sender=Ticket)
+def refresh_ticket_order_summary(sender, instance, raw, **kwargs):
+    if not raw:
+        refresh_order_summaries(
+            instance.order_id, getattr(instance, "_previous_order_id", None)
+        )
+
+
+@receiver(post_delete, sender=Ticket)
+def refresh_released_order_summary(sender, instance, **kwargs):
+    refresh_order_summaries(instance.order_id)
+
+
+@receiver(post_save, sender=Flight)
+def refresh_flight_order_summary(sender, instance, created, **kwargs):
+    if not created:
+        refresh_flight_order_summaries([instance])
+
+
+@receiver(post_save, sender=Route)
+def refresh_route_order_summaries(sender, instance, created, **kwargs):
+    if not created:
+        refresh_flight_order_summaries(instance.flights.all())
+
+
+@receiver([post_save, post_delete], sender=Country)
+@receiver([post_save, post_delete], sender=City)
+@receiver([post_save, post_delete], sender=AirplaneType)
+@receiver([post_save, post_delete], sender=Airport)
+def invalidate_reference_cache(sender, **kwargs):
+    invalidate_reference_data()
+
+
+@receiver([post_save, post_delete], sender=Order)
+def bump_owner_order_version(sender, instance, **kwargs):
+    bump_order_versions(instance.user_id)
+
+
+@receiver([post_save, post_delete], sender=Ticket)
+def invalidate_ticket_order_caches(sender, instance, **kwargs):
+    invalidate_order_caches(
+        order_ids=[
+            instance.order_id,
+            getattr(instance, "_previous_order_id", None),
+        ],
+        flight_ids=[
+            instance.flight_id,
+            getattr(instance, "_previous_flight_id", None),
+        ],
+    )
+
+
+@receiver(post_save, sender=Flight)
+def invalidate_flight_order_caches(sender, instance, created, **kwargs):
+    if not created:
+        invalidate_order_caches(flight_ids=[instance.pk])
+
+
+@receiver(post_save, sender=Route)
+@receiver(post_save, sender=Airplane)
+def invalidate_related_order_caches(sender, instance, created, **kwargs):
+    if not created:
+        invalidate_order_caches(
+            flight_ids=instance.flights.values_list("pk", flat=True)
+        )
+
+
+@receiver(m2m_changed, sender=Flight.crew.through)
+def invalidate_crew_order_caches(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    if action.startswith("post_"):
+        invalidate_order_caches(
+            flight_ids=(pk_set or ()) if reverse else [instance.pk]
+        )
+
+
+@receiver(post_save, sender=Crew)
+@receiver(pre_delete, sender=Crew)
+def invalidate_crew_member_order_caches(sender, instance, **kwargs):
+    if not kwargs.get("created"):
+        invalidate_order_caches(
+            flight_ids=instance.flight_set.values_list("pk", flat=True)
+        )
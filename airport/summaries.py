@@ -0,0 +1,71 @@
+from airport.models import OrderSummary, Ticket
+
+SUMMARY_FIELDS = [
+    "first_departure_time",
+    "last_arrival_time",
+    "origin",
+    "tickets_count",
+    "flight_ids",
+]
+
+
+def build_order_summaries(order_ids) -> list[OrderSummary]:
+    """Summaries of ``order_ids`` computed from their tickets.
+
+    The origin is the source airport of the earliest departing flight.
+    """
+    summaries = {
+        order_id: OrderSummary(order_id=order_id) for order_id in order_ids
+    }
+    tickets = (
+        Ticket.objects.filter(order_id__in=summaries)
+        .order_by("flight__departure_time", "flight_id")
+        .values_list(
+            "order_id",
+            "flight_id",
+            "flight__departure_time",
+            "flight__arrival_time",
+            "flight__route__source_id",
+        )
+    )
+    for order_id, flight_id, departure, arrival, source_id in tickets:
+        summary = summaries[order_id]
+        if not summary.tickets_count:
+            summary.first_departure_time = departure
+            summary.origin_id = source_id
+        summary.tickets_count += 1
+        if flight_id not in summary.flight_ids:
+            summary.flight_ids.append(flight_id)
+        if (
+            summary.last_arrival_time is None
+            or arrival > summary.last_arrival_time
+        ):
+            summary.last_arrival_time = arrival
+
+    for summary in summaries.values():
+        summary.flight_ids.sort()
+    return list(summaries.values())
+
+
+def refresh_order_summaries(*order_ids) -> None:
+    """Recompute the existing summaries of ``order_ids``.
+
+    Only existing rows are updated, so a summary deleted along with its
+    order is never recreated.
+    """
+    existing = OrderSummary.objects.filter(
+        order_id__in=set(order_ids)
+    ).values_list("order_id", flat=True)
+    OrderSummary.objects.bulk_update(
+        build_order_summaries(list(existing)), SUMMARY_FIELDS
+    )
+
+
+def refresh_flight_order_summaries(flights) -> None:
+    """Recompute the summaries of orders with tickets on ``flights``."""
+    refresh_order_summaries(
+        *Ticket.objects.filter(flight__in=flights)
+        .order_by()
+        .values_list("order_id", flat=True)
+        .distinct()
+    )
@@ -1,5 +1,6 @@
 from datetime import datetime
 
+from django.core.cache import cache
 from django.urls import reverse
 from rest_framework.test import APIClient, APITestCase
 from rest_framework import status
@@ -91,6 +92,42 @@ def sample_order(**params):
     return order
 
 
+def sample_user(email="user@test.com", **params):
+    return get_user_model().objects.create_user(email, "password123", **params)
+
+
+def sample_loop_route(**params):
+    """Route from and to the same airport."""
+    airport = sample_airport(city=sample_city(country=sample_country()))
+    return sample_route(source=airport, destination=airport, **params)
+
+
+class AuthenticatedApiTestCase(APITestCase):
+    """Starts from an empty cache with ``self.user`` authenticated."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = sample_user()
+        self.client.force_authenticate(self.user)
+
+
+class FlightApiTestCase(AuthenticatedApiTestCase):
+    """Adds ``self.flight`` on a loop route.
+
+    ``airplane_params`` override the size of its airplane.
+    """
+
+    airplane_params = {}
+
+    def setUp(self):
+        super().setUp()
+        self.route = sample_loop_route()
+        self.airplane = sample_airplane(
+            airplane_type=sample_airplane_type(), **self.airplane_params
+        )
+        self.flight = sample_flight(route=self.route, airplane=self.airplane)
+
+
 class CrewApiTests(APITestCase):
     def setUp(self):
         self.client = APIClient()
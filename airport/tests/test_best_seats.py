@@ -0,0 +1,126 @@
+from django.test import SimpleTestCase
+from django.urls import reverse
+from rest_framework import status
+
+from airport.booking import NO_ADJACENT_SEATS_MESSAGE
+from airport.holds import hold_seats
+from airport.models import Order
+from airport.seat_map import SeatMap
+from airport.tests.test_airport_api import (
+    FlightApiTestCase,
+    sample_order,
+    sample_ticket,
+    sample_user,
+)
+
+ORDER_URL = reverse("airport:order-list")
+
+
+def best_seats_url(flight_id):
+    return reverse("airport:flight-best-seats", args=[flight_id])
+
+
+def seat_map(rows, seats_in_row, *taken):
+    result = SeatMap(rows, seats_in_row)
+    for seat in taken:
+        result.take(*seat)
+    return result
+
+
+class FindAdjacentTests(SimpleTestCase):
+    def test_front_row_block_closest_to_the_middle(self):
+        seats = seat_map(3, 6, (1, 2), (1, 3), (1, 4)).find_adjacent(2)
+
+        self.assertEqual(seats, [(1, 5), (1, 6)])
+        self.assertEqual(seat_map(3, 6).find_adjacent(2), [(1, 3), (1, 4)])
+
+    def test_single_row_block_beats_an_earlier_split(self):
+        seats = seat_map(3, 4, (1, 2), (2, 3)).find_adjacent(3)
+
+        self.assertEqual(seats, [(3, 1), (3, 2), (3, 3)])
+
+    def test_group_is_split_over_consecutive_rows(self):
+        seats = seat_map(3, 4, (2, 1)).find_adjacent(6)
+
+        self.assertEqual(
+            seats,
+            [(1, 1), (1, 2), (1, 3), (1, 4), (2, 2), (2, 3)],
+        )
+
+    def test_no_block_left(self):
+        full_middle = [(2, seat) for seat in range(1, 5)]
+
+        self.assertIsNone(seat_map(3, 4, *full_middle).find_adjacent(5))
+        self.assertIsNone(seat_map(1, 4).find_adjacent(5))
+
+
+class BestSeatsApiTests(FlightApiTestCase):
+    airplane_params = {"rows": 3, "seats_in_row": 4}
+
+    def setUp(self):
+        super().setUp()
+        self.other = sample_user("other@test.com")
+
+    def test_best_seats_skip_sold_and_held_seats(self):
+        order = sample_order(user=self.other)
+        sample_ticket(flight=self.flight, order=order, row=1, seat=2)
+        hold_seats(self.flight.pk, [(2, 2)], self.other.pk, 60)
+
+        res = self.client.get(best_seats_url(self.flight.pk), {"count": 3})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            res.data["seats"],
+            [{"row": 3, "seat": seat} for seat in (1, 2, 3)],
+        )
+
+    def test_best_seats_errors(self):
+        res = self.client.get(best_seats_url(self.flight.pk), {"count": 0})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+        res = self.client.get(best_seats_url(self.flight.pk), {"count": 13})
+        self.assertEqual(res.status_code, status.HTTP_409_CONFLICT)
+
+        res = self.client.get(best_seats_url(9999), {"count": 1})
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_order_with_auto_seat_gets_adjacent_seats(self):
+        order = sample_order(user=self.other)
+        sample_ticket(flight=self.flight, order=order, row=1, seat=2)
+        payload = {
+            "auto_seat": True,
+            "tickets": [{"flight": self.flight.pk}] * 2
+            + [{"flight": self.flight.pk, "row": 3, "seat": 4}],
+        }
+
+        with self.captureOnCommitCallbacks(execute=True):
+            res = self.client.post(ORDER_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        seats = [
+            (ticket["row"], ticket["seat"]) for ticket in res.data["tickets"]
+        ]
+        self.assertEqual(seats, [(1, 3), (1, 4), (3, 4)])
+
+    def test_seats_are_required_without_auto_seat(self):
+        res = self.client.post(
+            ORDER_URL, {"tickets": [{"flight": self.flight.pk}]}, format="json"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(set(res.data["tickets"][0]), {"row", "seat"})
+
+    def test_auto_seat_fails_when_no_block_is_left(self):
+        payload = {
+            "auto_seat": True,
+            "tickets": [{"flight": self.flight.pk}] * 13,
+        }
+
+        res = self.client.post(ORDER_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            res.data["tickets"][0]["non_field_errors"],
+            [NO_ADJACENT_SEATS_MESSAGE],
+        )
+        self.assertFalse(Order.objects.exists())
@@ -0,0 +1,195 @@
+from io import StringIO
+from unittest import skipUnless
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+
+from airport.booking import SEAT_TAKEN_MESSAGE, book_tickets
+from airport.models import Flight, Ticket
+from airport.seat_map import get_seat_map
+from airport.tests.test_airport_api import (
+    FlightApiTestCase,
+    sample_airplane,
+    sample_airplane_type,
+    sample_flight,
+    sample_loop_route,
+    sample_order,
+    sample_ticket,
+)
+
+ORDER_URL = reverse("airport:order-list")
+
+
+class BulkBookingTests(FlightApiTestCase):
+    airplane_params = {"rows": 3, "seats_in_row": 4}
+
+    def ticket(self, row, seat, flight=None):
+        return {"row": row, "seat": seat, "flight": (flight or self.flight).pk}
+
+    def test_group_booking_inserts_tickets_in_one_statement(self):
+        get_seat_map(self.flight.pk)
+        payload = {
+            "tickets": [self.ticket(row, 1) for row in (1, 2, 3)]
+            + [self.ticket(row, 2) for row in (1, 2, 3)]
+        }
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with CaptureQueriesContext(connection) as queries:
+                res = self.client.post(ORDER_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        inserts = [
+            query["sql"]
+            for query in queries.captured_queries
+            if query["sql"].startswith('INSERT INTO "airport_ticket"')
+        ]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(len(res.data["tickets"]), 6)
+
+        self.flight.refresh_from_db()
+        self.assertEqual(self.flight.seats_sold, 6)
+        self.assertEqual(get_seat_map(self.flight.pk).taken_count, 6)
+
+    def test_errors_are_reported_per_seat(self):
+        sample_ticket(
+            flight=self.flight, order=sample_order(user=self.user), row=2
+        )
+        payload = {
+            "tickets": [
+                self.ticket(1, 1),
+                self.ticket(2, 1),
+                self.ticket(4, 1),
+                self.ticket(1, 1),
+            ]
+        }
+
+        res = self.client.post(ORDER_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        errors = res.json()["tickets"]
+        self.assertEqual(errors[0], {})
+        self.assertEqual(errors[1], {"non_field_errors": [SEAT_TAKEN_MESSAGE]})
+        self.assertEqual(
+            errors[2],
+            {
+                "row": [
+                    "row number must be in available range: "
+                    "(1, rows): (1, 3)"
+                ]
+            },
+        )
+        self.assertEqual(errors[3], {"non_field_errors": [SEAT_TAKEN_MESSAGE]})
+        self.assertEqual(Ticket.objects.count(), 1)
+
+    def test_booking_rechecks_seats_sold_after_validation(self):
+        sample_ticket(flight=self.flight, order=sample_order(user=self.user))
+
+        with self.assertRaises(ValidationError) as raised:
+            book_tickets(
+                sample_order(user=self.user),
+                [{"row": 1, "seat": 1, "flight": self.flight}],
+            )
+
+        self.assertEqual(
+            raised.exception.detail["tickets"][0]["non_field_errors"],
+            [SEAT_TAKEN_MESSAGE],
+        )
+        self.assertEqual(Flight.objects.get().seats_sold, 1)
+
+
+class FlightResolutionTests(FlightApiTestCase):
+    def setUp(self):
+        super().setUp()
+        self.flights = [
+            self.flight,
+            *(
+                sample_flight(route=self.route, airplane=self.airplane)
+                for _ in range(2)
+            ),
+        ]
+
+    def order_queries(self, seat, rows):
+        payload = {
+            "tickets": [
+                {"row": row, "seat": seat, "flight": flight.pk}
+                for flight in self.flights
+                for row in range(1, rows + 1)
+            ]
+        }
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.post(ORDER_URL, payload, format="json")
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        return len(queries)
+
+    def test_query_count_does_not_grow_with_tickets(self):
+        self.assertEqual(
+            self.order_queries(seat=1, rows=1),
+            self.order_queries(seat=2, rows=8),
+        )
+
+    def test_unknown_flight_keeps_field_error(self):
+        payload = {
+            "tickets": [
+                {"row": 1, "seat": 1, "flight": self.flights[0].pk},
+                {"row": 1, "seat": 1, "flight": 9999},
+            ]
+        }
+
+        res = self.client.post(ORDER_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res.json()["tickets"][0], {})
+        self.assertEqual(
+            res.json()["tickets"][1],
+            {"flight": ['Invalid pk "9999" - object does not exist.']},
+        )
+
+
+class StressBookingTests(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        self.flight = sample_flight(
+            route=sample_loop_route(),
+            airplane=sample_airplane(
+                airplane_type=sample_airplane_type(), rows=2, seats_in_row=3
+            ),
+        )
+
+    def stress(self, threads):
+        out = StringIO()
+        call_command(
+            "stress_booking",
+            self.flight.pk,
+            f"--threads={threads}",
+            "--orders=20",
+            "--seats=2",
+            "--seed=1",
+            "--keep",
+            stdout=out,
+        )
+        return out.getvalue()
+
+    def test_conflicting_orders_are_rejected_cleanly(self):
+        output = self.stress(threads=1)
+
+        self.assertIn("3 booked, 17 conflicts", output)
+        self.assertEqual(Ticket.objects.count(), 6)
+
+    @skipUnless(
+        connection.vendor == "postgresql",
+        "Concurrent writers need row locks, SQLite locks the whole table",
+    )
+    def test_concurrent_orders_never_share_a_seat(self):
+        output = self.stress(threads=4)
+
+        self.assertIn("0 errors", output)
+        self.assertIn("0 seats sold twice", output)
+        self.assertTrue(Ticket.objects.exists())
+        self.flight.refresh_from_db()
+        self.assertEqual(self.flight.seats_sold, Ticket.objects.count())
@@ -0,0 +1,158 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+
+from airport.booking import SEAT_TAKEN_MESSAGE, book_orders
+from airport.booking_queue import BOOKING_FAILED_MESSAGE, MAX_BOOKING_ATTEMPTS
+from airport.models import BookingRequest, Order
+from airport.tests.test_airport_api import (
+    FlightApiTestCase,
+    sample_flight,
+    sample_user,
+)
+
+ORDER_URL = reverse("airport:order-list")
+
+
+@override_settings(BOOKING_QUEUE="db")
+class BookingQueueTests(FlightApiTestCase):
+    backend = "db"
+
+    def order(self, *seats, flight_id=None):
+        payload = {
+            "tickets": [
+                {
+                    "row": row,
+                    "seat": seat,
+                    "flight": flight_id or self.flight.pk,
+                }
+                for row, seat in seats
+            ]
+        }
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(ORDER_URL, payload, format="json")
+
+    def process(self):
+        out = StringIO()
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command(
+                "process_booking_queue",
+                f"--backend={self.backend}",
+                "--once",
+                stdout=out,
+            )
+        return out.getvalue()
+
+    def test_order_is_queued_and_booked_by_the_worker(self):
+        res = self.order((1, 1), (1, 2))
+
+        self.assertEqual(res.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(res.data["status"], BookingRequest.PENDING)
+        self.assertEqual(res["Location"], res.data["url"])
+        self.assertFalse(Order.objects.exists())
+
+        self.assertIn("1 booked, 0 rejected", self.process())
+
+        res = self.client.get(res["Location"])
+        self.assertEqual(res.data["status"], BookingRequest.BOOKED)
+        order = Order.objects.get()
+        self.assertEqual(res.data["order"], order.pk)
+        self.assertEqual(order.tickets.count(), 2)
+        self.flight.refresh_from_db()
+        self.assertEqual(self.flight.seats_sold, 2)
+
+    def test_requests_are_served_first_come_first_served(self):
+        first = self.order((1, 1))
+        second = self.order((2, 2), (1, 1))
+        missing = self.order((1, 2), flight_id=9999)
+        self.assertEqual(missing.status_code, status.HTTP_202_ACCEPTED)
+
+        self.assertIn("1 booked, 2 rejected", self.process())
+
+        self.assertEqual(
+            self.client.get(first["Location"]).data["status"],
+            BookingRequest.BOOKED,
+        )
+        second = self.client.get(second["Location"]).data
+        self.assertEqual(second["status"], BookingRequest.REJECTED)
+        self.assertEqual(
+            second["errors"],
+            [{}, {"non_field_errors": [SEAT_TAKEN_MESSAGE]}],
+        )
+        self.assertIn(
+            "flight", self.client.get(missing["Location"]).data["errors"][0]
+        )
+        self.assertEqual(Order.objects.count(), 1)
+
+    def test_failing_request_is_retried_alone_then_rejected(self):
+        def failing_book_orders(bookings):
+            if any(
+                ticket["row"] == 13
+                for _, tickets in bookings
+                for ticket in tickets
+            ):
+                raise RuntimeError("Booking failed")
+            return book_orders(bookings)
+
+        failing = self.order((13, 1))
+        booked = self.order((1, 1))
+        with mock.patch(
+            "airport.booking_queue.book_orders",
+            side_effect=failing_book_orders,
+        ), self.assertLogs("airport.booking_queue", "ERROR"):
+            for _ in range(MAX_BOOKING_ATTEMPTS):
+                self.process()
+
+        self.assertEqual(
+            self.client.get(booked["Location"]).data["status"],
+            BookingRequest.BOOKED,
+        )
+        failing = BookingRequest.objects.get(pk=failing.data["id"])
+        self.assertEqual(failing.status, BookingRequest.REJECTED)
+        self.assertEqual(failing.attempts, MAX_BOOKING_ATTEMPTS)
+        self.assertEqual(
+            failing.errors, {"non_field_errors": [BOOKING_FAILED_MESSAGE]}
+        )
+
+    def test_requests_are_booked_per_flight(self):
+        other = sample_flight(
+            route=self.flight.route, airplane=self.flight.airplane
+        )
+        self.order((1, 1))
+        self.order((1, 1), flight_id=other.pk)
+        self.order((2, 2))
+
+        with mock.patch(
+            "airport.booking_queue.book_orders", side_effect=book_orders
+        ) as booking:
+            self.assertIn("3 booked, 0 rejected", self.process())
+
+        self.assertEqual(
+            [len(call.args[0]) for call in booking.call_args_list], [2, 1]
+        )
+
+    def test_invalid_shape_is_rejected_immediately(self):
+        res = self.client.post(
+            ORDER_URL, {"tickets": [{"row": "a"}]}, format="json"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(BookingRequest.objects.exists())
+
+    def test_booking_requests_are_private(self):
+        res = self.order((1, 1))
+        other = sample_user("other@test.com")
+
+        self.client.force_authenticate(other)
+
+        res = self.client.get(res["Location"])
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+
+@override_settings(BOOKING_QUEUE="redis")
+class RedisBookingQueueTests(BookingQueueTests):
+    backend = "redis"
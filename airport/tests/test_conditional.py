@@ -0,0 +1,164 @@
+import time
+from unittest import mock
+
+from django.urls import reverse
+from django.utils.http import http_date
+from rest_framework import status
+
+from airport.tests.test_airport_api import (
+    AuthenticatedApiTestCase,
+    sample_airplane,
+    sample_airplane_type,
+    sample_airport,
+    sample_city,
+    sample_country,
+    sample_crew,
+    sample_flight,
+    sample_order,
+    sample_route,
+    sample_ticket,
+    sample_user,
+)
+
+FLIGHT_LIST_URL = reverse("airport:flight-list")
+ORDER_LIST_URL = reverse("airport:order-list")
+
+
+def flight_detail_url(flight_id):
+    return reverse("airport:flight-detail", args=[flight_id])
+
+
+class ConditionalGetTests(AuthenticatedApiTestCase):
+    def setUp(self):
+        super().setUp()
+        country = sample_country()
+        self.source = sample_airport(
+            name="Boryspil", city=sample_city(name="Kyiv", country=country)
+        )
+        self.flight = sample_flight(
+            route=sample_route(
+                source=self.source,
+                destination=sample_airport(
+                    name="Lviv", city=sample_city(name="Lviv", country=country)
+                ),
+            ),
+            airplane=sample_airplane(airplane_type=sample_airplane_type()),
+        )
+
+    def assertNotModified(self, url, etag):
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(res["ETag"], etag)
+        self.assertFalse(res.content)
+
+    def test_unchanged_flight_list_is_not_modified(self):
+        res = self.client.get(FLIGHT_LIST_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIn("Last-Modified", res)
+        self.assertNotModified(FLIGHT_LIST_URL, res["ETag"])
+
+        res = self.client.get(
+            FLIGHT_LIST_URL, HTTP_IF_MODIFIED_SINCE=res["Last-Modified"]
+        )
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_flight_detail_is_not_modified(self):
+        url = flight_detail_url(self.flight.pk)
+        etag = self.client.get(url)["ETag"]
+
+        self.assertNotModified(url, etag)
+        self.assertNotEqual(self.client.get(FLIGHT_LIST_URL)["ETag"], etag)
+
+    def test_related_changes_change_the_etag(self):
+        etag = self.client.get(FLIGHT_LIST_URL)["ETag"]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.flight.crew.add(sample_crew())
+        crew_etag = self.client.get(FLIGHT_LIST_URL)["ETag"]
+        self.assertNotEqual(crew_etag, etag)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.source.name = "Kyiv Boryspil"
+            self.source.save()
+        res = self.client.get(FLIGHT_LIST_URL, HTTP_IF_NONE_MATCH=crew_etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["results"][0]["route"], "Kyiv Boryspil-Lviv")
+
+    def test_sold_ticket_changes_the_flight_etag(self):
+        url = flight_detail_url(self.flight.pk)
+        etag = self.client.get(url)["ETag"]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            sample_ticket(
+                flight=self.flight,
+                order=sample_order(user=self.user),
+                row=3,
+                seat=4,
+            )
+
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["taken_places"], [{"row": 3, "seat": 4}])
+
+    def test_moved_ticket_changes_the_flight_etag(self):
+        url = flight_detail_url(self.flight.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            ticket = sample_ticket(
+                flight=self.flight, order=sample_order(user=self.user)
+            )
+        etag = self.client.get(url)["ETag"]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ticket.row, ticket.seat = 5, 6
+            ticket.save()
+
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["taken_places"], [{"row": 5, "seat": 6}])
+
+    def test_deleted_flight_moves_last_modified(self):
+        flight = sample_flight(
+            route=self.flight.route, airplane=self.flight.airplane
+        )
+        last_modified = self.client.get(FLIGHT_LIST_URL)["Last-Modified"]
+
+        with mock.patch("time.time", return_value=time.time() + 60):
+            with self.captureOnCommitCallbacks(execute=True):
+                flight.delete()
+
+        res = self.client.get(
+            FLIGHT_LIST_URL, HTTP_IF_MODIFIED_SINCE=last_modified
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data["results"]), 1)
+        self.assertNotEqual(res["Last-Modified"], last_modified)
+
+    def test_cached_flight_pages_are_validated_without_queries(self):
+        for url in (FLIGHT_LIST_URL, flight_detail_url(self.flight.pk)):
+            etag = self.client.get(url)["ETag"]
+
+            with self.assertNumQueries(0):
+                self.assertEqual(
+                    self.client.get(url).status_code, status.HTTP_200_OK
+                )
+                self.assertNotModified(url, etag)
+
+    def test_stale_if_modified_since_returns_the_body(self):
+        res = self.client.get(
+            FLIGHT_LIST_URL, HTTP_IF_MODIFIED_SINCE=http_date(0)
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_order_etags_are_per_user(self):
+        other = sample_user("other@test.com")
+        sample_ticket(flight=self.flight, order=sample_order(user=self.user))
+        etag = self.client.get(ORDER_LIST_URL)["ETag"]
+        self.assertNotModified(ORDER_LIST_URL, etag)
+
+        self.client.force_authenticate(other)
+        res = self.client.get(ORDER_LIST_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["results"], [])
@@ -0,0 +1,115 @@
+import csv
+import io
+import json
+
+from django.urls import reverse
+from rest_framework import status
+
+from airport.tests.test_airport_api import (
+    AuthenticatedApiTestCase,
+    sample_airplane,
+    sample_airplane_type,
+    sample_airport,
+    sample_city,
+    sample_country,
+    sample_flight,
+    sample_order,
+    sample_route,
+    sample_ticket,
+    sample_user,
+)
+
+EXPORT_URL = reverse("airport:order-export")
+
+
+def manifest_url(flight_id):
+    return reverse("airport:flight-manifest", args=[flight_id])
+
+
+def content(response):
+    return b"".join(response.streaming_content).decode()
+
+
+class ExportTests(AuthenticatedApiTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user.first_name = "Ann"
+        self.user.save()
+        self.other = sample_user("other@test.com")
+        self.flight = sample_flight(
+            route=sample_route(
+                source=sample_airport(
+                    name="Boryspil",
+                    city=sample_city(country=sample_country()),
+                ),
+                destination=sample_airport(
+                    name="Chopin",
+                    city=sample_city(country=sample_country(name="Poland")),
+                ),
+            ),
+            airplane=sample_airplane(airplane_type=sample_airplane_type()),
+        )
+        self.order = sample_order(user=self.user)
+        sample_ticket(flight=self.flight, order=self.order, row=2, seat=1)
+        sample_ticket(flight=self.flight, order=self.order, row=1, seat=3)
+        sample_ticket(
+            flight=self.flight, order=sample_order(user=self.other), row=5
+        )
+
+    def test_order_history_csv(self):
+        res = self.client.get(EXPORT_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(res.streaming)
+        self.assertEqual(res["Content-Type"], "text/csv")
+        self.assertIn('filename="orders.csv"', res["Content-Disposition"])
+        rows = list(csv.DictReader(io.StringIO(content(res))))
+        self.assertEqual(
+            [(row["row"], row["seat"]) for row in rows],
+            [("1", "3"), ("2", "1")],
+        )
+        self.assertEqual(rows[0]["order"], str(self.order.pk))
+        self.assertEqual(rows[0]["source"], "Boryspil")
+        self.assertEqual(rows[0]["destination"], "Chopin")
+
+    def test_order_history_ndjson_takes_order_filters(self):
+        res = self.client.get(
+            EXPORT_URL, {"file_format": "ndjson", "search": "Boryspil"}
+        )
+
+        self.assertEqual(res["Content-Type"], "application/x-ndjson")
+        lines = [json.loads(line) for line in content(res).splitlines()]
+        self.assertEqual(len(lines), 2)
+        self.assertEqual(lines[0]["flight"], self.flight.pk)
+
+        res = self.client.get(EXPORT_URL, {"search": "Nowhere"})
+        self.assertEqual(content(res).splitlines()[1:], [])
+
+    def test_unknown_file_format(self):
+        res = self.client.get(EXPORT_URL, {"file_format": "xml"})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_manifest_is_admin_only(self):
+        res = self.client.get(manifest_url(self.flight.pk))
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.user.is_staff = True
+        self.user.save()
+        res = self.client.get(
+            manifest_url(self.flight.pk), {"file_format": "ndjson"}
+        )
+
+        lines = [json.loads(line) for line in content(res).splitlines()]
+        self.assertEqual(
+            [(line["row"], line["email"]) for line in lines],
+            [
+                (1, "user@test.com"),
+                (2, "user@test.com"),
+                (5, "other@test.com"),
+            ],
+        )
+        self.assertEqual(lines[0]["first_name"], "Ann")
+
+        res = self.client.get(manifest_url(9999))
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,72 @@
+from django.urls import reverse
+from rest_framework import status
+
+from airport.tests.test_airport_api import (
+    FlightApiTestCase,
+    sample_crew,
+    sample_order,
+    sample_ticket,
+)
+
+FLIGHT_LIST_URL = reverse("airport:flight-list")
+
+
+def flight_detail_url(flight_id):
+    return reverse("airport:flight-detail", args=[flight_id])
+
+
+class FlightCacheInvalidationTests(FlightApiTestCase):
+    def test_ticket_write_invalidates_list_and_detail(self):
+        res = self.client.get(FLIGHT_LIST_URL)
+        self.assertEqual(res.data["results"][0]["tickets_available"], 120)
+        res = self.client.get(flight_detail_url(self.flight.id))
+        self.assertEqual(res.data["taken_places"], [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            sample_ticket(
+                flight=self.flight, order=sample_order(user=self.user)
+            )
+
+        res = self.client.get(FLIGHT_LIST_URL)
+        self.assertEqual(res.data["results"][0]["tickets_available"], 119)
+        res = self.client.get(flight_detail_url(self.flight.id))
+        self.assertEqual(res.data["taken_places"], [{"row": 1, "seat": 1}])
+
+    def test_cached_response_is_reused_until_bumped(self):
+        self.client.get(FLIGHT_LIST_URL)
+        self.airplane.name = "Renamed"
+        self.airplane.save(update_fields=["name"])
+
+        res = self.client.get(FLIGHT_LIST_URL)
+        self.assertEqual(res.data["results"][0]["airplane"], "Airplane 1")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.airplane.save(update_fields=["name"])
+
+        res = self.client.get(FLIGHT_LIST_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["results"][0]["airplane"], "Renamed")
+
+    def test_crew_rename_and_delete_reach_cached_flights(self):
+        crew = sample_crew(first_name="Ann", last_name="Lee")
+        self.flight.crew.add(crew)
+        url = flight_detail_url(self.flight.id)
+        self.client.get(FLIGHT_LIST_URL)
+        self.client.get(url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            crew.first_name = "Jane"
+            crew.save()
+        res = self.client.get(FLIGHT_LIST_URL)
+        self.assertIn("Jane Lee", res.data["results"][0]["crew"])
+        etag = self.client.get(url)["ETag"]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            crew.delete()
+        res = self.client.get(FLIGHT_LIST_URL)
+        self.assertNotIn("Jane Lee", res.data["results"][0]["crew"])
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotIn(
+            "Jane", [member["first_name"] for member in res.data["crew"]]
+        )
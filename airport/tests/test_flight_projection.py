@@ -0,0 +1,74 @@
+from datetime import datetime, timezone
+
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework.renderers import JSONRenderer
+
+from airport.models import Flight
+from airport.serializers import FlightListSerializer
+from airport.tests.test_airport_api import (
+    AuthenticatedApiTestCase,
+    sample_airplane,
+    sample_airplane_type,
+    sample_airport,
+    sample_city,
+    sample_country,
+    sample_crew,
+    sample_flight,
+    sample_order,
+    sample_route,
+    sample_ticket,
+)
+from airport.views import FlightViewSet
+
+FLIGHT_LIST_URL = reverse("airport:flight-list")
+
+
+class FlightListProjectionTests(AuthenticatedApiTestCase):
+    def setUp(self):
+        super().setUp()
+        city = sample_city(country=sample_country())
+        borispil = sample_airport(name="Borispil", city=city)
+        zhuliany = sample_airport(name="Zhuliany", city=city)
+        airplane = sample_airplane(airplane_type=sample_airplane_type())
+        departure = datetime(2024, 6, 1, 10, 30, 15, 999, tzinfo=timezone.utc)
+        flight = sample_flight(
+            route=sample_route(source=borispil, destination=zhuliany),
+            airplane=airplane,
+            departure_time=departure,
+            arrival_time=departure.replace(hour=12),
+        )
+        flight.crew.add(sample_crew(first_name="Anna", last_name="Adams"))
+        sample_ticket(flight=flight, order=sample_order(user=self.user))
+        sample_flight(
+            route=sample_route(source=zhuliany, destination=borispil),
+            airplane=airplane,
+        )
+
+    def test_list_json_matches_serializer_byte_for_byte(self):
+        view = FlightViewSet(action="list")
+        expected = JSONRenderer().render(
+            FlightListSerializer(
+                view.get_queryset().order_by("-departure_time"), many=True
+            ).data
+        )
+
+        res = self.client.get(FLIGHT_LIST_URL, {"page_size": 100})
+
+        self.assertEqual(JSONRenderer().render(res.data["results"]), expected)
+        self.assertEqual(res.data["results"][-1]["tickets_available"], 119)
+        self.assertEqual(
+            res.data["results"][-1]["crew"], ["Anna Adams", "John Doe"]
+        )
+
+    def test_list_query_count_does_not_grow_with_rows(self):
+        # The airport names are loaded into the reference cache
+        with self.assertNumQueries(4):
+            self.client.get(FLIGHT_LIST_URL, {"page_size": 100})
+
+        cache.clear()
+        flight = Flight.objects.first()
+        for _ in range(5):
+            sample_flight(route=flight.route, airplane=flight.airplane)
+        with self.assertNumQueries(4):
+            self.client.get(FLIGHT_LIST_URL, {"page_size": 100})
@@ -0,0 +1,89 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from airport.models import Flight
+from airport.search import FlightSearchFilter
+from airport.tests.test_airport_api import (
+    AuthenticatedApiTestCase,
+    sample_airplane,
+    sample_airplane_type,
+    sample_airport,
+    sample_city,
+    sample_country,
+    sample_flight,
+    sample_route,
+)
+from airport.tests.test_query_plans import QueryPlanTestMixin
+
+FLIGHT_LIST_URL = reverse("airport:flight-list")
+
+
+class FlightSearchTests(AuthenticatedApiTestCase):
+    def setUp(self):
+        super().setUp()
+        airplane = sample_airplane(airplane_type=sample_airplane_type())
+        self.kyiv = sample_city(
+            name="Kyiv", country=sample_country(name="Ukraine")
+        )
+        borispil = sample_airport(name="Borispil", city=self.kyiv)
+        heathrow = sample_airport(
+            name="Heathrow",
+            city=sample_city(
+                name="London", country=sample_country(name="United Kingdom")
+            ),
+        )
+        self.from_kyiv = sample_flight(
+            route=sample_route(source=borispil, destination=heathrow),
+            airplane=airplane,
+        )
+        self.from_london = sample_flight(
+            route=sample_route(source=heathrow, destination=borispil),
+            airplane=airplane,
+        )
+
+    def search(self, term):
+        res = self.client.get(FLIGHT_LIST_URL, {"search": term})
+        return [flight["id"] for flight in res.data["results"]]
+
+    def test_search_matches_source_airport_city_and_country(self):
+        self.assertEqual(self.search("borisp"), [self.from_kyiv.id])
+        self.assertEqual(self.search("KYIV"), [self.from_kyiv.id])
+        self.assertEqual(self.search("kingdom"), [self.from_london.id])
+        self.assertEqual(self.search("uk"), [self.from_kyiv.id])
+        self.assertEqual(self.search("ukraine heathrow"), [])
+
+    def test_search_document_follows_renames(self):
+        self.kyiv.name = "Kiev"
+        self.kyiv.save()
+        cache.clear()
+
+        self.assertEqual(self.search("kiev"), [self.from_kyiv.id])
+        self.assertEqual(self.search("kyiv"), [])
+
+    def test_search_document_follows_route_changes(self):
+        self.from_kyiv.route = self.from_london.route
+        self.from_kyiv.save()
+        cache.clear()
+
+        self.assertEqual(self.search("kyiv"), [])
+        self.assertCountEqual(
+            self.search("london"), [self.from_kyiv.id, self.from_london.id]
+        )
+
+
+class FlightSearchQueryPlanTests(QueryPlanTestMixin, TestCase):
+    def test_search_uses_text_index(self):
+        queryset = FlightSearchFilter().filter_queryset(
+            Request(APIRequestFactory().get("/", {"search": "kyiv"})),
+            Flight.objects.order_by(),
+            None,
+        )
+
+        if connection.vendor == "postgresql":
+            self.assertUsesIndex(queryset, "flight_search_trgm_idx")
+        elif connection.vendor == "sqlite":
+            self.assertUsesIndex(queryset, "VIRTUAL TABLE INDEX")
@@ -0,0 +1,72 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from airport.models import Airport, Flight
+from airport.serializers import FlightDetailSerializer
+from airport.tests.test_airport_api import (
+    sample_airplane,
+    sample_airplane_type,
+    sample_airport,
+    sample_city,
+    sample_country,
+    sample_flight,
+    sample_route,
+)
+
+
+class FragmentCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        country = sample_country()
+        self.source = sample_airport(
+            name="Boryspil", city=sample_city(name="Kyiv", country=country)
+        )
+        self.airplane = sample_airplane(airplane_type=sample_airplane_type())
+        route = sample_route(
+            source=self.source,
+            destination=sample_airport(
+                name="Lviv", city=sample_city(name="Lviv", country=country)
+            ),
+        )
+        for _ in range(2):
+            sample_flight(route=route, airplane=self.airplane)
+
+    def serialize(self):
+        flights = Flight.objects.select_related(
+            "route__source__closest_big_city__country",
+            "route__destination__closest_big_city__country",
+            "airplane__airplane_type",
+        ).order_by("pk")
+        return FlightDetailSerializer(flights, many=True).data
+
+    def test_shared_fragments_are_looked_up_once_per_response(self):
+        with mock.patch("airport.fragments.cache") as fragment_cache:
+            fragment_cache.get.return_value = None
+            data = self.serialize()
+
+        # The route with its two airports and the airplane
+        self.assertEqual(fragment_cache.get.call_count, 4)
+        self.assertEqual(fragment_cache.set.call_count, 4)
+        self.assertEqual(data[0]["route"], data[1]["route"])
+        self.assertEqual(data[1]["route"]["source"]["name"], "Boryspil")
+
+    def test_fragments_are_reused_until_their_rows_change(self):
+        self.serialize()
+
+        Airport.objects.filter(pk=self.source.pk).update(name="Kyiv")
+        self.assertEqual(
+            self.serialize()[0]["route"]["source"]["name"], "Boryspil"
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.source.name = "Kyiv Boryspil"
+            self.source.save()
+        self.assertEqual(
+            self.serialize()[0]["route"]["source"]["name"], "Kyiv Boryspil"
+        )
+
+        self.airplane.name = "Mriya"
+        self.airplane.save()
+        self.assertEqual(self.serialize()[0]["airplane"]["name"], "Mriya")
@@ -0,0 +1,94 @@
+import threading
+from types import SimpleNamespace
+from unittest import mock
+
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+
+from airport.models import Order
+from airport.tests.test_airport_api import (
+    FlightApiTestCase,
+    sample_user,
+)
+from airport.views import OrderViewSet
+
+ORDER_URL = reverse("airport:order-list")
+
+
+class IdempotencyKeyTests(FlightApiTestCase):
+    def order(self, key, seat=1, user=None):
+        self.client.force_authenticate(user or self.user)
+        payload = {
+            "tickets": [{"row": 1, "seat": seat, "flight": self.flight.pk}]
+        }
+        return self.client.post(
+            ORDER_URL, payload, format="json", HTTP_IDEMPOTENCY_KEY=key
+        )
+
+    def cache_key(self, key):
+        view = OrderViewSet(basename="order", action="create")
+        return view.idempotency_cache_key(SimpleNamespace(user=self.user), key)
+
+    def test_retry_replays_the_first_response(self):
+        first = self.order("key-1")
+        retry = self.order("key-1")
+
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry.data, first.data)
+        self.assertEqual(retry["Idempotent-Replayed"], "true")
+        self.assertEqual(Order.objects.count(), 1)
+
+    def test_keys_are_scoped_per_user(self):
+        other = sample_user("other@test.com")
+        self.order("key-1")
+
+        res = self.order("key-1", seat=2, user=other)
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Order.objects.count(), 2)
+
+    def test_key_reused_with_another_body_is_rejected(self):
+        self.order("key-1")
+
+        res = self.order("key-1", seat=2)
+
+        self.assertEqual(res.status_code, 422)
+        self.assertEqual(Order.objects.count(), 1)
+
+    def test_failed_request_does_not_keep_the_key(self):
+        res = self.order("key-1", seat=99)
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+        res = self.order("key-1", seat=2)
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+    def test_duplicate_waits_for_the_request_in_flight(self):
+        first = self.order("key-1")
+        record = cache.get(self.cache_key("key-1"))
+        cache.set(
+            self.cache_key("key-2"), {"fingerprint": record["fingerprint"]}
+        )
+        finish = threading.Timer(
+            0.2, lambda: cache.set(self.cache_key("key-2"), record)
+        )
+
+        finish.start()
+        res = self.order("key-2")
+        finish.join()
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(res.data, first.data)
+        self.assertEqual(Order.objects.count(), 1)
+
+    def test_duplicate_gives_up_when_request_in_flight_is_stuck(self):
+        first = self.order("key-1")
+        fingerprint = cache.get(self.cache_key("key-1"))["fingerprint"]
+        cache.set(self.cache_key("key-2"), {"fingerprint": fingerprint})
+
+        with mock.patch("airport.idempotency.WAIT_TIMEOUT", 0.1):
+            res = self.order("key-2")
+
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(res.status_code, status.HTTP_409_CONFLICT)
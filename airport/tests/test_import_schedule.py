@@ -0,0 +1,93 @@
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from airport.models import Flight
+from airport.tests.test_airport_api import (
+    sample_airplane,
+    sample_airplane_type,
+    sample_airport,
+    sample_city,
+    sample_country,
+    sample_crew,
+    sample_route,
+)
+
+
+class ImportScheduleTests(TestCase):
+    def setUp(self):
+        city = sample_city(name="Kyiv", country=sample_country())
+        self.source = sample_airport(name="Borispil", city=city)
+        self.destination = sample_airport(name="Zhuliany", city=city)
+        self.route = sample_route(
+            source=self.source, destination=self.destination
+        )
+        self.airplane = sample_airplane(
+            airplane_type=sample_airplane_type(), name="UR-PSA"
+        )
+        self.pilot = sample_crew(first_name="Anna", last_name="Pilot")
+        self.engineer = sample_crew(first_name="Ivan", last_name="Engineer")
+
+    def write(self, suffix, content):
+        handle, path = tempfile.mkstemp(suffix=suffix)
+        with os.fdopen(handle, "w") as schedule:
+            schedule.write(content)
+        self.addCleanup(os.remove, path)
+        return path
+
+    def test_import_csv(self):
+        path = self.write(
+            ".csv",
+            "route,source,destination,airplane,departure_time,"
+            "arrival_time,crew\n"
+            ",Borispil,Zhuliany,UR-PSA,2024-06-01T10:00,2024-06-01T11:00,"
+            "Anna Pilot;Ivan Engineer\n"
+            f"{self.route.id},,,{self.airplane.id},2024-06-02T10:00,"
+            "2024-06-02T11:00,\n"
+            ",Borispil,Nowhere,UR-PSA,2024-06-03T10:00,2024-06-03T11:00,\n",
+        )
+        out, err = StringIO(), StringIO()
+
+        call_command(
+            "import_schedule",
+            path,
+            "--batch-size",
+            "1",
+            stdout=out,
+            stderr=err,
+        )
+
+        self.assertIn("2 flights imported, 1 skipped", out.getvalue())
+        self.assertIn("unknown route Borispil -> Nowhere", err.getvalue())
+        first = Flight.objects.get(departure_time__day=1)
+        self.assertEqual(
+            set(first.crew.values_list("id", flat=True)),
+            {self.pilot.id, self.engineer.id},
+        )
+        self.assertIn("borispil", first.search_document)
+
+    def test_import_ndjson(self):
+        path = self.write(
+            ".ndjson",
+            '{"route": %d, "airplane": "UR-PSA", '
+            '"departure_time": "2024-06-01T10:00:00+02:00", '
+            '"arrival_time": "2024-06-01T11:00:00+02:00", '
+            '"crew": [%d]}\n' % (self.route.id, self.pilot.id),
+        )
+
+        call_command("import_schedule", path, stdout=StringIO())
+
+        flight = Flight.objects.get()
+        self.assertEqual(flight.departure_time.hour, 8)
+        self.assertEqual(list(flight.crew.all()), [self.pilot])
+
+    def test_strict_mode_aborts(self):
+        path = self.write(".ndjson", "not json\n")
+
+        with self.assertRaises(CommandError):
+            call_command(
+                "import_schedule", path, "--strict", stdout=StringIO()
+            )
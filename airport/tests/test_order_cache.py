@@ -0,0 +1,90 @@
+from datetime import timedelta
+
+from django.urls import reverse
+from rest_framework import status
+
+from airport.tests.test_airport_api import (
+    FlightApiTestCase,
+    sample_order,
+    sample_ticket,
+    sample_user,
+)
+
+ORDER_URL = reverse("airport:order-list")
+
+
+def order_detail_url(order_id):
+    return reverse("airport:order-detail", args=[order_id])
+
+
+class OrderCacheTests(FlightApiTestCase):
+    def setUp(self):
+        super().setUp()
+        self.other = sample_user("other@test.com")
+        self.order = sample_order(user=self.user)
+        sample_ticket(flight=self.flight, order=self.order, row=1, seat=1)
+
+    def test_cached_payloads_skip_the_serializer_queries(self):
+        for url in (ORDER_URL, order_detail_url(self.order.pk)):
+            first = self.client.get(url)
+
+            with self.assertNumQueries(0):
+                res = self.client.get(url)
+
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            self.assertEqual(res.data, first.data)
+
+    def test_payloads_are_cached_per_user(self):
+        self.client.get(ORDER_URL)
+
+        self.client.force_authenticate(self.other)
+        res = self.client.get(ORDER_URL)
+
+        self.assertEqual(res.data["results"], [])
+
+    def test_new_order_is_listed(self):
+        self.client.get(ORDER_URL)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            res = self.client.post(
+                ORDER_URL,
+                {"tickets": [{"row": 2, "seat": 2, "flight": self.flight.pk}]},
+                format="json",
+            )
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+        res = self.client.get(ORDER_URL)
+        self.assertEqual(len(res.data["results"]), 2)
+
+    def test_rescheduled_flight_is_shown(self):
+        url = order_detail_url(self.order.pk)
+        self.client.get(url)
+
+        self.flight.refresh_from_db()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.flight.departure_time += timedelta(hours=2)
+            self.flight.arrival_time += timedelta(hours=2)
+            self.flight.save()
+
+        res = self.client.get(url)
+        self.assertEqual(
+            res.data["tickets"][0]["flight"]["departure_time"],
+            self.flight.departure_time.strftime("%Y-%m-%d %H:%M:%S"),
+        )
+
+    def test_seat_sold_to_another_user_is_shown(self):
+        url = order_detail_url(self.order.pk)
+        self.client.get(url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            sample_ticket(
+                flight=self.flight,
+                order=sample_order(user=self.other),
+                row=5,
+                seat=5,
+            )
+
+        res = self.client.get(url)
+        self.assertEqual(
+            len(res.data["tickets"][0]["flight"]["taken_places"]), 2
+        )
@@ -0,0 +1,87 @@
+from django.urls import reverse
+from rest_framework import status
+
+from airport.tests.test_airport_api import (
+    AuthenticatedApiTestCase,
+    sample_airplane,
+    sample_airplane_type,
+    sample_airport,
+    sample_city,
+    sample_country,
+    sample_flight,
+    sample_order,
+    sample_route,
+    sample_ticket,
+)
+
+ORDER_URL = reverse("airport:order-list")
+
+
+class OrderQueryCountTests(AuthenticatedApiTestCase):
+    def setUp(self):
+        super().setUp()
+        country = sample_country()
+        airports = [
+            sample_airport(
+                name=f"Airport {index}",
+                city=sample_city(name=f"City {index}", country=country),
+            )
+            for index in range(3)
+        ]
+        airplane_type = sample_airplane_type()
+        self.flights = [
+            sample_flight(
+                route=sample_route(source=source, destination=destination),
+                airplane=sample_airplane(
+                    name=f"Airplane {index}", airplane_type=airplane_type
+                ),
+            )
+            for index, (source, destination) in enumerate(
+                zip(airports, airports[1:] + airports[:1])
+            )
+        ]
+        self.orders = 0
+
+    def add_orders(self, count):
+        with self.captureOnCommitCallbacks(execute=True):
+            for _ in range(count):
+                self.orders += 1
+                order = sample_order(user=self.user)
+                for flight in self.flights:
+                    sample_ticket(flight=flight, order=order, row=self.orders)
+
+    def test_list_runs_a_fixed_number_of_queries(self):
+        self.add_orders(1)
+        with self.assertNumQueries(3):
+            self.client.get(ORDER_URL, {"page_size": 20})
+
+        self.add_orders(9)
+        with self.assertNumQueries(3):
+            res = self.client.get(ORDER_URL, {"page_size": 20})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data["results"]), 10)
+        self.assertEqual(
+            res.data["results"][0]["tickets"][0],
+            "Route: Airport 0-Airport 1, Airplane: Airplane 0 "
+            "(row: 10, seat: 1)",
+        )
+
+    def test_retrieve_does_not_grow_with_tickets(self):
+        self.add_orders(1)
+        order = sample_order(user=self.user)
+        url = reverse("airport:order-detail", args=[order.pk])
+        sample_ticket(flight=self.flights[0], order=order, row=20)
+        with self.assertNumQueries(4):
+            self.client.get(url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            for flight in self.flights:
+                for seat in (2, 3):
+                    sample_ticket(
+                        flight=flight, order=order, row=20, seat=seat
+                    )
+        with self.assertNumQueries(4):
+            res = self.client.get(url)
+
+        self.assertEqual(len(res.data["tickets"]), 7)
@@ -0,0 +1,145 @@
+from datetime import datetime, timezone
+
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from airport.booking import book_orders
+from airport.models import Order, OrderSummary
+from airport.tests.test_airport_api import (
+    AuthenticatedApiTestCase,
+    sample_airplane,
+    sample_airplane_type,
+    sample_airport,
+    sample_city,
+    sample_country,
+    sample_flight,
+    sample_order,
+    sample_route,
+    sample_ticket,
+)
+
+ORDER_URL = reverse("airport:order-list")
+
+
+def at(hour):
+    return datetime(2030, 1, 1, hour, tzinfo=timezone.utc)
+
+
+class OrderSummaryTests(AuthenticatedApiTestCase):
+    def setUp(self):
+        super().setUp()
+        self.kyiv = sample_airport(
+            name="Boryspil",
+            city=sample_city(
+                name="Kyiv", country=sample_country(name="Ukraine")
+            ),
+        )
+        self.warsaw = sample_airport(
+            name="Chopin",
+            city=sample_city(
+                name="Warsaw", country=sample_country(name="Poland")
+            ),
+        )
+        airplane = sample_airplane(airplane_type=sample_airplane_type())
+        self.late = sample_flight(
+            route=sample_route(source=self.kyiv, destination=self.warsaw),
+            airplane=airplane,
+            departure_time=at(12),
+            arrival_time=at(14),
+        )
+        self.early = sample_flight(
+            route=sample_route(source=self.warsaw, destination=self.kyiv),
+            airplane=airplane,
+            departure_time=at(8),
+            arrival_time=at(10),
+        )
+
+    def book(self, *flights, row=1):
+        payload = {
+            "tickets": [
+                {"row": row, "seat": seat, "flight": flight.pk}
+                for seat, flight in enumerate(flights, start=1)
+            ]
+        }
+        res = self.client.post(ORDER_URL, payload, format="json")
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        return Order.objects.get(pk=res.data["id"])
+
+    def test_booking_fills_the_summary(self):
+        order = self.book(self.late, self.early, self.late)
+
+        summary = order.summary
+        self.assertEqual(summary.tickets_count, 3)
+        self.assertEqual(summary.origin, self.warsaw)
+        self.assertEqual(summary.first_departure_time, at(8))
+        self.assertEqual(summary.last_arrival_time, at(14))
+        self.assertEqual(
+            summary.flight_ids, sorted([self.late.pk, self.early.pk])
+        )
+
+    def test_queued_bookings_get_a_summary(self):
+        tickets = [{"row": 1, "seat": 1, "flight": self.late}]
+
+        with transaction.atomic():
+            book_orders([(Order(user=self.user), tickets)])
+
+        summary = OrderSummary.objects.get()
+        self.assertEqual(summary.tickets_count, 1)
+        self.assertEqual(summary.origin, self.kyiv)
+
+    def test_summary_follows_ticket_and_flight_changes(self):
+        order = sample_order(user=self.user)
+        sample_ticket(flight=self.late, order=order)
+        early_ticket = sample_ticket(flight=self.early, order=order)
+
+        early_ticket.delete()
+        summary = OrderSummary.objects.get(order=order)
+        self.assertEqual(summary.tickets_count, 1)
+        self.assertEqual(summary.origin, self.kyiv)
+
+        self.late.departure_time = at(6)
+        self.late.save()
+        summary.refresh_from_db()
+        self.assertEqual(summary.first_departure_time, at(6))
+
+        order.delete()
+        self.assertFalse(OrderSummary.objects.exists())
+
+    def test_list_filters_and_orders_on_the_summary(self):
+        from_kyiv = self.book(self.late)
+        from_warsaw = self.book(self.early, self.late, row=2)
+
+        res = self.client.get(
+            ORDER_URL,
+            {
+                "tickets__flight__route__source__closest_big_city__"
+                "country__name": "Ukraine"
+            },
+        )
+        self.assertEqual(
+            [order["id"] for order in res.data["results"]], [from_kyiv.pk]
+        )
+
+        res = self.client.get(ORDER_URL, {"search": "warsaw"})
+        self.assertEqual(
+            [order["id"] for order in res.data["results"]], [from_warsaw.pk]
+        )
+
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(
+                ORDER_URL, {"ordering": "tickets__flight__departure_time"}
+            )
+        self.assertEqual(
+            [order["id"] for order in res.data["results"]],
+            [from_warsaw.pk, from_kyiv.pk],
+        )
+        orders_sql = next(
+            query["sql"]
+            for query in queries.captured_queries
+            if 'FROM "airport_order"' in query["sql"]
+            and "COUNT" not in query["sql"]
+        )
+        self.assertNotIn("DISTINCT", orders_sql)
+        self.assertNotIn("airport_ticket", orders_sql)
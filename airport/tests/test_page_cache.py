@@ -0,0 +1,70 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory
+
+from airport.cache import page_key, protected_cache_page
+
+factory = APIRequestFactory()
+
+
+class ProtectedCachePageTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.version = "1"
+        self.calls = 0
+
+        def page(request):
+            self.calls += 1
+            return Response({"calls": self.calls})
+
+        self.page = page
+        self.view = protected_cache_page(60, lambda request: self.version)(
+            page
+        )
+        self.request = factory.get("/flights/", {"page_size": 10})
+        self.lock_key = f"{page_key(page, self.request)}.lock"
+
+    def test_page_is_recomputed_for_a_new_version(self):
+        self.assertEqual(self.view(self.request).data, {"calls": 1})
+        self.assertEqual(self.view(self.request).data, {"calls": 1})
+
+        self.version = "2"
+        self.assertEqual(self.view(self.request).data, {"calls": 2})
+        self.assertFalse(cache.get(self.lock_key))
+
+    def test_stale_copy_is_served_while_another_request_recomputes(self):
+        self.view(self.request)
+        self.version = "2"
+        cache.add(self.lock_key, "other", 30)
+
+        response = self.view(self.request)
+
+        self.assertEqual(response.data, {"calls": 1})
+        self.assertTrue(response.stale)
+        self.assertEqual(self.calls, 1)
+
+    @mock.patch("airport.cache.PAGE_WAIT_TIMEOUT", 0.1)
+    def test_cold_miss_waits_then_computes_the_page(self):
+        cache.add(self.lock_key, "other", 30)
+
+        response = self.view(self.request)
+
+        self.assertEqual(response.data, {"calls": 1})
+        self.assertEqual(cache.get(self.lock_key), "other")
+
+    def test_page_is_recomputed_early_by_chance(self):
+        self.view(self.request)
+        key = page_key(self.page, self.request)
+        entry = cache.get(key)
+        entry["delta"] = 10
+        cache.set(key, entry)
+
+        with mock.patch("airport.cache.random.random", return_value=0.0):
+            self.assertEqual(self.view(self.request).data, {"calls": 1})
+
+        # A draw close to 1 moves the refresh far ahead of the expiry
+        with mock.patch("airport.cache.random.random", return_value=1 - 1e-12):
+            self.assertEqual(self.view(self.request).data, {"calls": 2})
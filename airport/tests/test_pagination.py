@@ -0,0 +1,147 @@
+import base64
+import json
+from datetime import datetime, timedelta, timezone
+
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from airport.models import Flight
+from airport.pagination import CountingPaginator
+from airport.tests.test_airport_api import (
+    AuthenticatedApiTestCase,
+    sample_airplane,
+    sample_airplane_type,
+    sample_flight,
+    sample_loop_route,
+    sample_order,
+    sample_user,
+)
+
+FLIGHT_LIST_URL = reverse("airport:flight-list")
+ORDER_LIST_URL = reverse("airport:order-list")
+
+
+class CursorPaginationTests(AuthenticatedApiTestCase):
+    def setUp(self):
+        super().setUp()
+        route = sample_loop_route()
+        airplane = sample_airplane(airplane_type=sample_airplane_type())
+        start = datetime(2024, 6, 1, tzinfo=timezone.utc)
+        for hours in (0, 0, 1, 2, 2, 2, 3):
+            sample_flight(
+                route=route,
+                airplane=airplane,
+                departure_time=start + timedelta(hours=hours),
+                arrival_time=start + timedelta(hours=5),
+            )
+
+    def test_cursor_pages_cover_schedule_once_in_order(self):
+        expected = list(
+            Flight.objects.order_by(
+                "-departure_time", "-arrival_time", "id"
+            ).values_list("id", flat=True)
+        )
+
+        res = self.client.get(
+            FLIGHT_LIST_URL, {"pagination": "cursor", "page_size": 3}
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotIn("count", res.data)
+        self.assertIsNone(res.data["previous"])
+
+        seen, pages = [], []
+        while True:
+            pages.append(res.data)
+            seen += [flight["id"] for flight in res.data["results"]]
+            if res.data["next"] is None:
+                break
+            res = self.client.get(res.data["next"])
+
+        self.assertEqual(seen, expected)
+        self.assertEqual(len(pages), 3)
+
+        res = self.client.get(pages[-1]["previous"])
+        self.assertEqual(res.data["results"], pages[1]["results"])
+
+    def test_page_number_response_stays_default(self):
+        res = self.client.get(FLIGHT_LIST_URL)
+
+        self.assertEqual(res.data["count"], 7)
+        self.assertEqual(res.data["pages"], 2)
+
+    def test_order_cursor_pagination(self):
+        orders = [sample_order(user=self.user) for _ in range(3)]
+
+        res = self.client.get(ORDER_LIST_URL, {"cursor": "", "page_size": 2})
+        ids = [order["id"] for order in res.data["results"]]
+        res = self.client.get(res.data["next"])
+        ids += [order["id"] for order in res.data["results"]]
+
+        self.assertEqual(ids, [order.id for order in reversed(orders)])
+        self.assertIsNone(res.data["next"])
+
+    def test_invalid_cursor(self):
+        res = self.client.get(FLIGHT_LIST_URL, {"cursor": "garbage"})
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_cursor_with_malformed_values(self):
+        for url, position in (
+            (FLIGHT_LIST_URL, ["yesterday", "2024-06-01T05:00:00+00:00", 1]),
+            (FLIGHT_LIST_URL, [None, None, None]),
+            (FLIGHT_LIST_URL, [{}, [], "one"]),
+            (ORDER_LIST_URL, ["2024-06-01T05:00:00+00:00", 2**80]),
+        ):
+            cursor = base64.urlsafe_b64encode(
+                json.dumps({"p": position}).encode()
+            ).decode()
+
+            res = self.client.get(url, {"cursor": cursor})
+
+            self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+            self.assertEqual(res.data["detail"], "Invalid cursor")
+
+
+class CountModeTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        route = sample_loop_route()
+        airplane = sample_airplane(airplane_type=sample_airplane_type())
+        for _ in range(3):
+            sample_flight(route=route, airplane=airplane)
+
+    def test_cached_count_is_reused_across_orderings(self):
+        queryset = Flight.objects.filter(airplane__rows=20)
+
+        paginator = CountingPaginator(queryset, 2, count_mode="cached")
+        self.assertEqual(paginator.count, 3)
+        with self.assertNumQueries(0):
+            paginator = CountingPaginator(
+                queryset.order_by("id"), 2, count_mode="cached"
+            )
+            self.assertEqual(paginator.count, 3)
+        self.assertEqual(paginator.count_mode, "cached")
+
+    def test_stale_count_does_not_hide_rows(self):
+        queryset = Flight.objects.order_by("id")
+        CountingPaginator(queryset, 2, count_mode="cached").count
+        flight = Flight.objects.first()
+        for _ in range(2):
+            sample_flight(route=flight.route, airplane=flight.airplane)
+
+        paginator = CountingPaginator(queryset, 2, count_mode="cached")
+        page = paginator.page(2)
+        self.assertEqual(paginator.num_pages, 2)
+        self.assertTrue(page.has_next())
+        self.assertEqual(len(paginator.page(3)), 1)
+
+    def test_estimated_count_falls_back_to_exact_on_sqlite(self):
+        user = sample_user()
+        self.client.force_authenticate(user)
+
+        res = self.client.get(FLIGHT_LIST_URL)
+
+        self.assertEqual(res.data["count"], 3)
+        self.assertEqual(res.data["count_mode"], "exact")
@@ -0,0 +1,78 @@
+from datetime import datetime, timezone
+from unittest import skipUnless
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+
+from airport.models import Flight, Order
+
+DEPARTURE = datetime(2024, 6, 1, tzinfo=timezone.utc)
+
+
+class QueryPlanTestMixin:
+    """Capture EXPLAIN output and assert that an index serves a query."""
+
+    def explain(self, queryset):
+        if connection.vendor == "postgresql":
+            # Test tables are tiny, so make any available index cheaper
+            # than a sequential scan, which is what the planner would pick
+            # on the production-sized tables.
+            with connection.cursor() as cursor:
+                cursor.execute("SET enable_seqscan = off")
+            try:
+                return queryset.explain()
+            finally:
+                with connection.cursor() as cursor:
+                    cursor.execute("SET enable_seqscan = on")
+        return queryset.explain()
+
+    def assertUsesIndex(self, queryset, index_name):
+        plan = self.explain(queryset)
+        self.assertIn(index_name, plan, msg=f"\n{queryset.query}\n{plan}")
+
+
+@skipUnless(
+    connection.vendor in ("sqlite", "postgresql"),
+    "Query plans are only checked on SQLite and PostgreSQL",
+)
+class FlightFilterQueryPlanTests(QueryPlanTestMixin, TestCase):
+    def test_departure_range_uses_index(self):
+        queryset = Flight.objects.filter(
+            departure_time__gte=DEPARTURE,
+            departure_time__lt=DEPARTURE.replace(month=7),
+        )
+
+        self.assertUsesIndex(queryset, "flight_departure_arrival_idx")
+
+    def test_default_ordering_uses_index(self):
+        self.assertUsesIndex(
+            Flight.objects.all()[:5], "flight_departure_arrival_idx"
+        )
+
+    def test_arrival_range_uses_index(self):
+        queryset = Flight.objects.filter(
+            arrival_time__gte=DEPARTURE
+        ).order_by()
+
+        self.assertUsesIndex(queryset, "flight_arrival_idx")
+
+    def test_route_departure_uses_index(self):
+        queryset = Flight.objects.filter(
+            route_id=1, departure_time__gte=DEPARTURE
+        ).order_by()
+
+        self.assertUsesIndex(queryset, "flight_route_departure_idx")
+
+    def test_source_city_name_uses_index(self):
+        queryset = Flight.objects.filter(
+            route__source__closest_big_city__name="Kyiv"
+        ).order_by()
+
+        self.assertUsesIndex(queryset, "city_name_idx")
+
+    def test_order_history_uses_index(self):
+        user = get_user_model().objects.create_user("user@test.com", "pass")
+        queryset = Order.objects.filter(user=user)[:5]
+
+        self.assertUsesIndex(queryset, "order_user_created_idx")
@@ -0,0 +1,148 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from airport.models import Airport
+from airport.reference import REFERENCE_VERSION_KEY, ReferenceCache
+from airport.tests.test_airport_api import (
+    AuthenticatedApiTestCase,
+    sample_airplane,
+    sample_airplane_type,
+    sample_airport,
+    sample_city,
+    sample_country,
+    sample_flight,
+    sample_route,
+)
+
+FLIGHT_LIST_URL = reverse("airport:flight-list")
+ROUTE_LIST_URL = reverse("airport:route-list")
+
+
+class ReferenceCacheTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.loads = []
+
+    def load(self, key):
+        def loader():
+            self.loads.append(key)
+            return key.upper()
+
+        return loader
+
+    def test_least_recently_used_entry_is_evicted(self):
+        reference = ReferenceCache(max_size=2)
+
+        for key in ("a", "b", "a", "c", "a", "b"):
+            self.assertEqual(reference.get(key, self.load(key)), key.upper())
+
+        self.assertEqual(self.loads, ["a", "b", "c", "b"])
+
+    def test_new_version_stamp_drops_entries(self):
+        reference = ReferenceCache()
+        reference.get("a", self.load("a"))
+
+        cache.set(REFERENCE_VERSION_KEY, "new", None)
+        reference.get("a", self.load("a"))
+        reference.expire_check()
+        reference.get("a", self.load("a"))
+
+        self.assertEqual(self.loads, ["a", "a"])
+
+
+class ReferenceDataApiTests(AuthenticatedApiTestCase):
+    def setUp(self):
+        super().setUp()
+        self.boryspil = sample_airport(
+            name="Boryspil",
+            city=sample_city(
+                name="Kyiv", country=sample_country(name="Ukraine")
+            ),
+        )
+        chopin = sample_airport(
+            name="Chopin",
+            city=sample_city(
+                name="Warsaw", country=sample_country(name="Poland")
+            ),
+        )
+        airplane = sample_airplane(airplane_type=sample_airplane_type())
+        self.from_kyiv = sample_flight(
+            route=sample_route(source=self.boryspil, destination=chopin),
+            airplane=airplane,
+        )
+        sample_flight(
+            route=sample_route(source=chopin, destination=self.boryspil),
+            airplane=airplane,
+        )
+
+    def test_warm_reference_cache_saves_the_airport_query(self):
+        self.client.get(FLIGHT_LIST_URL, {"page_size": 10})
+
+        with self.assertNumQueries(3):
+            res = self.client.get(FLIGHT_LIST_URL, {"page_size": 20})
+
+        self.assertEqual(
+            {flight["route"] for flight in res.data["results"]},
+            {"Boryspil-Chopin", "Chopin-Boryspil"},
+        )
+
+    def test_renamed_airport_is_shown_at_once(self):
+        self.client.get(ROUTE_LIST_URL)
+
+        self.boryspil.name = "Kyiv Boryspil"
+        self.boryspil.save()
+        res = self.client.get(ROUTE_LIST_URL)
+
+        self.assertEqual(
+            {route["source"] for route in res.data["results"]},
+            {"Kyiv Boryspil", "Chopin"},
+        )
+
+    def test_flight_filter_resolves_airports_without_joins(self):
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(
+                FLIGHT_LIST_URL,
+                {"route__source__closest_big_city__country__name": "Ukraine"},
+            )
+
+        self.assertEqual(
+            [flight["id"] for flight in res.data["results"]],
+            [self.from_kyiv.pk],
+        )
+        flight_queries = [
+            query["sql"]
+            for query in queries.captured_queries
+            if 'FROM "airport_flight"' in query["sql"]
+        ]
+        self.assertTrue(flight_queries)
+        for sql in flight_queries:
+            self.assertNotIn("airport_country", sql)
+
+    def test_airport_missing_from_cached_names_is_reloaded(self):
+        self.client.get(FLIGHT_LIST_URL)
+        # bulk_create sends no signal, like a write whose version bump
+        # has not happened yet
+        (lviv,) = Airport.objects.bulk_create(
+            [
+                Airport(
+                    name="Lviv",
+                    closest_big_city=self.boryspil.closest_big_city,
+                )
+            ]
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            sample_flight(
+                route=sample_route(source=lviv, destination=self.boryspil),
+                airplane=self.from_kyiv.airplane,
+            )
+        res = self.client.get(FLIGHT_LIST_URL, {"page_size": 10})
+
+        self.assertEqual(res.status_code, 200)
+        self.assertIn(
+            "Lviv-Boryspil",
+            [flight["route"] for flight in res.data["results"]],
+        )
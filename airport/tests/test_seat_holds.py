@@ -0,0 +1,126 @@
+import time
+
+from django.urls import reverse
+from rest_framework import status
+
+from airport.booking import SEAT_HELD_MESSAGE
+from airport.holds import held_seats, hold_seats, release_seats
+from airport.tests.test_airport_api import (
+    FlightApiTestCase,
+    sample_order,
+    sample_ticket,
+    sample_user,
+)
+
+ORDER_URL = reverse("airport:order-list")
+
+
+def holds_url(flight_id):
+    return reverse("airport:flight-holds", args=[flight_id])
+
+
+def seat_map_url(flight_id):
+    return reverse("airport:flight-seat-map", args=[flight_id])
+
+
+class SeatHoldTests(FlightApiTestCase):
+    airplane_params = {"rows": 3, "seats_in_row": 4}
+
+    def setUp(self):
+        super().setUp()
+        self.other = sample_user("other@test.com")
+
+    def hold(self, *seats, user=None):
+        self.client.force_authenticate(user or self.user)
+        return self.client.post(
+            holds_url(self.flight.pk),
+            {"seats": [{"row": row, "seat": seat} for row, seat in seats]},
+            format="json",
+        )
+
+    def test_hold_is_listed_and_shown_in_seat_map(self):
+        res = self.hold((1, 1), (1, 2))
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            [(seat["row"], seat["seat"]) for seat in res.data["seats"]],
+            [(1, 1), (1, 2)],
+        )
+        self.assertEqual(
+            self.client.get(holds_url(self.flight.pk)).data, res.data
+        )
+
+        seat_map = self.client.get(
+            seat_map_url(self.flight.pk), {"encoding": "json"}
+        ).data
+        self.assertEqual(seat_map["held"], 2)
+        self.assertEqual(seat_map["taken"], 2)
+        self.assertEqual(seat_map["seats"][0], [1, 1, 0, 0])
+
+    def test_seats_held_or_sold_elsewhere_conflict(self):
+        sample_ticket(
+            flight=self.flight, order=sample_order(user=self.other), seat=3
+        )
+        self.hold((1, 1), user=self.other)
+
+        res = self.hold((1, 1), (1, 2))
+        self.assertEqual(res.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(res.data["seats"], [{"row": 1, "seat": 1}])
+
+        res = self.hold((1, 2), (1, 3))
+        self.assertEqual(res.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(res.data["seats"], [{"row": 1, "seat": 3}])
+        self.assertEqual(held_seats(self.flight.pk).keys(), {(1, 1)})
+
+    def test_seats_out_of_range_are_rejected(self):
+        res = self.hold((1, 1), (1, 5))
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res.data["seats"][0], {})
+        self.assertIn("seat", res.data["seats"][1])
+
+    def test_only_the_holder_can_order_held_seats(self):
+        self.hold((2, 2))
+        payload = {
+            "tickets": [{"row": 2, "seat": 2, "flight": self.flight.pk}]
+        }
+
+        self.client.force_authenticate(self.other)
+        res = self.client.post(ORDER_URL, payload, format="json")
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            res.data["tickets"][0]["non_field_errors"], [SEAT_HELD_MESSAGE]
+        )
+
+        self.client.force_authenticate(self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            res = self.client.post(ORDER_URL, payload, format="json")
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(held_seats(self.flight.pk), {})
+
+    def test_release_only_drops_own_holds(self):
+        self.hold((1, 1), (1, 2))
+        self.hold((3, 4), user=self.other)
+
+        self.client.force_authenticate(self.user)
+        res = self.client.delete(
+            holds_url(self.flight.pk),
+            {"seats": [{"row": 1, "seat": 1}, {"row": 3, "seat": 4}]},
+            format="json",
+        )
+        self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(held_seats(self.flight.pk).keys(), {(1, 2), (3, 4)})
+
+        self.client.delete(holds_url(self.flight.pk))
+        self.assertEqual(held_seats(self.flight.pk).keys(), {(3, 4)})
+
+    def test_holds_expire(self):
+        self.assertEqual(hold_seats(self.flight.pk, [(1, 1)], 1, 0.05), [])
+        self.assertEqual(hold_seats(self.flight.pk, [(1, 1)], 2, 60), [(1, 1)])
+
+        time.sleep(0.1)
+
+        self.assertEqual(held_seats(self.flight.pk), {})
+        self.assertEqual(hold_seats(self.flight.pk, [(1, 1)], 2, 60), [])
+        self.assertEqual(release_seats(self.flight.pk, [(1, 1)], 1), 0)
+        self.assertEqual(held_seats(self.flight.pk).keys(), {(1, 1)})
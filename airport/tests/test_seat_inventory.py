@@ -0,0 +1,70 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from airport.models import Flight
+from airport.serializers import FlightSerializer
+from airport.tests.test_airport_api import (
+    sample_airplane,
+    sample_airplane_type,
+    sample_flight,
+    sample_loop_route,
+    sample_order,
+    sample_ticket,
+    sample_user,
+)
+
+
+class SeatsSoldCounterTests(TestCase):
+    def setUp(self):
+        self.user = sample_user()
+        self.flight = sample_flight(
+            route=sample_loop_route(),
+            airplane=sample_airplane(airplane_type=sample_airplane_type()),
+        )
+
+    def test_counter_follows_ticket_creation_and_deletion(self):
+        order = sample_order(user=self.user)
+        sample_ticket(flight=self.flight, order=order)
+        ticket = sample_ticket(flight=self.flight, order=order, seat=2)
+
+        self.flight.refresh_from_db()
+        self.assertEqual(self.flight.seats_sold, 2)
+        self.assertEqual(self.flight.seats_available, 20 * 6 - 2)
+
+        ticket.delete()
+        self.flight.refresh_from_db()
+        self.assertEqual(self.flight.seats_sold, 1)
+
+        order.delete()
+        self.flight.refresh_from_db()
+        self.assertEqual(self.flight.seats_sold, 0)
+
+    def test_saving_a_stale_flight_keeps_the_counter(self):
+        stale = Flight.objects.get(pk=self.flight.pk)
+        sample_ticket(flight=self.flight, order=sample_order(user=self.user))
+
+        serializer = FlightSerializer(
+            stale, data={"departure_time": "2024-06-01T10:00"}, partial=True
+        )
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+
+        self.flight.refresh_from_db()
+        self.assertEqual(self.flight.seats_sold, 1)
+        self.assertEqual(self.flight.departure_time.hour, 10)
+
+    def test_reconcile_repairs_drift(self):
+        sample_ticket(flight=self.flight, order=sample_order(user=self.user))
+        Flight.objects.filter(pk=self.flight.pk).update(seats_sold=7)
+
+        out = StringIO()
+        call_command("reconcile_seats_sold", "--dry-run", stdout=out)
+        self.flight.refresh_from_db()
+        self.assertIn("1 drifted", out.getvalue())
+        self.assertEqual(self.flight.seats_sold, 7)
+
+        call_command("reconcile_seats_sold", stdout=StringIO())
+        self.flight.refresh_from_db()
+        self.assertEqual(self.flight.seats_sold, 1)
@@ -0,0 +1,102 @@
+import base64
+from unittest import mock
+
+from django.urls import reverse
+from rest_framework import status
+
+from airport.seat_map import (
+    SeatMap,
+    build_seat_map,
+    get_seat_map,
+    invalidate_seat_maps,
+)
+from airport.tests.test_airport_api import (
+    FlightApiTestCase,
+    sample_order,
+    sample_ticket,
+)
+
+
+def seat_map_url(flight_id):
+    return reverse("airport:flight-seat-map", args=[flight_id])
+
+
+class SeatMapTests(FlightApiTestCase):
+    airplane_params = {"rows": 3, "seats_in_row": 4}
+
+    def setUp(self):
+        super().setUp()
+        self.order = sample_order(user=self.user)
+
+    def test_seat_map_encodings(self):
+        sample_ticket(flight=self.flight, order=self.order, row=1, seat=2)
+        sample_ticket(flight=self.flight, order=self.order, row=3, seat=4)
+
+        res = self.client.get(seat_map_url(self.flight.id))
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["taken"], 2)
+        self.assertEqual(
+            base64.b64decode(res.data["seats"]),
+            bytes([0b01000000, 0b00010000]),
+        )
+
+        res = self.client.get(
+            seat_map_url(self.flight.id), {"encoding": "rle"}
+        )
+        self.assertEqual(res.data["seats"], [[1, 1, 2], [4], [3, 1]])
+
+        res = self.client.get(
+            seat_map_url(self.flight.id), {"encoding": "json"}
+        )
+        self.assertEqual(res.data["seats"][0], [0, 1, 0, 0])
+
+    def test_cached_seat_map_follows_ticket_writes(self):
+        self.assertEqual(get_seat_map(self.flight.id).taken_count, 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ticket = sample_ticket(
+                flight=self.flight, order=self.order, row=2, seat=3
+            )
+        seat_map = get_seat_map(self.flight.id)
+        self.assertTrue(seat_map.is_taken(2, 3))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ticket.delete()
+        self.assertEqual(get_seat_map(self.flight.id).taken_count, 0)
+
+    def test_ticket_committed_during_a_rebuild_is_not_lost(self):
+        def build_then_sell(flight_id):
+            seat_map = build_seat_map(flight_id)
+            with self.captureOnCommitCallbacks(execute=True):
+                sample_ticket(
+                    flight=self.flight, order=self.order, row=1, seat=1
+                )
+            return seat_map
+
+        with mock.patch(
+            "airport.seat_map.build_seat_map", side_effect=build_then_sell
+        ):
+            self.assertFalse(get_seat_map(self.flight.id).is_taken(1, 1))
+
+        self.assertTrue(get_seat_map(self.flight.id).is_taken(1, 1))
+
+    def test_seat_map_bytes_round_trip(self):
+        seat_map = SeatMap(30, 10)
+        seat_map.take(30, 10)
+        restored = SeatMap.from_bytes(seat_map.to_bytes())
+
+        self.assertEqual(len(seat_map.to_bytes()), 4 + 38)
+        self.assertTrue(restored.is_taken(30, 10))
+        self.assertEqual(restored.taken_count, 1)
+
+    def test_unknown_flight_and_encoding(self):
+        res = self.client.get(seat_map_url(self.flight.id + 100))
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+        res = self.client.get(
+            seat_map_url(self.flight.id), {"encoding": "xml"}
+        )
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def tearDown(self):
+        invalidate_seat_maps(self.flight.id)
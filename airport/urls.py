@@ -11,6 +11,7 @@ from airport.views import (
     RouteViewSet,
     FlightViewSet,
     OrderViewSet,
+    BookingRequestViewSet,
 )
 
 router = routers.DefaultRouter()
@@ -23,6 +24,9 @@ router.register("airports", AirportViewSet)
 router.register("routes", RouteViewSet)
 router.register("flights", FlightViewSet)
 router.register("orders", OrderViewSet)
+router.register(
+    "booking-requests", BookingRequestViewSet, basename="booking-request"
+)
 
 urlpatterns = [path("", include(router.urls))]
 
@@ -1,15 +1,41 @@
-from django.db.models import Count, F, ExpressionWrapper, IntegerField
+from datetime import datetime, timezone
+
+from django.db.models import F, ExpressionWrapper, IntegerField, Prefetch
 from django.utils.decorators import method_decorator
-from django.views.decorators.cache import cache_page
 from django_filters.rest_framework import DjangoFilterBackend
 from drf_spectacular.utils import extend_schema_view
-from rest_framework import viewsets, status
+from rest_framework import mixins, viewsets, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.filters import SearchFilter, OrderingFilter
 from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 
-from airport.filters import FlightFilter
+from airport.booking import bookable_seat_map
+from airport.booking_queue import QueuedCreateMixin
+from airport.cache import (
+    FLIGHT_CACHE_TIMEOUT,
+    flight_detail_version,
+    flight_detail_version_keys,
+    flight_list_version,
+    flight_list_version_keys,
+    protected_cache_page,
+)
+from airport.conditional import ConditionalGetMixin, conditional_get
+from airport.exports import (
+    MANIFEST_COLUMNS,
+    ORDER_EXPORT_COLUMNS,
+    export_response,
+)
+from airport.filters import FlightFilter, OrderFilter
+from airport.holds import (
+    held_seats,
+    hold_seats,
+    holder_seats,
+    release_seats,
+)
+from airport.idempotency import IdempotentCreateMixin
+from airport.pagination import FlightCursorPagination, OrderCursorPagination
 from airport.models import (
     Crew,
     AirplaneType,
@@ -20,8 +46,13 @@ from airport.models import (
     Route,
     Flight,
     Order,
+    Ticket,
+    BookingRequest,
 )
+from airport.order_cache import OrderCacheMixin, order_version_keys
 from airport.permissions import IsAdminOrIfAuthenticatedReadOnly
+from airport.search import FlightSearchFilter
+from airport.seat_map import SeatMap, get_seat_map
 from airport.schemas import (
     CrewSchema,
     AirplaneTypeSchema,
@@ -32,6 +63,7 @@ from airport.schemas import (
     RouteSchema,
     FlightSchema,
     OrderSchema,
+    BookingRequestSchema,
 )
 from airport.serializers import (
     CrewSerializer,
@@ -52,15 +84,22 @@ from airport.serializers import (
     RouteDetailSerializer,
     FlightSerializer,
     FlightListSerializer,
+    FlightListProjection,
     FlightDetailSerializer,
+    HeldSeatSerializer,
+    SeatSerializer,
+    SeatHoldSerializer,
+    BestSeatsSerializer,
     OrderSerializer,
     OrderListSerializer,
     OrderDetailSerializer,
+    BookingRequestCreateSerializer,
+    BookingRequestSerializer,
 )
 
 
 @extend_schema_view(list=CrewSchema.list)
-class CrewViewSet(viewsets.ModelViewSet):
+class CrewViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = Crew.objects.all()
     serializer_class = CrewSerializer
     filter_backends = [OrderingFilter, SearchFilter]
@@ -72,7 +111,7 @@ class CrewViewSet(viewsets.ModelViewSet):
 
 
 @extend_schema_view(list=AirplaneTypeSchema.list)
-class AirplaneTypeViewSet(viewsets.ModelViewSet):
+class AirplaneTypeViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = AirplaneType.objects.all()
     serializer_class = AirplaneTypeSerializer
     filter_backends = [OrderingFilter, SearchFilter]
@@ -87,7 +126,7 @@ class AirplaneTypeViewSet(viewsets.ModelViewSet):
     list=AirplaneSchema.list,
     retrieve=AirplaneSchema.retrieve,
 )
-class AirplaneViewSet(viewsets.ModelViewSet):
+class AirplaneViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = Airplane.objects.select_related("airplane_type")
     serializer_class = AirplaneSerializer
     filter_backends = [OrderingFilter, SearchFilter, DjangoFilterBackend]
@@ -102,7 +141,7 @@ class AirplaneViewSet(viewsets.ModelViewSet):
         queryset = self.queryset
 
         if self.action == "list":
-            queryset = queryset.annotate(
+            queryset = queryset.select_related(None).annotate(
                 airplane_capacity=ExpressionWrapper(
                     F("rows") * F("seats_in_row"), output_field=IntegerField()
                 )
@@ -140,7 +179,7 @@ class AirplaneViewSet(viewsets.ModelViewSet):
 @extend_schema_view(
     list=CountrySchema.list,
 )
-class CountryViewSet(viewsets.ModelViewSet):
+class CountryViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = Country.objects.all()
     serializer_class = CountrySerializer
     filter_backends = [OrderingFilter, SearchFilter]
@@ -155,7 +194,7 @@ class CountryViewSet(viewsets.ModelViewSet):
     list=CitySchema.list,
     retrieve=CitySchema.retrieve,
 )
-class CityViewSet(viewsets.ModelViewSet):
+class CityViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = City.objects.select_related("country")
     serializer_class = CitySerializer
     filter_backends = [OrderingFilter, SearchFilter, DjangoFilterBackend]
@@ -166,6 +205,13 @@ class CityViewSet(viewsets.ModelViewSet):
         IsAdminUser,
     ]
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+
+        if self.action == "list":
+            queryset = queryset.select_related(None)
+        return queryset
+
     def get_serializer_class(self):
         if self.action == "list":
             return CityListSerializer
@@ -180,7 +226,7 @@ class CityViewSet(viewsets.ModelViewSet):
     list=AirportSchema.list,
     retrieve=AirportSchema.retrieve,
 )
-class AirportViewSet(viewsets.ModelViewSet):
+class AirportViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = Airport.objects.select_related(
         "closest_big_city__country",
     )
@@ -204,6 +250,13 @@ class AirportViewSet(viewsets.ModelViewSet):
         IsAdminOrIfAuthenticatedReadOnly,
     ]
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+
+        if self.action == "list":
+            queryset = queryset.select_related(None)
+        return queryset
+
     def get_serializer_class(self):
         if self.action == "retrieve":
             return AirportDetailSerializer
@@ -217,7 +270,7 @@ class AirportViewSet(viewsets.ModelViewSet):
     list=RouteSchema.list,
     retrieve=RouteSchema.retrieve,
 )
-class RouteViewSet(viewsets.ModelViewSet):
+class RouteViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = Route.objects.select_related(
         "source__closest_big_city__country",
         "destination__closest_big_city__country",
@@ -239,6 +292,13 @@ class RouteViewSet(viewsets.ModelViewSet):
         IsAdminOrIfAuthenticatedReadOnly,
     ]
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+
+        if self.action == "list":
+            queryset = queryset.select_related(None)
+        return queryset
+
     def get_serializer_class(self):
         if self.action == "list":
             return RouteListSerializer
@@ -252,22 +312,31 @@ class RouteViewSet(viewsets.ModelViewSet):
 @extend_schema_view(
     list=FlightSchema.list,
     retrieve=FlightSchema.retrieve,
+    seat_map=FlightSchema.seat_map,
+    best_seats=FlightSchema.best_seats,
+    holds=FlightSchema.holds,
+    manifest=FlightSchema.manifest,
 )
-class FlightViewSet(viewsets.ModelViewSet):
+class FlightViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = Flight.objects.select_related(
         "route__source__closest_big_city__country",
         "route__destination__closest_big_city__country",
         "airplane__airplane_type",
     ).prefetch_related("crew")
     serializer_class = FlightSerializer
-    filter_backends = [OrderingFilter, SearchFilter, DjangoFilterBackend]
-    ordering_fields = ["departure_time", "arrival_time"]
-    search_fields = [
-        "route__source__name",
-        "route__source__closest_big_city__name",
-        "route__source__closest_big_city__country__name",
+    filter_backends = [
+        OrderingFilter,
+        FlightSearchFilter,
+        DjangoFilterBackend,
     ]
+    ordering_fields = ["departure_time", "arrival_time"]
     filterset_class = FlightFilter
+    cursor_pagination_class = FlightCursorPagination
+    pagination_count_mode = "estimated"
+    etag_version_keys = {
+        "list": flight_list_version_keys,
+        "retrieve": flight_detail_version_keys,
+    }
     permission_classes = [
         IsAdminOrIfAuthenticatedReadOnly,
     ]
@@ -279,7 +348,7 @@ class FlightViewSet(viewsets.ModelViewSet):
             queryset = queryset.annotate(
                 tickets_available=F("airplane__rows")
                 * F("airplane__seats_in_row")
-                - Count("tickets")
+                - F("seats_sold")
             )
         return queryset
 
@@ -291,51 +360,255 @@ class FlightViewSet(viewsets.ModelViewSet):
         if self.action == "retrieve":
             return FlightDetailSerializer
 
+        if self.action == "holds":
+            return SeatHoldSerializer
+
         return super().get_serializer_class()
 
-    @method_decorator(cache_page(60 * 60 * 2))
+    def get_permissions(self):
+        if self.action == "holds":
+            return [
+                IsAuthenticated(),
+            ]
+
+        if self.action == "manifest":
+            return [
+                IsAdminUser(),
+            ]
+
+        return super().get_permissions()
+
+    @conditional_get
+    @method_decorator(
+        protected_cache_page(FLIGHT_CACHE_TIMEOUT, flight_list_version)
+    )
     def list(self, request, *args, **kwargs):
-        return super().list(request, *args, **kwargs)
+        queryset = FlightListProjection.project(
+            self.filter_queryset(self.get_queryset())
+        )
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(FlightListProjection(page).data)
+
+        return Response(FlightListProjection(queryset).data)
 
-    @method_decorator(cache_page(60 * 60 * 2))
+    @conditional_get
+    @method_decorator(
+        protected_cache_page(FLIGHT_CACHE_TIMEOUT, flight_detail_version)
+    )
     def retrieve(self, request, *args, **kwargs):
         return super().retrieve(request, *args, **kwargs)
 
+    @action(
+        methods=["GET"],
+        detail=True,
+        url_path="seat-map",
+    )
+    def seat_map(self, request, pk=None):
+        encoding = request.query_params.get("encoding", "bitmap")
+        if encoding not in SeatMap.ENCODINGS:
+            raise ValidationError(
+                {"encoding": f"Must be one of: {', '.join(SeatMap.ENCODINGS)}"}
+            )
+
+        try:
+            seat_map = get_seat_map(int(pk))
+        except (ValueError, Flight.DoesNotExist):
+            raise NotFound()
+
+        held = held_seats(int(pk))
+        for row, seat in held:
+            if row <= seat_map.rows and seat <= seat_map.seats_in_row:
+                seat_map.take(row, seat)
+
+        data = seat_map.serialize(encoding)
+        data["held"] = len(held)
+        return Response(data)
+
+    @action(
+        methods=["GET"],
+        detail=True,
+        url_path="best-seats",
+    )
+    def best_seats(self, request, pk=None):
+        serializer = BestSeatsSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+
+        try:
+            seat_map = bookable_seat_map(int(pk), request.user.pk)
+        except (ValueError, Flight.DoesNotExist):
+            raise NotFound()
+
+        seats = seat_map.find_adjacent(serializer.validated_data["count"])
+        if seats is None:
+            return Response(
+                {"detail": "Not enough adjacent free seats."},
+                status=status.HTTP_409_CONFLICT,
+            )
+
+        return Response(
+            {
+                "flight": int(pk),
+                "seats": SeatSerializer(
+                    [{"row": row, "seat": seat} for row, seat in seats],
+                    many=True,
+                ).data,
+            }
+        )
+
+    @action(
+        methods=["GET", "POST", "DELETE"],
+        detail=True,
+        url_path="holds",
+    )
+    def holds(self, request, pk=None):
+        try:
+            flight = Flight.objects.select_related("airplane").get(pk=int(pk))
+        except (ValueError, Flight.DoesNotExist):
+            raise NotFound()
+
+        holder = request.user.pk
+        if request.method == "GET":
+            return Response(self.held_seats_data(flight.pk, holder))
+
+        serializer = self.get_serializer(
+            data=request.data,
+            partial=request.method == "DELETE",
+            context={**self.get_serializer_context(), "flight": flight},
+        )
+        serializer.is_valid(raise_exception=True)
+        seats = [
+            (seat["row"], seat["seat"])
+            for seat in serializer.validated_data.get("seats", [])
+        ]
+
+        if request.method == "DELETE":
+            release_seats(
+                flight.pk, seats or holder_seats(flight.pk, holder), holder
+            )
+            return Response(status=status.HTTP_204_NO_CONTENT)
+
+        seat_map = get_seat_map(flight.pk)
+        conflicts = [seat for seat in seats if seat_map.is_taken(*seat)]
+        if not conflicts:
+            conflicts = hold_seats(
+                flight.pk,
+                seats,
+                holder,
+                serializer.validated_data["minutes"] * 60,
+            )
+        if conflicts:
+            return Response(
+                {
+                    "detail": "Some seats are already sold or held.",
+                    "seats": [
+                        {"row": row, "seat": seat} for row, seat in conflicts
+                    ],
+                },
+                status=status.HTTP_409_CONFLICT,
+            )
+
+        return Response(
+            self.held_seats_data(flight.pk, holder),
+            status=status.HTTP_201_CREATED,
+        )
+
+    @action(
+        methods=["GET"],
+        detail=True,
+        url_path="manifest",
+    )
+    def manifest(self, request, pk=None):
+        try:
+            flight_id = Flight.objects.values_list("pk", flat=True).get(
+                pk=int(pk)
+            )
+        except (ValueError, Flight.DoesNotExist):
+            raise NotFound()
+
+        return export_response(
+            request,
+            Ticket.objects.filter(flight_id=flight_id).order_by("row", "seat"),
+            MANIFEST_COLUMNS,
+            f"flight-{flight_id}-manifest",
+        )
+
+    @staticmethod
+    def held_seats_data(flight_id, holder) -> dict:
+        seats = [
+            {
+                "row": row,
+                "seat": seat,
+                "expires_at": datetime.fromtimestamp(expires, tz=timezone.utc),
+            }
+            for (row, seat), expires in sorted(
+                holder_seats(flight_id, holder).items()
+            )
+        ]
+        return {
+            "flight": flight_id,
+            "seats": HeldSeatSerializer(seats, many=True).data,
+        }
+
 
 @extend_schema_view(
     list=OrderSchema.list,
     retrieve=OrderSchema.retrieve,
+    create=OrderSchema.create,
+    export=OrderSchema.export,
 )
-class OrderViewSet(viewsets.ModelViewSet):
+class OrderViewSet(
+    ConditionalGetMixin,
+    OrderCacheMixin,
+    IdempotentCreateMixin,
+    QueuedCreateMixin,
+    viewsets.ModelViewSet,
+):
     queryset = Order.objects.prefetch_related(
-        "tickets__flight__route__source__closest_big_city__country",
-        "tickets__flight__route__destination__closest_big_city__country",
-        "tickets__flight__crew",
-        "tickets__flight__airplane__airplane_type",
+        Prefetch(
+            "tickets",
+            queryset=Ticket.objects.select_related(
+                "flight__route__source__closest_big_city__country",
+                "flight__route__destination__closest_big_city__country",
+                "flight__airplane__airplane_type",
+            ).prefetch_related("flight__crew", "flight__tickets"),
+        )
     )
     serializer_class = OrderSerializer
-    filter_backends = [OrderingFilter, SearchFilter, DjangoFilterBackend]
-    ordering_fields = [
-        "created_at",
-        "tickets__flight__departure_time",
-        "tickets__flight__arrival_time",
-    ]
+    filter_backends = [SearchFilter, DjangoFilterBackend]
     search_fields = [
-        "tickets__flight__route__source__name",
-        "tickets__flight__route__source__closest_big_city__name",
-        "tickets__flight__route__source__closest_big_city__country__name",
-    ]
-    filterset_fields = [
-        "tickets__flight__route__source__name",
-        "tickets__flight__route__source__closest_big_city__name",
-        "tickets__flight__route__source__closest_big_city__country__name",
+        "summary__origin__name",
+        "summary__origin__closest_big_city__name",
+        "summary__origin__closest_big_city__country__name",
     ]
+    filterset_class = OrderFilter
+    cursor_pagination_class = OrderCursorPagination
+    queued_create_serializer_class = BookingRequestCreateSerializer
+    queued_status_serializer_class = BookingRequestSerializer
+    etag_version_keys = {
+        "list": order_version_keys,
+        "retrieve": order_version_keys,
+    }
     permission_classes = [
         IsAuthenticated,
     ]
 
     def get_queryset(self):
-        return Order.objects.filter(user=self.request.user).distinct()
+        queryset = super().get_queryset().filter(user=self.request.user)
+
+        if self.action == "list":
+            queryset = queryset.prefetch_related(None).prefetch_related(
+                Prefetch(
+                    "tickets",
+                    queryset=Ticket.objects.select_related(
+                        "flight__route__source",
+                        "flight__route__destination",
+                        "flight__airplane",
+                    ),
+                )
+            )
+        return queryset
 
     def get_permissions(self):
         if self.action in (
@@ -359,3 +632,38 @@ class OrderViewSet(viewsets.ModelViewSet):
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
+
+    @action(
+        methods=["GET"],
+        detail=False,
+        url_path="export",
+    )
+    def export(self, request):
+        orders = self.filter_queryset(self.get_queryset())
+        return export_response(
+            request,
+            Ticket.objects.filter(order__in=orders.values("pk")).order_by(
+                "-order__created_at", "order_id", "row", "seat"
+            ),
+            ORDER_EXPORT_COLUMNS,
+            "orders",
+        )
+
+
+@extend_schema_view(
+    list=BookingRequestSchema.list,
+    retrieve=BookingRequestSchema.retrieve,
+)
+class BookingRequestViewSet(
+    mixins.ListModelMixin,
+    mixins.RetrieveModelMixin,
+    viewsets.GenericViewSet,
+):
+    queryset = BookingRequest.objects.all()
+    serializer_class = BookingRequestSerializer
+    permission_classes = [
+        IsAuthenticated,
+    ]
+
+    def get_queryset(self):
+        return BookingRequest.objects.filter(user=self.request.user)
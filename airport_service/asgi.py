@@ -11,6 +11,10 @@ import os
 
 from django.core.asgi import get_asgi_application
 
+from airport_service.db.postgresql_pool.base import warm_up_pools
+
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'airport_service.settings')
 
 application = get_asgi_application()
+
+warm_up_pools()
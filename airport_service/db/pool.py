@@ -0,0 +1,190 @@
+import threading
+import time
+from collections import deque
+
+
+class PoolTimeout(Exception):
+    pass
+
+
+class ConnectionPool:
+    """Thread-safe pool of DB-API connections.
+
+    Idle connections are reused last-in first-out and pinged with
+    ``check`` before they are handed out again. Connections older than
+    ``max_lifetime`` or idle for longer than ``max_idle`` seconds are
+    recycled, as are connections returned after an error.
+    """
+
+    def __init__(
+        self,
+        connect,
+        check=None,
+        reset=None,
+        min_size=0,
+        max_size=10,
+        timeout=30.0,
+        max_lifetime=60 * 60.0,
+        max_idle=10 * 60.0,
+    ) -> None:
+        self.connect = connect
+        self.check = check
+        self.reset = reset
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_lifetime = max_lifetime
+        self.max_idle = max_idle
+
+        self._idle = deque()
+        self._created_at = {}
+        self._size = 0
+        self._condition = threading.Condition()
+        self._stats = {
+            "connections_opened": 0,
+            "connections_closed": 0,
+            "connections_requested": 0,
+            "requests_waiting": 0,
+            "requests_wait_ms": 0.0,
+            "max_wait_ms": 0.0,
+            "requests_timeouts": 0,
+            "health_check_failures": 0,
+        }
+
+    def warm_up(self) -> None:
+        """Open connections until ``min_size`` of them exist."""
+        while True:
+            with self._condition:
+                if self._size >= self.min_size:
+                    return
+                self._size += 1
+            connection = self._open()
+            with self._condition:
+                self._idle.append((connection, time.monotonic()))
+                self._condition.notify()
+
+    def getconn(self):
+        started = time.monotonic()
+        deadline = started + self.timeout
+        waited = False
+        with self._condition:
+            self._stats["connections_requested"] += 1
+
+        while True:
+            with self._condition:
+                connection, idle_since, create = self._take(deadline, waited)
+                waited = True
+            if connection is None and not create:
+                continue
+
+            if create:
+                connection = self._open()
+            elif not self._is_reusable(connection, idle_since):
+                self._discard(connection)
+                continue
+
+            self._record_wait(started)
+            return connection
+
+    def putconn(self, connection, discard=False) -> None:
+        if discard or not self._reset(connection):
+            self._discard(connection)
+            return
+        with self._condition:
+            self._idle.append((connection, time.monotonic()))
+            self._condition.notify()
+
+    def close(self) -> None:
+        with self._condition:
+            idle, self._idle = list(self._idle), deque()
+        for connection, _ in idle:
+            self._discard(connection)
+
+    def stats(self) -> dict:
+        with self._condition:
+            return {
+                **self._stats,
+                "pool_min": self.min_size,
+                "pool_max": self.max_size,
+                "pool_size": self._size,
+                "pool_available": len(self._idle),
+                "pool_in_use": self._size - len(self._idle),
+            }
+
+    def _take(self, deadline, waited):
+        """Return ``(connection, idle_since, create)`` under the lock."""
+        if self._idle:
+            connection, idle_since = self._idle.pop()
+            return connection, idle_since, False
+        if self._size < self.max_size:
+            self._size += 1
+            return None, None, True
+
+        remaining = deadline - time.monotonic()
+        if not waited:
+            self._stats["requests_waiting"] += 1
+        if remaining <= 0 or not self._condition.wait(remaining):
+            if not self._idle and self._size >= self.max_size:
+                self._stats["requests_timeouts"] += 1
+                raise PoolTimeout(
+                    f"Couldn't get a connection after {self.timeout} sec"
+                )
+        return None, None, False
+
+    def _open(self):
+        try:
+            connection = self.connect()
+        except Exception:
+            with self._condition:
+                self._size -= 1
+                self._condition.notify()
+            raise
+        with self._condition:
+            self._created_at[id(connection)] = time.monotonic()
+            self._stats["connections_opened"] += 1
+        return connection
+
+    def _is_reusable(self, connection, idle_since) -> bool:
+        now = time.monotonic()
+        created_at = self._created_at.get(id(connection), now)
+        if now - created_at > self.max_lifetime:
+            return False
+        if now - idle_since > self.max_idle:
+            return False
+        if self.check is None:
+            return True
+        try:
+            self.check(connection)
+        except Exception:
+            with self._condition:
+                self._stats["health_check_failures"] += 1
+            return False
+        return True
+
+    def _reset(self, connection) -> bool:
+        if self.reset is None:
+            return True
+        try:
+            self.reset(connection)
+        except Exception:
+            return False
+        return True
+
+    def _discard(self, connection) -> None:
+        try:
+            connection.close()
+        except Exception:
+            pass
+        with self._condition:
+            self._created_at.pop(id(connection), None)
+            self._size -= 1
+            self._stats["connections_closed"] += 1
+            self._condition.notify()
+
+    def _record_wait(self, started) -> None:
+        wait_ms = (time.monotonic() - started) * 1000
+        with self._condition:
+            self._stats["requests_wait_ms"] += wait_ms
+            self._stats["max_wait_ms"] = max(
+                self._stats["max_wait_ms"], wait_ms
+            )
@@ -0,0 +1,161 @@
+import logging
+import threading
+from functools import partial
+
+from django.db.backends.postgresql import base, creation
+from django.db.backends.postgresql.psycopg_any import IsolationLevel
+from django.utils.asyncio import async_unsafe
+
+from airport_service.db.pool import ConnectionPool
+
+logger = logging.getLogger(__name__)
+
+_pools = {}
+# Connection parameters each pool opens its connections with
+_pool_params = {}
+_pools_lock = threading.Lock()
+
+
+def _connect(conn_params, isolation_level):
+    """Open a connection the way Django's PostgreSQL backend does."""
+    connection = base.Database.connect(**conn_params)
+    if isolation_level is not None:
+        connection.isolation_level = isolation_level
+    if not base.is_psycopg3:
+        base.psycopg2.extras.register_default_jsonb(
+            conn_or_curs=connection, loads=lambda x: x
+        )
+    return connection
+
+
+def _ping(connection):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1")
+
+
+def _rollback_if_needed(connection):
+    if connection.closed:
+        raise ValueError("Connection is closed")
+    if not connection.autocommit:
+        connection.rollback()
+
+
+def get_pool(alias):
+    return _pools.get(alias)
+
+
+def get_pools():
+    with _pools_lock:
+        return dict(_pools)
+
+
+def close_pool(alias) -> None:
+    """Forget the pool of ``alias`` and close its idle connections.
+
+    Connections still checked out are closed when they are given back.
+    """
+    with _pools_lock:
+        pool = _pools.pop(alias, None)
+        _pool_params.pop(alias, None)
+    if pool is not None:
+        pool.close()
+
+
+class DatabaseCreation(creation.DatabaseCreation):
+    def _destroy_test_db(self, test_database_name, verbosity):
+        # Idle pooled connections to the test database would make
+        # DROP DATABASE fail
+        close_pool(self.connection.alias)
+        super()._destroy_test_db(test_database_name, verbosity)
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """PostgreSQL backend that checks connections out of a shared pool.
+
+    Django still "closes" the connection at the end of every request
+    (CONN_MAX_AGE = 0); closing returns it to the process-wide pool of
+    the alias instead. Pool sizing is read from the ``POOL`` dict of the
+    database settings.
+    """
+
+    creation_class = DatabaseCreation
+
+    def _get_pool(self, conn_params):
+        """The pool of this alias, replaced when ``conn_params`` change.
+
+        They do when the test runner switches the alias to the test
+        database.
+        """
+        with _pools_lock:
+            old_pool = _pools.get(self.alias)
+            if (
+                old_pool is not None
+                and _pool_params[self.alias] == conn_params
+            ):
+                return old_pool
+
+            options = self.settings_dict.get("POOL", {})
+            pool = _pools[self.alias] = ConnectionPool(
+                connect=partial(
+                    _connect,
+                    dict(conn_params),
+                    self.settings_dict["OPTIONS"].get("isolation_level"),
+                ),
+                check=_ping,
+                reset=_rollback_if_needed,
+                min_size=options.get("MIN_SIZE", 0),
+                max_size=options.get("MAX_SIZE", 10),
+                timeout=options.get("TIMEOUT", 30),
+                max_lifetime=options.get("MAX_LIFETIME", 60 * 60),
+                max_idle=options.get("MAX_IDLE", 10 * 60),
+            )
+            _pool_params[self.alias] = dict(conn_params)
+        if old_pool is not None:
+            old_pool.close()
+        return pool
+
+    @async_unsafe
+    def get_new_connection(self, conn_params):
+        pool = self._get_pool(conn_params)
+        connection = pool.getconn()
+        self._connection_pool = pool
+        self.isolation_level = IsolationLevel(
+            self.settings_dict["OPTIONS"].get(
+                "isolation_level", IsolationLevel.READ_COMMITTED
+            )
+        )
+        return connection
+
+    def _close(self):
+        if self.connection is None:
+            return
+        pool = getattr(self, "_connection_pool", None)
+        # Connections of a closed or replaced pool are not taken back
+        if pool is None or get_pool(self.alias) is not pool:
+            return super()._close()
+        # Connections that saw errors, or died, are recycled rather than
+        # handed to the next request.
+        pool.putconn(
+            self.connection,
+            discard=self.errors_occurred or bool(self.connection.closed),
+        )
+        self.errors_occurred = False
+
+
+def warm_up_pools():
+    """Open MIN_SIZE connections for every pooled database alias.
+
+    Called from the WSGI and ASGI entry points; a database that is not
+    reachable yet only logs a warning, the pool then fills on demand.
+    """
+    from django.db import connections
+
+    for alias in connections:
+        connection = connections[alias]
+        if not isinstance(connection, DatabaseWrapper):
+            continue
+        pool = connection._get_pool(connection.get_connection_params())
+        try:
+            pool.warm_up()
+        except Exception as error:
+            logger.warning("Couldn't warm up pool %s: %s", alias, error)
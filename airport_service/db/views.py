@@ -0,0 +1,17 @@
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+
+from airport_service.db.postgresql_pool.base import get_pools
+
+
+@extend_schema(responses=OpenApiTypes.OBJECT)
+@api_view(["GET"])
+@permission_classes([IsAdminUser])
+def pool_stats(request):
+    """Connection pool usage of this worker process, per database alias."""
+    return Response(
+        {alias: pool.stats() for alias, pool in get_pools().items()}
+    )
@@ -90,6 +90,18 @@ DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///db.sqlite3")
 
 DATABASES = {"default": dj_database_url.parse(DATABASE_URL)}
 
+# PostgreSQL connections are checked out of a per-process pool and
+# returned to it at the end of every request.
+if DATABASES["default"]["ENGINE"] == "django.db.backends.postgresql":
+    DATABASES["default"]["ENGINE"] = "airport_service.db.postgresql_pool"
+    DATABASES["default"]["POOL"] = {
+        "MIN_SIZE": int(os.getenv("DB_POOL_MIN_SIZE") or 2),
+        "MAX_SIZE": int(os.getenv("DB_POOL_MAX_SIZE") or 10),
+        "TIMEOUT": float(os.getenv("DB_POOL_TIMEOUT") or 30),
+        "MAX_LIFETIME": float(os.getenv("DB_POOL_MAX_LIFETIME") or 60 * 60),
+        "MAX_IDLE": float(os.getenv("DB_POOL_MAX_IDLE") or 10 * 60),
+    }
+
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
 
@@ -161,6 +173,7 @@ SPECTACULAR_SETTINGS = {
     "VERSION": "1.0.0",
     "SERVE_INCLUDE_SCHEMA": False,
     "COMPONENT_SPLIT_REQUEST": True,
+    "GET_LIB_DOC_EXCLUDES": "airport.schemas.get_doc_excludes",
     "SWAGGER_UI_SETTINGS": {
         "deepLinking": True,
         "defaultModelRendering": "model",
@@ -193,6 +206,14 @@ CACHES = {
     }
 }
 
+# Seconds an order response is replayed for retries with its Idempotency-Key
+IDEMPOTENCY_KEY_TIMEOUT = int(
+    os.getenv("IDEMPOTENCY_KEY_TIMEOUT") or 60 * 60 * 24
+)
+
+# Queue order creation for the process_booking_queue worker: "db" or "redis"
+BOOKING_QUEUE = os.getenv("BOOKING_QUEUE") or None
+
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
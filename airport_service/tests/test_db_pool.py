@@ -0,0 +1,142 @@
+import threading
+from unittest import TestCase, mock
+
+from airport_service.db.pool import ConnectionPool, PoolTimeout
+from airport_service.db.postgresql_pool.base import (
+    DatabaseWrapper,
+    close_pool,
+    get_pool,
+)
+
+
+class FakeConnection:
+    def __init__(self) -> None:
+        self.closed = False
+        self.broken = False
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def ping(connection):
+    if connection.broken:
+        raise ConnectionError("server closed the connection")
+
+
+class ConnectionPoolTests(TestCase):
+    def make_pool(self, **kwargs):
+        return ConnectionPool(connect=FakeConnection, check=ping, **kwargs)
+
+    def test_connections_are_reused(self):
+        pool = self.make_pool(max_size=2)
+
+        first = pool.getconn()
+        pool.putconn(first)
+        second = pool.getconn()
+
+        self.assertIs(first, second)
+        stats = pool.stats()
+        self.assertEqual(stats["connections_opened"], 1)
+        self.assertEqual(stats["connections_requested"], 2)
+        self.assertEqual(stats["pool_in_use"], 1)
+
+    def test_failed_health_check_opens_new_connection(self):
+        pool = self.make_pool()
+        connection = pool.getconn()
+        pool.putconn(connection)
+        connection.broken = True
+
+        replacement = pool.getconn()
+
+        self.assertIsNot(replacement, connection)
+        self.assertTrue(connection.closed)
+        self.assertEqual(pool.stats()["health_check_failures"], 1)
+        self.assertEqual(pool.stats()["pool_size"], 1)
+
+    def test_discarded_connection_is_recycled(self):
+        pool = self.make_pool()
+        connection = pool.getconn()
+
+        pool.putconn(connection, discard=True)
+
+        self.assertTrue(connection.closed)
+        self.assertIsNot(pool.getconn(), connection)
+
+    def test_expired_connection_is_recycled(self):
+        pool = self.make_pool(max_lifetime=60)
+        with mock.patch("airport_service.db.pool.time.monotonic") as now:
+            now.return_value = 0
+            connection = pool.getconn()
+            pool.putconn(connection)
+            now.return_value = 61
+            self.assertIsNot(pool.getconn(), connection)
+
+    def test_waits_for_returned_connection(self):
+        pool = self.make_pool(max_size=1, timeout=5)
+        connection = pool.getconn()
+        timer = threading.Timer(0.05, pool.putconn, args=[connection])
+        timer.start()
+
+        self.assertIs(pool.getconn(), connection)
+        timer.join()
+        self.assertEqual(pool.stats()["requests_waiting"], 1)
+        self.assertGreater(pool.stats()["max_wait_ms"], 0)
+
+    def test_timeout_when_exhausted(self):
+        pool = self.make_pool(max_size=1, timeout=0.01)
+        pool.getconn()
+
+        with self.assertRaises(PoolTimeout):
+            pool.getconn()
+        self.assertEqual(pool.stats()["requests_timeouts"], 1)
+
+    def test_warm_up_opens_min_size(self):
+        pool = self.make_pool(min_size=3)
+
+        pool.warm_up()
+
+        self.assertEqual(pool.stats()["pool_available"], 3)
+
+
+def fake_connect(conn_params, isolation_level):
+    connection = FakeConnection()
+    connection.autocommit = True
+    return connection
+
+
+@mock.patch("airport_service.db.postgresql_pool.base._connect", fake_connect)
+class PooledDatabaseWrapperTests(TestCase):
+    alias = "pool-test"
+
+    def setUp(self):
+        self.addCleanup(close_pool, self.alias)
+
+    def make_wrapper(self):
+        return DatabaseWrapper(
+            {"NAME": "airport", "OPTIONS": {}, "POOL": {}}, alias=self.alias
+        )
+
+    def test_pool_is_replaced_when_connection_params_change(self):
+        wrapper = self.make_wrapper()
+        connection = wrapper.get_new_connection({"dbname": "airport"})
+        wrapper.connection = connection
+        old_pool = get_pool(self.alias)
+        old_pool.putconn(old_pool.getconn())
+
+        self.make_wrapper().get_new_connection({"dbname": "test_airport"})
+
+        self.assertIsNot(get_pool(self.alias), old_pool)
+        self.assertEqual(old_pool.stats()["pool_available"], 0)
+        wrapper._close()
+        self.assertTrue(connection.closed)
+
+    def test_close_pool_closes_idle_connections(self):
+        wrapper = self.make_wrapper()
+        wrapper.connection = wrapper.get_new_connection({"dbname": "airport"})
+        wrapper._close()
+        self.assertFalse(wrapper.connection.closed)
+
+        close_pool(self.alias)
+
+        self.assertTrue(wrapper.connection.closed)
+        self.assertIsNone(get_pool(self.alias))
@@ -8,10 +8,13 @@ from drf_spectacular.views import (
     SpectacularRedocView,
 )
 
+from airport_service.db.views import pool_stats
+
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/airport/", include("airport.urls", namespace="cinema")),
     path("api/user/", include("user.urls", namespace="user")),
+    path("api/db-pool/", pool_stats, name="db-pool-stats"),
     path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
     path(
         "api/doc/swagger/",
@@ -11,6 +11,10 @@ import os
 
 from django.core.wsgi import get_wsgi_application
 
+from airport_service.db.postgresql_pool.base import warm_up_pools
+
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'airport_service.settings')
 
 application = get_wsgi_application()
+
+warm_up_pools()